@@ -8,13 +8,22 @@ import urllib.parse
 import hashlib
 import aiohttp
 import asyncio
-from safetensors import safe_open
+import threading
+import time
+import weakref
+import atexit
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import sqlite3
+import struct
+import re
+import bisect
+from collections import OrderedDict, Counter, deque
+from contextlib import ExitStack
+from email.utils import formatdate
 from urllib.parse import urlparse
 import shutil
 import base64
-from io import BytesIO
-from PIL import Image
-from urllib.parse import urlparse
 
 NunchakuFluxLoraLoader = None
 NunchakuQwenLoraLoader = None
@@ -22,45 +31,290 @@ NunchakuZImageLoraLoader = None
 is_nunchaku_flux_available = False
 is_nunchaku_qwen_available = False
 is_nunchaku_zimage_available = False
+nunchaku_detected = False
+nunchaku_detect_lock = threading.Lock()
+
+def detect_nunchaku_loaders():
+    """Looks up the Nunchaku LoRA loader nodes once, on first use rather than at import, so the
+    result does not depend on Nunchaku having been loaded before this node."""
+    global NunchakuFluxLoraLoader, NunchakuQwenLoraLoader, NunchakuZImageLoraLoader, nunchaku_detected
+    global is_nunchaku_flux_available, is_nunchaku_qwen_available, is_nunchaku_zimage_available
+    if nunchaku_detected:
+        return
+    with nunchaku_detect_lock:
+        if nunchaku_detected:
+            return
+        try:
+            from nodes import NODE_CLASS_MAPPINGS
 
-try:
-    from nodes import NODE_CLASS_MAPPINGS
-    
-    if "NunchakuFluxLoraLoader" in NODE_CLASS_MAPPINGS:
-        NunchakuFluxLoraLoader = NODE_CLASS_MAPPINGS["NunchakuFluxLoraLoader"]
-        is_nunchaku_flux_available = True
-        print("✅ Local Lora Gallery: Nunchaku Flux integration enabled.")
-        
-    if "NunchakuQwenImageLoraLoader" in NODE_CLASS_MAPPINGS:
-        NunchakuQwenLoraLoader = NODE_CLASS_MAPPINGS["NunchakuQwenImageLoraLoader"]
-        is_nunchaku_qwen_available = True
-        print("✅ Local Lora Gallery: Nunchaku Qwen Image integration enabled.")
-
-    if "NunchakuZImageLoraLoader" in NODE_CLASS_MAPPINGS:
-        NunchakuZImageLoraLoader = NODE_CLASS_MAPPINGS["NunchakuZImageLoraLoader"]
-        is_nunchaku_zimage_available = True
-        print("✅ Local Lora Gallery: Nunchaku Z-Image integration enabled.")
-        
-except Exception as e:
-    print(f"INFO: Local Lora Gallery - Nunchaku nodes not found or failed to load. Running in standard mode. Error: {e}")
+            if "NunchakuFluxLoraLoader" in NODE_CLASS_MAPPINGS:
+                NunchakuFluxLoraLoader = NODE_CLASS_MAPPINGS["NunchakuFluxLoraLoader"]
+                is_nunchaku_flux_available = True
+                print("✅ Local Lora Gallery: Nunchaku Flux integration enabled.")
+
+            if "NunchakuQwenImageLoraLoader" in NODE_CLASS_MAPPINGS:
+                NunchakuQwenLoraLoader = NODE_CLASS_MAPPINGS["NunchakuQwenImageLoraLoader"]
+                is_nunchaku_qwen_available = True
+                print("✅ Local Lora Gallery: Nunchaku Qwen Image integration enabled.")
+
+            if "NunchakuZImageLoraLoader" in NODE_CLASS_MAPPINGS:
+                NunchakuZImageLoraLoader = NODE_CLASS_MAPPINGS["NunchakuZImageLoraLoader"]
+                is_nunchaku_zimage_available = True
+                print("✅ Local Lora Gallery: Nunchaku Z-Image integration enabled.")
+
+        except Exception as e:
+            print(f"INFO: Local Lora Gallery - Nunchaku nodes not found or failed to load. Running in standard mode. Error: {e}")
+        nunchaku_detected = True
 
 NODE_DIR = os.path.dirname(os.path.abspath(__file__))
 LEGACY_METADATA_FILE = os.path.join(NODE_DIR, "lora_gallery_metadata.json")
 UI_STATE_FILE = os.path.join(NODE_DIR, "lora_gallery_ui_state.json")
 PRESETS_FILE = os.path.join(NODE_DIR, "lora_gallery_presets.json")
+HASH_DB_FILE = os.path.join(NODE_DIR, "lora_gallery_hashes.db")
+METADATA_DB_FILE = os.path.join(NODE_DIR, "lora_gallery_metadata.db")
+# Opt-in: LORA_GALLERY_METADATA_STORE=sqlite keeps an indexed copy of every sidecar in METADATA_DB_FILE.
+METADATA_STORE_ENABLED = os.environ.get("LORA_GALLERY_METADATA_STORE", "").strip().lower() in ("1", "true", "yes", "sqlite")
+SYNC_JOB_STATE_FILE = os.path.join(NODE_DIR, "lora_gallery_sync_job.json")
+MIGRATION_STATE_FILE = os.path.join(NODE_DIR, "lora_gallery_migration.json")
+CIVITAI_CACHE_DB_FILE = os.path.join(NODE_DIR, "lora_gallery_civitai_cache.db")
+# LORA_GALLERY_FSYNC: "batch" (default) commits concurrent JSON writes together, syncing each folder once per batch, "always" fsyncs each write, "off" never fsyncs.
+JSON_FSYNC_MODE = os.environ.get("LORA_GALLERY_FSYNC", "batch").strip().lower()
+if JSON_FSYNC_MODE not in ("batch", "always", "off"):
+    JSON_FSYNC_MODE = "batch"
+CIVITAI_API_BASE = os.environ.get("LORA_GALLERY_CIVITAI_API_BASE", "https://civitai.com/api/v1").rstrip("/")
 VIDEO_EXTENSIONS = ['.mp4', '.webm', '.mov', '.avi']
 IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.webp', '.gif']
+PREVIEW_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS
+LORA_FILE_EXTENSIONS = getattr(folder_paths, "supported_pt_extensions", {'.ckpt', '.pt', '.pt2', '.bin', '.pth', '.safetensors', '.pkl', '.sft'})
+CATALOG_REVALIDATE_INTERVAL = 2.0
+# Without watchdog, directory mtimes are polled every WATCHER_POLL_INTERVAL seconds, backing off to
+# WATCHER_POLL_MAX_INTERVAL while nothing changes; files edited in place are found by a sweep every WATCHER_SWEEP_INTERVAL.
+WATCHER_POLL_INTERVAL = 10.0
+WATCHER_POLL_MAX_INTERVAL = 60.0
+WATCHER_SWEEP_INTERVAL = 300.0
+WATCHER_DEBOUNCE = 0.5
+CATALOG_EVENT_MAX_CARDS = 200
+CATALOG_CHANGELOG_SIZE = 1000
+LISTING_SNAPSHOT_CACHE_SIZE = 32
+# Relative weight of a search hit in each field; matches in the file name rank highest.
+SEARCH_FIELD_WEIGHTS = {"name": 4.0, "activation text": 3.0, "tags": 2.5, "folder": 1.5, "notes": 1.0}
+# Typos tolerated per query term: one edit below SEARCH_FUZZY_LONG_TERM characters, two from there on.
+SEARCH_FUZZY_LONG_TERM = 8
+THUMBNAIL_CACHE_DIR = os.path.join(NODE_DIR, "thumbnail_cache")
+THUMBNAIL_SIZES = [128, 256, 512, 1024]
+THUMBNAIL_CACHE_MAX_BYTES = 512 * 1024 * 1024
+THUMBNAIL_CONTENT_HASHES = 4096
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_QUICK_SAMPLE_SIZE = 1024 * 1024
+SYNC_JOB_CONCURRENCY = 4
+SYNC_JOB_MAX_RETRIES = 3
+SYNC_JOB_SAVE_INTERVAL = 2.0
+MIGRATION_WORKERS = 4
+MIGRATION_CHECKPOINT_INTERVAL = 2.0
+CIVITAI_MIN_REQUEST_INTERVAL = 0.25
+CIVITAI_CACHE_TTL = 7 * 24 * 3600
+STATE_FLUSH_DELAY = 2.0
+METADATA_STORE_REFRESH_INTERVAL = 5.0
+PATCHED_MODEL_CACHE_MAX_ENTRIES = 8
+PATCHED_MODEL_CACHE_MAX_BASES = 2
+PATCHED_MODEL_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+WARMUP_WORKERS = 2
+SAFETENSORS_MAX_HEADER_BYTES = 100 * 1024 * 1024
+SAFETENSORS_METADATA_CACHE_SIZE = 256
+TRAINING_INFO_TOP_TAGS = 20
+TRAINING_INFO_SORT_FIELDS = ["base_model", "network_dim", "network_alpha", "resolution"]
+DERIVED_TRIGGER_WORDS = 3
+DERIVE_BATCH_SIZE = 64
+BATCH_UPDATE_SIZE = 32
+LORA_TENSOR_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+LORA_TENSOR_CACHE_MIN_FREE_RAM = 4 * 1024 * 1024 * 1024
+UI_STATE_MAX_NODES = 500
+CIVITAI_NEGATIVE_CACHE_TTL = 24 * 3600
+HTTP_POOL_LIMIT = 16
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_TIMEOUT = 60
+# Preview and video downloads have no overall limit, only a stalled connection is given up on.
+DOWNLOAD_CONNECT_TIMEOUT = 30
+DOWNLOAD_READ_TIMEOUT = 60
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+GALLERY_IO_WORKERS = 4
+HASH_WORKERS = 2
+
+# Blocking filesystem and PIL work from the route handlers runs here instead of on the server loop.
+# Hashing gets its own pool so multi-GB LoRAs never starve gallery requests.
+gallery_executor = ThreadPoolExecutor(max_workers=GALLERY_IO_WORKERS, thread_name_prefix="lora_gallery_io")
+hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="lora_gallery_hash")
+warmup_executor = ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix="lora_gallery_warmup")
+
+async def run_in_gallery_executor(func, *args, **kwargs):
+    """Awaits a blocking call on the gallery's bounded I/O thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(gallery_executor, functools.partial(func, *args, **kwargs))
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def calculate_sha256(filepath, progress_callback=None):
+    """Calculates the SHA256 hash of a file efficiently.
 
-def calculate_sha256(filepath):
-    """Calculates the SHA256 hash of a file efficiently."""
+    Reads into a reused HASH_CHUNK_SIZE buffer; progress_callback(bytes_done, total_bytes) is called per chunk.
+    """
     if not os.path.exists(filepath):
         return None
+    total_bytes = os.path.getsize(filepath)
     hash_sha256 = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    bytes_done = 0
+    with open(filepath, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            hash_sha256.update(view[:read])
+            bytes_done += read
+            if progress_callback:
+                progress_callback(bytes_done, total_bytes)
     return hash_sha256.hexdigest()
 
+def calculate_quick_fingerprint(filepath, size):
+    """Hashes the first and last HASH_QUICK_SAMPLE_SIZE bytes, used to recognise moved or renamed files."""
+    hash_quick = hashlib.sha256(str(size).encode("ascii"))
+    with open(filepath, "rb") as f:
+        hash_quick.update(f.read(HASH_QUICK_SAMPLE_SIZE))
+        if size > 2 * HASH_QUICK_SAMPLE_SIZE:
+            f.seek(-HASH_QUICK_SAMPLE_SIZE, os.SEEK_END)
+            hash_quick.update(f.read(HASH_QUICK_SAMPLE_SIZE))
+    return hash_quick.hexdigest()
+
+class LoraHashStore:
+    """Persistent SHA256 cache in SQLite, keyed by (path, size, mtime).
+
+    A file that was moved or renamed keeps its size and mtime, so it is found again through a quick
+    fingerprint of its first and last megabyte instead of being rehashed. Rows of deleted files are
+    pruned when the catalog notices the files are gone.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "quick_hash TEXT NOT NULL, sha256 TEXT NOT NULL, updated_at REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS hashes_identity ON hashes (size, mtime_ns, quick_hash)")
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, filepath):
+        """Returns the cached SHA256 for the file as it is on disk now, or None."""
+        filepath = os.path.abspath(filepath)
+        return self._lookup(filepath, os.stat(filepath))[0]
+
+    def _lookup(self, filepath, stat):
+        """Returns (sha256 or None, quick fingerprint or None if it was not needed)."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT sha256 FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (filepath, stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row:
+            return row[0], None
+
+        quick_hash = calculate_quick_fingerprint(filepath, stat.st_size)
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT path, sha256 FROM hashes WHERE size = ? AND mtime_ns = ? AND quick_hash = ?",
+                (stat.st_size, stat.st_mtime_ns, quick_hash)).fetchall()
+            if rows:
+                # The file was moved or renamed: its row moves along instead of being kept for a path that is gone.
+                conn.executemany("DELETE FROM hashes WHERE path = ?",
+                                 [(path,) for path, _ in rows if path != filepath and not os.path.exists(path)])
+                self._store(conn, filepath, stat, quick_hash, rows[0][1])
+                return rows[0][1], quick_hash
+        return None, quick_hash
+
+    def _store(self, conn, filepath, stat, quick_hash, sha256):
+        conn.execute(
+            "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, quick_hash, sha256, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (filepath, stat.st_size, stat.st_mtime_ns, quick_hash, sha256, time.time()))
+        conn.commit()
+
+    def get_sha256(self, filepath, progress_callback=None):
+        """Returns the file's SHA256 from the store, hashing and remembering it on a miss (blocking)."""
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        cached, quick_hash = self._lookup(filepath, stat)
+        if cached:
+            return cached
+        sha256 = calculate_sha256(filepath, progress_callback)
+        if sha256 and _get_mtime(filepath) == stat.st_mtime_ns:
+            if quick_hash is None:
+                quick_hash = calculate_quick_fingerprint(filepath, stat.st_size)
+            with self._lock:
+                self._store(self._connect(), filepath, stat, quick_hash, sha256)
+        return sha256
+
+    def prune(self, removed_paths, added_paths=()):
+        """Drops the rows of removed files that are gone from disk.
+
+        A row whose size and mtime match one of the added files is kept: that file is most likely the
+        same one renamed, and its next lookup moves the row over instead of rehashing.
+        """
+        if self._conn is None and not os.path.exists(self.db_path):
+            return 0
+        gone = [os.path.abspath(path) for path in removed_paths if not os.path.exists(path)]
+        if not gone:
+            return 0
+        identities = set()
+        for path in added_paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            identities.add((stat.st_size, stat.st_mtime_ns))
+        with self._lock:
+            conn = self._connect()
+            stale = []
+            for i in range(0, len(gone), 500):
+                chunk = gone[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT path, size, mtime_ns FROM hashes WHERE path IN ({','.join('?' * len(chunk))})", chunk)
+                stale.extend((path,) for path, size, mtime_ns in rows if (size, mtime_ns) not in identities)
+            if stale:
+                conn.executemany("DELETE FROM hashes WHERE path = ?", stale)
+                conn.commit()
+        return len(stale)
+
+lora_hash_store = LoraHashStore(HASH_DB_FILE)
+
+async def compute_lora_hash(lora_name, lora_full_path):
+    """Resolves a LoRA's SHA256 off the event loop, reporting progress over the PromptServer websocket."""
+    last_report = [0.0]
+
+    def report_progress(bytes_done, total_bytes):
+        now = time.monotonic()
+        if bytes_done < total_bytes and now - last_report[0] < 0.5:
+            return
+        last_report[0] = now
+        server.PromptServer.instance.send_sync("lora_gallery.hash_progress", {
+            "lora_name": lora_name,
+            "bytes_done": bytes_done,
+            "total_bytes": total_bytes,
+        })
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, lora_hash_store.get_sha256, lora_full_path, report_progress)
+
 def load_json_file(file_path, default_data={}):
     if not os.path.exists(file_path):
         return default_data
@@ -74,18 +328,539 @@ def load_json_file(file_path, default_data={}):
         print(f"Error loading {file_path}: {e}")
         return default_data
 
-def save_json_file(data, file_path):
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDWR)
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _sync_files(paths):
+    """fsyncs the data of each written file; only these files are flushed, nothing else on the disk."""
+    for path in paths:
+        _fsync_path(path)
+
+def _sync_dirs(paths):
+    """fsyncs each distinct parent directory once so renames into it are durable. Windows cannot
+    open directories for syncing and makes renames durable on its own."""
+    if os.name == "nt":
+        return
+    for directory in dict.fromkeys(os.path.dirname(os.path.abspath(path)) for path in paths):
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class JsonGroupCommitter:
+    """Group commit for atomic JSON writes.
+
+    Writers hand over a fully written temp file and wait until it has been synced and renamed
+    over its target. The first waiting writer commits everything queued so far as one batch:
+    the batch's own temp files are fsynced, all of them are renamed, and then each parent
+    directory is fsynced once for the whole batch; writes arriving meanwhile queue up for the
+    next writer to commit. No thread is involved, so this also works during interpreter shutdown.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = []
+        self._committing = False
+        self.commits = 0
+        self.files = 0
+
+    def commit(self, tmp_path, file_path):
+        entry = {"tmp_path": tmp_path, "file_path": file_path, "done": False, "error": None}
+        with self._cond:
+            self._pending.append(entry)
+            while self._committing and not entry["done"]:
+                self._cond.wait()
+            if not entry["done"]:
+                self._committing = True
+                batch, self._pending = self._pending, []
+        if not entry["done"]:
+            try:
+                self._commit_batch(batch)
+            finally:
+                with self._cond:
+                    for queued in batch:
+                        queued["done"] = True
+                    self._committing = False
+                    self.commits += 1
+                    self.files += len(batch)
+                    self._cond.notify_all()
+        if entry["error"] is not None:
+            raise entry["error"]
+
+    @staticmethod
+    def _commit_batch(batch):
+        try:
+            _sync_files([entry["tmp_path"] for entry in batch])
+        except Exception as e:
+            for entry in batch:
+                entry["error"] = e
+            return
+        replaced = []
+        for entry in batch:
+            try:
+                os.replace(entry["tmp_path"], entry["file_path"])
+                replaced.append(entry)
+            except Exception as e:
+                entry["error"] = e
+        try:
+            _sync_dirs([entry["file_path"] for entry in replaced])
+        except Exception as e:
+            for entry in replaced:
+                entry["error"] = e
+
+    def stats(self):
+        with self._cond:
+            return {
+                "mode": JSON_FSYNC_MODE,
+                "commits": self.commits,
+                "files": self.files,
+                "files_per_commit": round(self.files / self.commits, 2) if self.commits else 0.0,
+            }
+
+json_group_committer = JsonGroupCommitter()
+
+def write_text_atomic(payload, file_path):
+    """Replaces file_path with payload through a temp file and os.replace, so readers never see a partial
+    file; the fsync follows JSON_FSYNC_MODE. Raises on failure, leaving the old file in place."""
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            if JSON_FSYNC_MODE == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        if JSON_FSYNC_MODE == "batch":
+            json_group_committer.commit(tmp_path, file_path)
+        else:
+            os.replace(tmp_path, file_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_json_file(data, file_path, indent=4):
+    try:
+        write_text_atomic(json.dumps(data, indent=indent, ensure_ascii=False), file_path)
+        return True
     except Exception as e:
         print(f"Error saving {file_path}: {e}")
+        return False
+
+_sidecar_locks_guard = threading.Lock()
+_sidecar_locks = weakref.WeakValueDictionary()
+
+def sidecar_lock(json_path):
+    """The lock serialising read-merge-write cycles on one JSON file; held only while in use."""
+    json_path = os.path.normcase(os.path.abspath(json_path))
+    with _sidecar_locks_guard:
+        lock = _sidecar_locks.get(json_path)
+        if lock is None:
+            lock = threading.RLock()
+            _sidecar_locks[json_path] = lock
+        return lock
+
+def _gallery_folder(path):
+    """The gallery folder (relative to its LoRA root, "." for the root itself) containing path."""
+    directory = os.path.dirname(os.path.normpath(path))
+    for root in folder_paths.get_folder_paths("loras"):
+        root = os.path.normpath(root)
+        if directory == root or directory.startswith(root + os.sep):
+            relative_path = os.path.relpath(directory, root)
+            return "." if relative_path == "." else relative_path
+    return directory
+
+class LoraMetadataStore:
+    """Optional single-file copy of every LoRA sidecar in SQLite (WAL), with folder, sd version and tags indexed.
+
+    Sidecars stay the portable format and sync both ways: a sidecar whose mtime no longer matches
+    its row is re-imported, and rows edited in the store (marked dirty, by edit_lora_metadata with
+    deferred=True or by another program that also bumps updated_at) are written back out to their
+    sidecars after flush_delay; when both changed, the newer edit wins. Reads are served from an
+    in-memory copy of the table, reloaded when another connection commits (PRAGMA data_version),
+    and writes are batched into one transaction per flush_delay that never replaces a newer row.
+    """
+
+    def __init__(self, db_path, flush_delay=STATE_FLUSH_DELAY):
+        self.db_path = db_path
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._conn = None
+        self._rows = None
+        self._pending = {}
+        self._timer = None
+        self._export_timer = None
+        self._poll_timer = None
+        self._data_version = None
+        self._last_refresh = 0.0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "json_path TEXT PRIMARY KEY, folder TEXT NOT NULL, sd_version TEXT NOT NULL, "
+                "sidecar_mtime_ns INTEGER, meta TEXT NOT NULL, dirty INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_folder ON metadata (folder)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_sd_version ON metadata (sd_version)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata_tags ("
+                "tag TEXT NOT NULL, json_path TEXT NOT NULL, PRIMARY KEY (tag, json_path)) WITHOUT ROWID")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_tags_path ON metadata_tags (json_path)")
+            self._conn.commit()
+        return self._conn
+
+    def _read_table(self):
+        """Reads every row and the connection's data_version; call with _db_lock held."""
+        conn = self._connect()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        rows = {}
+        for json_path, mtime, meta, dirty, updated_at in conn.execute(
+                "SELECT json_path, sidecar_mtime_ns, meta, dirty, updated_at FROM metadata"):
+            try:
+                rows[json_path] = (mtime, json.loads(meta), bool(dirty), updated_at)
+            except ValueError:
+                continue
+        return version, rows
+
+    def _load_rows(self):
+        """json_path -> (sidecar_mtime_ns, meta, dirty, updated_at); call with _lock held."""
+        if self._rows is None:
+            with self._db_lock:
+                self._data_version, self._rows = self._read_table()
+        return self._rows
+
+    def refresh(self, force=False):
+        """Reloads rows another connection committed since the last look (at most once per
+        METADATA_STORE_REFRESH_INTERVAL unless forced); dirty ones are then exported."""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < METADATA_STORE_REFRESH_INTERVAL:
+            return
+        self._last_refresh = now
+        with self._lock:
+            self._load_rows()
+        with self._db_lock:
+            version = self._connect().execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            version, db_rows = self._read_table()
+            self._data_version = version
+        external_dirty = False
+        with self._lock:
+            rows = self._load_rows()
+            for json_path in [json_path for json_path in rows if json_path not in db_rows and json_path not in self._pending]:
+                del rows[json_path]
+            for json_path, row in db_rows.items():
+                if json_path in self._pending or rows.get(json_path) == row:
+                    continue
+                rows[json_path] = row
+                # Rewritten as-is so the tag index follows the external edit.
+                self._schedule(json_path, row)
+                external_dirty = external_dirty or row[2]
+        if external_dirty:
+            self._schedule_export()
+
+    def start_polling(self, interval=METADATA_STORE_REFRESH_INTERVAL):
+        """Keeps picking up edits made by other programs while the server runs."""
+        def poll():
+            try:
+                self.refresh(force=True)
+            except Exception as e:
+                print(f"Local Lora Gallery: Error refreshing the metadata store: {e}")
+            self._poll_timer = threading.Timer(interval, poll)
+            self._poll_timer.daemon = True
+            self._poll_timer.start()
+        if self._poll_timer is None:
+            poll()
+
+    @staticmethod
+    def _row_is_current(row, sidecar_mtime):
+        mtime, _, dirty, updated_at = row
+        if mtime == sidecar_mtime:
+            return True
+        # A row edited in the store after the sidecar last changed still wins until it is exported.
+        return dirty and sidecar_mtime is not None and updated_at * 1e9 >= sidecar_mtime
+
+    def get(self, json_path, sidecar_mtime):
+        """Returns a copy of the stored metadata if it is current for the sidecar's mtime, else None."""
+        self.refresh()
+        with self._lock:
+            row = self._load_rows().get(json_path)
+        if row is None or not self._row_is_current(row, sidecar_mtime):
+            return None
+        return dict(row[1])
+
+    def _schedule(self, json_path, row):
+        self._pending[json_path] = row
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _schedule_export(self):
+        with self._lock:
+            if self._export_timer is not None:
+                return
+            self._export_timer = threading.Timer(self.flush_delay, self._export_in_background)
+            self._export_timer.daemon = True
+            self._export_timer.start()
+
+    def _export_in_background(self):
+        with self._lock:
+            self._export_timer = None
+        try:
+            self.export_dirty()
+            self.flush()
+        except Exception as e:
+            print(f"Local Lora Gallery: Error exporting metadata store edits: {e}")
+
+    def put(self, json_path, meta, sidecar_mtime, dirty=False):
+        """Records metadata as read from (or written to) the sidecar with the given mtime.
+
+        dirty=True marks an edit made in the store; it is written back to the sidecar shortly after.
+        """
+        row = (sidecar_mtime, dict(meta), dirty, time.time())
+        with self._lock:
+            self._load_rows()[json_path] = row
+            self._schedule(json_path, row)
+        if dirty:
+            self._schedule_export()
+
+    def discard(self, json_path):
+        with self._lock:
+            if self._load_rows().pop(json_path, None) is not None:
+                self._schedule(json_path, None)
+
+    def flush(self):
+        # Serialised, so a concurrent timer flush has committed by the time this returns.
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                with self._db_lock, self._connect() as conn:
+                    for json_path, row in pending.items():
+                        if row is None:
+                            conn.execute("DELETE FROM metadata_tags WHERE json_path = ?", (json_path,))
+                            conn.execute("DELETE FROM metadata WHERE json_path = ?", (json_path,))
+                            continue
+                        mtime, meta, dirty, updated_at = row
+                        # A row another program updated more recently is left alone; refresh() picks it up.
+                        cursor = conn.execute(
+                            "INSERT INTO metadata (json_path, folder, sd_version, sidecar_mtime_ns, meta, dirty, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (json_path) DO UPDATE SET "
+                            "folder = excluded.folder, sd_version = excluded.sd_version, "
+                            "sidecar_mtime_ns = excluded.sidecar_mtime_ns, meta = excluded.meta, "
+                            "dirty = excluded.dirty, updated_at = excluded.updated_at "
+                            "WHERE excluded.updated_at >= metadata.updated_at",
+                            (json_path, _gallery_folder(json_path), str(meta.get("sd version", "")), mtime,
+                             json.dumps(meta, ensure_ascii=False), int(dirty), updated_at))
+                        if cursor.rowcount == 0:
+                            continue
+                        conn.execute("DELETE FROM metadata_tags WHERE json_path = ?", (json_path,))
+                        conn.executemany("INSERT OR IGNORE INTO metadata_tags (tag, json_path) VALUES (?, ?)",
+                                         [(tag, json_path) for tag in _entry_tags(meta)[1]])
+            except sqlite3.Error as e:
+                print(f"Local Lora Gallery: Error writing the metadata store: {e}")
+                with self._lock:
+                    for json_path, row in pending.items():
+                        self._pending.setdefault(json_path, row)
+
+    def import_sidecars(self, json_paths):
+        """Re-reads every sidecar whose row is stale and drops rows for sidecars that are no longer
+        part of the library. Returns (imported, removed)."""
+        json_paths = set(json_paths)
+        imported = 0
+        for json_path in json_paths:
+            mtime = _get_mtime(json_path)
+            with self._lock:
+                row = self._load_rows().get(json_path)
+            if mtime is None:
+                if row is not None and not row[2]:
+                    self.discard(json_path)
+                continue
+            if row is not None and self._row_is_current(row, mtime):
+                continue
+            meta = load_json_file(json_path, {})
+            self.put(json_path, meta if isinstance(meta, dict) else {}, mtime)
+            imported += 1
+        with self._lock:
+            gone = [json_path for json_path in self._load_rows() if json_path not in json_paths]
+        for json_path in gone:
+            self.discard(json_path)
+        return imported, len(gone)
+
+    def export_dirty(self):
+        """Writes rows edited in the store back to their sidecars. Returns how many were written.
+
+        A sidecar changed on disk after the row was edited wins and is left for import_sidecars.
+        """
+        with self._lock:
+            dirty = [json_path for json_path, row in self._load_rows().items() if row[2]]
+        exported = 0
+        for json_path in dirty:
+            if not os.path.isdir(os.path.dirname(json_path)):
+                continue
+            with sidecar_lock(json_path):
+                # Re-read under the sidecar lock so a newer store edit is never overwritten by an older one.
+                with self._lock:
+                    row = self._load_rows().get(json_path)
+                if row is None or not row[2]:
+                    continue
+                sidecar_mtime = _get_mtime(json_path)
+                if sidecar_mtime not in (None, row[0]) and sidecar_mtime > row[3] * 1e9:
+                    continue
+                meta = row[1]
+                if not save_json_file(meta, json_path):
+                    continue
+                # Records the new sidecar mtime here too, which clears the dirty flag.
+                lora_metadata_cache.store(json_path, meta)
+            lora_name = lora_catalog.name_for_stem(os.path.splitext(json_path)[0])
+            if lora_name:
+                lora_catalog.update_metadata(lora_name, meta)
+            exported += 1
+        return exported
+
+    def query(self, tags=(), mode="OR", folder="", sd_version=""):
+        """Sidecar paths whose indexed tags (lowercased), gallery folder and sd version match."""
+        self.refresh(force=True)
+        self.flush()
+        clauses, params = [], []
+        if folder:
+            clauses.append("m.folder = ?")
+            params.append(folder)
+        if sd_version:
+            clauses.append("m.sd_version = ?")
+            params.append(sd_version)
+        if tags:
+            placeholders = ", ".join("?" * len(tags))
+            having = f" HAVING COUNT(DISTINCT tag) = {len(set(tags))}" if mode == "AND" else ""
+            clauses.append(f"m.json_path IN (SELECT json_path FROM metadata_tags WHERE tag IN ({placeholders}) "
+                           f"GROUP BY json_path{having})")
+            params.extend(tags)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db_lock:
+            return [row[0] for row in self._connect().execute(f"SELECT m.json_path FROM metadata m{where}", params)]
+
+    def stats(self):
+        with self._lock:
+            rows = self._load_rows()
+            return {
+                "rows": len(rows),
+                "dirty": sum(1 for row in rows.values() if row[2]),
+                "pending_writes": len(self._pending),
+            }
+
+metadata_store = LoraMetadataStore(METADATA_DB_FILE) if METADATA_STORE_ENABLED else None
+
+class LoraMetadataCache:
+    """Process-wide cache of LoRA sidecar metadata, shared by node execution and the HTTP routes.
+
+    Resolved LoRA paths are remembered, and a sidecar is only re-read when its mtime changes,
+    so a warm lookup costs a single stat instead of a path search plus a JSON parse. With the
+    metadata store enabled, a miss is answered from the store before opening the sidecar.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}
+        self._sidecars = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_path(self, lora_name):
+        with self._lock:
+            lora_path = self._paths.get(lora_name)
+        if lora_path and os.path.isfile(lora_path):
+            return lora_path
+        lora_path = folder_paths.get_full_path("loras", lora_name)
+        with self._lock:
+            if lora_path:
+                self._paths[lora_name] = lora_path
+            else:
+                self._paths.pop(lora_name, None)
+        return lora_path
+
+    def load_path(self, json_path, mtime=None):
+        """Returns a copy of the sidecar at json_path, or {} if it does not exist."""
+        if mtime is None:
+            mtime = _get_mtime(json_path)
+        with self._lock:
+            cached = self._sidecars.get(json_path)
+            if cached is not None and cached[0] == mtime:
+                self.hits += 1
+                return dict(cached[1])
+            self.misses += 1
+        meta = {}
+        if mtime is not None:
+            meta = metadata_store.get(json_path, mtime) if metadata_store is not None else None
+            if meta is None:
+                meta = load_json_file(json_path, {})
+                if not isinstance(meta, dict):
+                    meta = {}
+                if metadata_store is not None:
+                    metadata_store.put(json_path, meta, mtime)
+        with self._lock:
+            self._sidecars[json_path] = (mtime, meta)
+        return dict(meta)
+
+    def load(self, lora_name):
+        with self._lock:
+            lora_path = self._paths.get(lora_name)
+        if lora_path:
+            json_path = os.path.splitext(lora_path)[0] + ".json"
+            mtime = _get_mtime(json_path)
+            # A present sidecar proves the cached path is still valid; otherwise re-resolve.
+            if mtime is not None:
+                return self.load_path(json_path, mtime)
+        lora_path = self.resolve_path(lora_name)
+        if not lora_path:
+            return {}
+        return self.load_path(os.path.splitext(lora_path)[0] + ".json")
+
+    def store(self, json_path, meta):
+        """Records metadata the gallery just wrote so the next read is a hit."""
+        mtime = _get_mtime(json_path)
+        with self._lock:
+            if mtime is None:
+                self._sidecars.pop(json_path, None)
+            else:
+                self._sidecars[json_path] = (mtime, dict(meta))
+        if metadata_store is not None and mtime is not None:
+            metadata_store.put(json_path, meta, mtime)
+
+    def remember(self, json_path, meta, mtime):
+        """Serves meta for the sidecar as it is at mtime, e.g. after an edit made only in the metadata store."""
+        with self._lock:
+            self._sidecars[json_path] = (mtime, dict(meta))
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._sidecars),
+            }
+
+lora_metadata_cache = LoraMetadataCache()
 
-#load_metadata = lambda: load_json_file(METADATA_FILE)
-#save_metadata = lambda data: save_json_file(data, METADATA_FILE)
 def get_lora_json_path(lora_name):
     try:
-        lora_path = folder_paths.get_full_path("loras", lora_name)
+        lora_path = lora_metadata_cache.resolve_path(lora_name)
         if not lora_path:
             return None
         base_name, _ = os.path.splitext(lora_path)
@@ -95,223 +870,1651 @@ def get_lora_json_path(lora_name):
         return None
 
 def load_lora_metadata(lora_name):
-    json_path = get_lora_json_path(lora_name)
-    if json_path and os.path.exists(json_path):
-        return load_json_file(json_path)
-    return {}
+    return lora_metadata_cache.load(lora_name)
 
-def save_lora_metadata(lora_name, new_data, merge=True):
+def edit_lora_metadata(lora_name, edit, merge=True, deferred=False, update_catalog=True):
+    """Runs edit(current_metadata) -> changes and writes the merged result, all under the sidecar's lock
+    so concurrent edits of the same LoRA cannot lose each other's fields. Returns the changes, or None
+    if the sidecar path cannot be resolved.
+
+    With deferred=True and the metadata store enabled, the edit only goes to the store as a dirty
+    row, and the sidecar is written back in the background. Batch edits pass update_catalog=False
+    and publish all their LoRAs at once with update_catalog_metadata.
+    """
     json_path = get_lora_json_path(lora_name)
     if not json_path:
         print(f"Could not determine JSON path for {lora_name}")
+        return None
+
+    with sidecar_lock(json_path):
+        mtime = _get_mtime(json_path)
+        current_data = lora_metadata_cache.load_path(json_path, mtime) if merge else {}
+        changes = edit(dict(current_data))
+        if not changes and merge:
+            return changes
+        current_data.update(changes)
+        if deferred and metadata_store is not None:
+            metadata_store.put(json_path, current_data, mtime, dirty=True)
+            lora_metadata_cache.remember(json_path, current_data, mtime)
+        else:
+            if not save_json_file(current_data, json_path):
+                raise OSError(f"Could not write {json_path}")
+            lora_metadata_cache.store(json_path, current_data)
+            mtime = _get_mtime(json_path)
+        # Still under the lock, and stamped with the mtime of this write, so an overlapping older
+        # edit can never leave its metadata in the catalog under a newer sidecar mtime.
+        if update_catalog:
+            lora_catalog.update_metadata(lora_name, current_data, mtime)
+    return changes
+
+def update_catalog_metadata(lora_names):
+    """Publishes the current metadata of many edited LoRAs as one catalog change.
+
+    Every sidecar lock is held (taken in path order, so two batches cannot deadlock) while the
+    metadata is read and handed to the catalog, so no newer edit of the same LoRAs can be
+    overwritten by this one.
+    """
+    json_paths = {}
+    for lora_name in lora_names:
+        json_path = get_lora_json_path(lora_name)
+        if json_path:
+            json_paths[lora_name] = json_path
+    with ExitStack() as stack:
+        for json_path in sorted(set(json_paths.values())):
+            stack.enter_context(sidecar_lock(json_path))
+        metas, json_mtimes = {}, {}
+        for lora_name, json_path in json_paths.items():
+            json_mtimes[lora_name] = _get_mtime(json_path)
+            metas[lora_name] = lora_metadata_cache.load_path(json_path, json_mtimes[lora_name])
+        lora_catalog.update_metadata_many(metas, json_mtimes)
+
+def save_lora_metadata(lora_name, new_data, merge=True):
+    return edit_lora_metadata(lora_name, lambda current: new_data, merge=merge) is not None
+
+class JsonStateStore:
+    """In-memory copy of a small JSON state file with debounced, atomic write-behind.
+
+    Mutations only mark the store dirty; a single timer flushes everything changed within
+    STATE_FLUSH_DELAY in one write_text_atomic call, and pending changes are flushed
+    at shutdown. With max_entries set, the least recently used keys are dropped.
+    """
+    def __init__(self, file_path, max_entries=None, indent=None, flush_delay=STATE_FLUSH_DELAY):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.indent = indent
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._data = None
+        self._dirty = False
+        self._timer = None
+
+    def _load(self):
+        if self._data is None:
+            data = load_json_file(self.file_path, {})
+            self._data = OrderedDict(data.items() if isinstance(data, dict) else ())
+            self._evict()
+        return self._data
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self._dirty = True
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def get(self, key, default=None):
+        with self._lock:
+            data = self._load()
+            if key not in data:
+                return default
+            if self.max_entries is not None:
+                data.move_to_end(key)
+            return json.loads(json.dumps(data[key]))
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._load()))
+
+    def set(self, key, value):
+        with self._lock:
+            data = self._load()
+            data[key] = value
+            data.move_to_end(key)
+            self._evict()
+            self._mark_dirty()
+
+    def update(self, key, values):
+        """Merges values into the dict stored under key."""
+        with self._lock:
+            data = self._load()
+            current = data.get(key)
+            if not isinstance(current, dict):
+                current = {}
+            current.update(values)
+            data[key] = current
+            data.move_to_end(key)
+            self._evict()
+            self._mark_dirty()
+
+    def delete(self, key):
+        with self._lock:
+            data = self._load()
+            if key in data:
+                del data[key]
+                self._mark_dirty()
+                return True
+            return False
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty or self._data is None:
+                    return
+                payload = json.dumps(self._data, indent=self.indent, ensure_ascii=False)
+                self._dirty = False
+            try:
+                write_text_atomic(payload, self.file_path)
+            except Exception as e:
+                print(f"Local Lora Gallery: Error saving {self.file_path}: {e}")
+                # Left dirty for the next mutation or flush; re-arming the timer here would fail at shutdown.
+                with self._lock:
+                    self._dirty = True
+
+ui_state_store = JsonStateStore(UI_STATE_FILE, max_entries=UI_STATE_MAX_NODES)
+presets_store = JsonStateStore(PRESETS_FILE, indent=4)
+
+def flush_state_stores(app=None):
+    for store in (ui_state_store, presets_store, metadata_store):
+        if store is None:
+            continue
+        # One failing store must not keep the others from being written.
+        try:
+            store.flush()
+        except Exception as e:
+            print(f"Local Lora Gallery: Error flushing state: {e}")
+
+atexit.register(flush_state_stores)
+
+async def flush_state_stores_on_cleanup(app):
+    await run_in_gallery_executor(flush_state_stores)
+
+try:
+    server.PromptServer.instance.app.on_cleanup.append(flush_state_stores_on_cleanup)
+except Exception as e:
+    print(f"INFO: Local Lora Gallery - Could not register state flush on shutdown: {e}")
+
+class PreviewDirectoryCache:
+    """Per-directory basename -> preview files map, built with one os.scandir and keyed by the directory mtime."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dirs = {}
+
+    def _scan(self, directory):
+        previews, versions = {}, {}
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    base, ext = os.path.splitext(dir_entry.name)
+                    if ext.lower() in PREVIEW_EXTENSIONS:
+                        previews.setdefault(base, []).append(dir_entry.name)
+                        versions[dir_entry.name] = dir_entry.stat().st_mtime_ns
+        except OSError:
+            return {}, {}
+        for files in previews.values():
+            files.sort(key=_preview_priority)
+        return previews, versions
+
+    def _get_dir(self, directory, dir_mtime=None):
+        directory = os.path.normpath(directory)
+        if dir_mtime is None:
+            dir_mtime = _get_mtime(directory)
+        with self._lock:
+            cached = self._dirs.get(directory)
+            if cached and cached[0] == dir_mtime:
+                return cached
+        previews, versions = self._scan(directory)
+        cached = (dir_mtime, previews, versions)
+        with self._lock:
+            self._dirs[directory] = cached
+        return cached
+
+    def list_previews(self, directory, basename, dir_mtime=None):
+        """Returns every preview filename for the basename, best match first."""
+        return list(self._get_dir(directory, dir_mtime)[1].get(basename, []))
+
+    def find_preview(self, directory, basename, dir_mtime=None):
+        """Returns (filename, mtime_ns) of the best preview for the basename, or (None, None)."""
+        _, previews, versions = self._get_dir(directory, dir_mtime)
+        files = previews.get(basename)
+        if not files:
+            return None, None
+        return files[0], versions.get(files[0])
+
+    def invalidate(self, directory):
+        with self._lock:
+            self._dirs.pop(os.path.normpath(directory), None)
+
+    def record(self, directory, basename, added=(), removed=()):
+        """Applies preview files written or deleted by the gallery without rescanning the directory."""
+        directory = os.path.normpath(directory)
+        with self._lock:
+            cached = self._dirs.get(directory)
+            if cached is None:
+                return
+            files = [name for name in cached[1].get(basename, []) if name not in removed]
+            files.extend(name for name in added if name not in files)
+            files.sort(key=_preview_priority)
+            previews = dict(cached[1])
+            if files:
+                previews[basename] = files
+            else:
+                previews.pop(basename, None)
+            versions = {name: version for name, version in cached[2].items() if name not in removed}
+            for name in added:
+                versions[name] = _get_mtime(os.path.join(directory, name))
+            self._dirs[directory] = (_get_mtime(directory), previews, versions)
+
+def _preview_priority(filename):
+    return PREVIEW_EXTENSIONS.index(os.path.splitext(filename)[1].lower())
+
+preview_dir_cache = PreviewDirectoryCache()
+
+def record_preview_change(lora_name, lora_dir, lora_basename, added=(), removed=()):
+    """Applies preview files written or deleted by the gallery to the directory cache and the catalog."""
+    preview_dir_cache.record(lora_dir, lora_basename, added=added, removed=removed)
+    lora_catalog.refresh_preview(lora_name)
+
+def get_lora_preview_asset_info(lora_name, lora_path=None, dir_mtime=None):
+    """Finds a preview asset (image or video) for a given LoRA and returns its info."""
+    if lora_path is None:
+        lora_path = folder_paths.get_full_path("loras", lora_name)
+    if lora_path is None:
+        return None, "none"
+    lora_dir = os.path.dirname(lora_path)
+    lora_basename = os.path.splitext(os.path.basename(lora_path))[0]
+
+    preview_filename, preview_version = preview_dir_cache.find_preview(lora_dir, lora_basename, dir_mtime)
+    if not preview_filename:
+        return None, "none"
+
+    encoded_lora_name = urllib.parse.quote_plus(lora_name)
+    encoded_filename = urllib.parse.quote_plus(preview_filename)
+    url = f"/LocalLoraGalleryRemix/preview?filename={encoded_filename}&lora_name={encoded_lora_name}"
+    if preview_version is not None:
+        # Versioned URLs change whenever the file does, so browsers may cache them forever.
+        url += f"&v={preview_version:x}"
+
+    ext = os.path.splitext(preview_filename)[1].lower()
+    preview_type = "video" if ext in VIDEO_EXTENSIONS else "image"
+    return url, preview_type
+
+class ThumbnailCache:
+    """Size-bucketed preview thumbnails, stored under the SHA-256 of the source image's content.
+
+    Identical previews share one thumbnail, and a renamed, copied or touched preview reuses it. The
+    content hashes are remembered per (path, size, mtime), so a file is only read again once it
+    changes. The cache directory is capped at max_bytes; the least recently served thumbnails are
+    evicted first.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._content_hashes = OrderedDict()
+        self._entries = None
+        self._total_bytes = 0
+        self._format = None
+
+    @staticmethod
+    def bucket_for(size):
+        for bucket in THUMBNAIL_SIZES:
+            if size <= bucket:
+                return bucket
+        return THUMBNAIL_SIZES[-1]
+
+    def _thumbnail_format(self):
+        if self._format is None:
+            from PIL import features
+            self._format = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+        return self._format
+
+    @property
+    def content_type(self):
+        return "image/webp" if self._thumbnail_format()[0] == "WEBP" else "image/jpeg"
+
+    def _load_index(self):
+        if self._entries is not None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        found = []
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                if dir_entry.is_file() and not dir_entry.name.endswith(".tmp"):
+                    stat = dir_entry.stat()
+                    found.append((stat.st_mtime, dir_entry.name, stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((name, size) for _, name, size in found)
+        self._total_bytes = sum(self._entries.values())
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def _content_hash(self, source_path, stat):
+        key = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._content_hashes.get(key)
+            if digest is not None:
+                self._content_hashes.move_to_end(key)
+                return digest
+        sha256 = hashlib.sha256()
+        with open(source_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        with self._lock:
+            self._content_hashes[key] = digest
+            while len(self._content_hashes) > THUMBNAIL_CONTENT_HASHES:
+                self._content_hashes.popitem(last=False)
+        return digest
+
+    def read_thumbnail(self, source_path, size):
+        with open(self.get_thumbnail(source_path, size), "rb") as f:
+            return f.read()
+
+    def get_thumbnail(self, source_path, size):
+        """Returns the path of a thumbnail for source_path, generating it on first request (blocking)."""
+        stat = os.stat(source_path)
+        bucket = self.bucket_for(size)
+        image_format, ext = self._thumbnail_format()
+        filename = f"{self._content_hash(source_path, stat)}-{bucket}{ext}"
+        thumb_path = os.path.join(self.cache_dir, filename)
+
+        with self._lock:
+            self._load_index()
+            if filename in self._entries:
+                if os.path.exists(thumb_path):
+                    self._entries.move_to_end(filename)
+                    return thumb_path
+                self._total_bytes -= self._entries.pop(filename)
+
+        from PIL import Image, ImageOps
+
+        temp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((bucket, bucket), Image.LANCZOS)
+            if image_format == "JPEG" and img.mode != "RGB":
+                img = img.convert("RGB")
+            elif img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            img.save(temp_path, image_format, quality=85)
+        os.replace(temp_path, thumb_path)
+
+        with self._lock:
+            if filename not in self._entries:
+                self._entries[filename] = os.path.getsize(thumb_path)
+                self._total_bytes += self._entries[filename]
+            self._evict()
+        return thumb_path
+
+thumbnail_cache = ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+
+def _entry_tags(meta):
+    """Returns the sidecar tags as (display_tags, lowercased_tags), de-duplicated case-insensitively."""
+    tags = meta.get("tags", [])
+    if not isinstance(tags, list):
+        return [], []
+    display, lowered = [], []
+    for tag in tags:
+        tag = str(tag).strip()
+        if tag and tag.lower() not in lowered:
+            display.append(tag)
+            lowered.append(tag.lower())
+    return display, lowered
+
+def _entry_differs(old, new):
+    return any(old[key] != new[key] for key in ("path", "meta", "preview_url", "preview_type"))
+
+_SEARCH_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def _search_tokens(text):
+    return _SEARCH_TOKEN_PATTERN.findall(str(text).lower())
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance (an adjacent swap counts as one edit), or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+def _trigrams(token):
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class LoraSearchIndex:
+    """Token index over LoRA names, folders, trigger words, notes and tags for ranked search.
+
+    Each query term matches indexed tokens exactly, by prefix or as a substring; a term of four or
+    more characters with no literal match falls back to tokens within one or two edits, found
+    through shared trigrams. Every term must match somewhere in a LoRA; its score is the best match
+    quality times the field weight, summed over terms. LoRAs whose name contains the raw query
+    (the pre-index name_filter behaviour) always match too, so punctuation and partial words work.
+    Not thread-safe on its own; the catalog calls it with its lock held.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._documents = {}
+        self._grams = {}
+        self._sorted_tokens = None
+
+    @staticmethod
+    def _document_tokens(entry):
+        meta = entry["meta"]
+        fields = {
+            "name": [os.path.splitext(os.path.basename(entry["name"]))[0]],
+            "folder": [entry["folder"]] if entry["folder"] != "." else [],
+            "activation text": [meta.get("activation text", "")],
+            "tags": entry["tags"],
+            "notes": [meta.get("notes", "")],
+        }
+        weights = {}
+        for field, texts in fields.items():
+            weight = SEARCH_FIELD_WEIGHTS[field]
+            for text in texts:
+                for token in _search_tokens(text):
+                    if weights.get(token, 0.0) < weight:
+                        weights[token] = weight
+        return weights
+
+    def add(self, entry):
+        name = entry["name"]
+        self.remove(name)
+        weights = self._document_tokens(entry)
+        self._documents[name] = weights
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                for gram in _trigrams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+                self._sorted_tokens = None
+            postings[name] = weight
+
+    def remove(self, name):
+        for token in self._documents.pop(name, ()):
+            postings = self._postings[token]
+            postings.pop(name, None)
+            if postings:
+                continue
+            del self._postings[token]
+            for gram in _trigrams(token):
+                tokens = self._grams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._grams[gram]
+            self._sorted_tokens = None
+
+    def _term_matches(self, term):
+        """Returns {token: match quality} for one query term."""
+        matches = {}
+        if term in self._postings:
+            matches[term] = 1.0
+
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        for token in tokens[bisect.bisect_left(tokens, term):bisect.bisect_left(tokens, term + "\U0010ffff")]:
+            matches.setdefault(token, 0.8)
+
+        if len(term) < 3:
+            # Too short for trigrams: scan the token list for infixes such as "xl" in "sdxl".
+            for token in tokens:
+                if token not in matches and term in token:
+                    matches[token] = 0.6
+            return matches
+        inner_grams = sorted((self._grams.get(term[i:i + 3], set()) for i in range(len(term) - 2)), key=len)
+        for token in inner_grams[0].intersection(*inner_grams[1:]):
+            if token not in matches and term in token:
+                matches[token] = 0.6
+
+        # Typo tolerance only kicks in when the term matched nothing literally; numbers are never fuzzed.
+        if not matches and len(term) >= 4 and not term.isdigit():
+            limit = 2 if len(term) >= SEARCH_FUZZY_LONG_TERM else 1
+            candidates = set()
+            for gram in _trigrams(term):
+                candidates.update(self._grams.get(gram, ()))
+            for token in candidates:
+                distance = _edit_distance(term, token, limit)
+                if distance <= limit:
+                    matches[token] = 0.5 * (1.0 - distance / max(len(term), len(token)))
+        return matches
+
+    def search(self, query):
+        """Returns {lora_name: score} for the LoRAs matching every term of the query."""
+        scores = None
+        for term in dict.fromkeys(_search_tokens(query)):
+            term_scores = {}
+            best = term_scores.get
+            for token, quality in self._term_matches(term).items():
+                for name, weight in self._postings[token].items():
+                    score = quality * weight
+                    if score > best(name, 0.0):
+                        term_scores[name] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {name: score + term_scores[name] for name, score in scores.items() if name in term_scores}
+            if not scores:
+                break
+        scores = scores or {}
+        # A plain substring of the LoRA name (path and extension included) always matches.
+        query = str(query).strip().lower()
+        if query:
+            name_score = 0.3 * SEARCH_FIELD_WEIGHTS["name"]
+            for name in self._documents:
+                if name not in scores and query in name.lower():
+                    scores[name] = name_score
+        return scores
+
+class LoraCatalog:
+    """Resident index of every LoRA with its resolved path, root, folder, sidecar metadata and preview info.
+
+    The catalog is built once and then revalidated against directory mtimes, so paging,
+    searching and folder listings are answered from memory instead of rescanning the disk.
+    A tag -> LoRA-name inverted index is kept alongside the entries for tag filtering, and a
+    LoraSearchIndex for the name_filter search.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._folders = []
+        self._dir_mtimes = {}
+        self._built = False
+        self._last_validated = 0.0
+        self._tag_index = {}
+        self._tag_labels = {}
+        self._tag_list = None
+        self._search_index = LoraSearchIndex()
+        self._last_search = None
+        self._stems = {}
+        self._listeners = []
+        # (generation, added names, removed names, updated names) for since= delta listings; generations
+        # at or below _changelog_floor are no longer fully covered and need a full reload.
+        self._changelog = deque()
+        self._changelog_floor = 0
+        # Distinguishes generations of this process from those of a previous server run in ETags.
+        self.epoch = f"{int(time.time()):x}"
+        self.generation = 0
+
+    def _build_entry(self, lora_name, lora_full_path, root, previous=None, dir_mtime=None):
+        json_path = os.path.splitext(lora_full_path)[0] + ".json"
+        json_mtime = _get_mtime(json_path)
+
+        if previous and previous["path"] == lora_full_path and previous["json_mtime"] == json_mtime:
+            meta = previous["meta"]
+        else:
+            meta = lora_metadata_cache.load_path(json_path, json_mtime)
+
+        relative_path = os.path.relpath(os.path.dirname(lora_full_path), root)
+        preview_url, preview_type = get_lora_preview_asset_info(lora_name, lora_full_path, dir_mtime)
+        tags, tags_lower = _entry_tags(meta)
+
+        return {
+            "name": lora_name,
+            "name_lower": lora_name.lower(),
+            "path": lora_full_path,
+            "root": root,
+            "folder": "." if relative_path == "." else relative_path,
+            "json_path": json_path,
+            "json_mtime": json_mtime,
+            "meta": meta,
+            "tags": tags,
+            "tags_lower": tags_lower,
+            "preview_url": preview_url,
+            "preview_type": preview_type,
+        }
+
+    def _index_entry(self, entry):
+        self._stems[os.path.splitext(entry["path"])[0]] = entry["name"]
+        for tag, label in zip(entry["tags_lower"], entry["tags"]):
+            self._tag_index.setdefault(tag, set()).add(entry["name"])
+            self._tag_labels.setdefault(tag, label)
+        self._tag_list = None
+        self._search_index.add(entry)
+        self._last_search = None
+
+    def _unindex_entry(self, entry):
+        stem = os.path.splitext(entry["path"])[0]
+        if self._stems.get(stem) == entry["name"]:
+            del self._stems[stem]
+        for tag in entry["tags_lower"]:
+            names = self._tag_index.get(tag)
+            if names is None:
+                continue
+            names.discard(entry["name"])
+            if not names:
+                del self._tag_index[tag]
+                self._tag_labels.pop(tag, None)
+        self._tag_list = None
+        self._search_index.remove(entry["name"])
+        self._last_search = None
+
+    def _set_entry(self, lora_name, entry):
+        previous = self._entries.get(lora_name)
+        if previous is not None:
+            self._unindex_entry(previous)
+        self._entries[lora_name] = entry
+        self._index_entry(entry)
+
+    def add_listener(self, listener):
+        """Registers listener(change) for catalog changes; change holds the new generation, the added and
+        updated entries and the removed names. Listeners run with the catalog lock held and must not block."""
+        self._listeners.append(listener)
+
+    def _record_changes(self, added=(), removed=(), updated=()):
+        self.generation += 1
+        if not (added or removed or updated):
+            return
+        change = {"generation": self.generation, "added": list(added), "removed": list(removed), "updated": list(updated)}
+        self._changelog.append((self.generation, [entry["name"] for entry in change["added"]], change["removed"],
+                                [entry["name"] for entry in change["updated"]]))
+        if len(self._changelog) > CATALOG_CHANGELOG_SIZE:
+            self._changelog_floor = self._changelog.popleft()[0]
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Local Lora Gallery: Catalog listener failed: {e}")
+
+    def _dirs_changed(self):
+        for directory, mtime in self._dir_mtimes.items():
+            if _get_mtime(directory) != mtime:
+                return True
         return False
+
+    def _scan(self):
+        lora_files = folder_paths.get_filename_list("loras")
+        lora_roots = [os.path.normpath(root) for root in folder_paths.get_folder_paths("loras")]
+
+        dir_mtimes = {}
+        def dir_mtime(directory):
+            if directory not in dir_mtimes:
+                dir_mtimes[directory] = _get_mtime(directory)
+            return dir_mtimes[directory]
+
+        for root in lora_roots:
+            dir_mtime(root)
+
+        entries = {}
+        changed = False
+        for lora in lora_files:
+            previous = self._entries.get(lora)
+            if previous:
+                lora_dir = os.path.dirname(previous["path"])
+                if self._dir_mtimes.get(lora_dir) is not None and self._dir_mtimes[lora_dir] == dir_mtime(lora_dir):
+                    entries[lora] = previous
+                    continue
+
+            lora_full_path = folder_paths.get_full_path("loras", lora)
+            if not lora_full_path:
+                continue
+            lora_full_path = os.path.normpath(lora_full_path)
+
+            this_lora_root = None
+            for root in lora_roots:
+                if lora_full_path.startswith(root + os.sep):
+                    this_lora_root = root
+                    break
+
+            if not this_lora_root:
+                print(f"Local Lora Gallery: Could not find a root folder for {lora_full_path}. Skipping.")
+                continue
+
+            # Track every directory between the LoRA and its root so new nested folders are noticed.
+            directory = os.path.dirname(lora_full_path)
+            while True:
+                dir_mtime(directory)
+                if directory == this_lora_root or len(directory) <= len(this_lora_root):
+                    break
+                directory = os.path.dirname(directory)
+
+            entries[lora] = self._build_entry(lora, lora_full_path, this_lora_root, previous,
+                                              dir_mtimes[os.path.dirname(lora_full_path)])
+            changed = True
+
+        for lora, previous in self._entries.items():
+            if entries.get(lora) is not previous:
+                self._unindex_entry(previous)
+        for lora, entry in entries.items():
+            if self._entries.get(lora) is not entry:
+                self._index_entry(entry)
+
+        if not self._built:
+            self.generation += 1
+            self._changelog_floor = self.generation
+        elif changed or entries.keys() != self._entries.keys():
+            removed = [lora for lora in self._entries if lora not in entries]
+            if removed:
+                try:
+                    lora_hash_store.prune([self._entries[lora]["path"] for lora in removed],
+                                          [entry["path"] for lora, entry in entries.items() if lora not in self._entries])
+                except Exception as e:
+                    print(f"Local Lora Gallery: Could not prune the hash store: {e}")
+            self._record_changes(
+                added=[entry for lora, entry in entries.items() if lora not in self._entries],
+                removed=removed,
+                updated=[entry for lora, entry in entries.items()
+                         if lora in self._entries and _entry_differs(self._entries[lora], entry)])
+
+        self._entries = entries
+        self._folders = sorted({entry["folder"] for entry in entries.values()}, key=lambda s: s.lower())
+        self._dir_mtimes = dir_mtimes
+        self._built = True
+
+    def ensure_fresh(self, force=False):
+        """Rebuilds the changed parts of the catalog if any tracked directory mtime moved."""
+        with self._lock:
+            now = time.monotonic()
+            if self._built and not force:
+                if now - self._last_validated < CATALOG_REVALIDATE_INTERVAL:
+                    return
+                if not self._dirs_changed():
+                    self._last_validated = now
+                    return
+            self._scan()
+            self._last_validated = time.monotonic()
+
+    def changes_since(self, generation):
+        """Net (added, removed, updated) LoRA names since the given generation, or None when the
+        changelog no longer reaches back that far. Added names are upserts: a LoRA removed and
+        re-added in between is reported as added."""
+        self.ensure_fresh()
+        with self._lock:
+            if generation < self._changelog_floor or generation > self.generation:
+                return None
+            added, removed, updated = set(), set(), set()
+            for change_generation, added_names, removed_names, updated_names in self._changelog:
+                if change_generation <= generation:
+                    continue
+                for name in added_names:
+                    removed.discard(name)
+                    updated.discard(name)
+                    added.add(name)
+                for name in removed_names:
+                    updated.discard(name)
+                    if name in added:
+                        added.discard(name)
+                    else:
+                        removed.add(name)
+                for name in updated_names:
+                    if name not in added:
+                        updated.add(name)
+            return added, removed, updated
+
+    def etag(self, *parts):
+        """Strong ETag for a response derived only from the catalog state and the given request parts."""
+        self.ensure_fresh()
+        digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+        return f'"{self.epoch}-{self.generation:x}-{digest}"'
+
+    def search(self, query):
+        """Ranked {lora_name: score} for a search over names, folders, trigger words, notes and tags."""
+        self.ensure_fresh()
+        with self._lock:
+            # Filtering and relevance ordering of one listing both ask for the same query.
+            if self._last_search is None or self._last_search[0] != query:
+                self._last_search = (query, self._search_index.search(query))
+            return self._last_search[1]
+
+    def names_with_tags(self, tags, mode="OR"):
+        """Returns the LoRA names carrying all (AND) or any (OR) of the given lowercased tags."""
+        self.ensure_fresh()
+        with self._lock:
+            tag_sets = [self._tag_index.get(tag, set()) for tag in tags]
+            if not tag_sets:
+                return set()
+            if mode == "AND":
+                return set.intersection(*sorted(tag_sets, key=len))
+            return set().union(*tag_sets)
+
+    def tag_counts(self):
+        """Returns [(tag, lora_count), ...] sorted by tag, cached until the index changes."""
+        self.ensure_fresh()
+        with self._lock:
+            if self._tag_list is None:
+                self._tag_list = sorted(
+                    ((self._tag_labels[tag], len(names)) for tag, names in self._tag_index.items()),
+                    key=lambda item: item[0].lower())
+            return self._tag_list
+
+    def entries(self):
+        self.ensure_fresh()
+        with self._lock:
+            return list(self._entries.values())
+
+    def folders(self):
+        self.ensure_fresh()
+        with self._lock:
+            return list(self._folders)
+
+    def get(self, lora_name):
+        self.ensure_fresh()
+        with self._lock:
+            return self._entries.get(lora_name)
+
+    def _touch_dir(self, entry):
+        lora_dir = os.path.dirname(entry["path"])
+        if lora_dir in self._dir_mtimes:
+            self._dir_mtimes[lora_dir] = _get_mtime(lora_dir)
+
+    def update_metadata(self, lora_name, meta, json_mtime=None):
+        """Write-through hook for sidecar edits made by the gallery itself."""
+        self.update_metadata_many({lora_name: meta}, {lora_name: json_mtime} if json_mtime is not None else None)
+
+    def update_metadata_many(self, metas, json_mtimes=None):
+        """Write-through hook for a batch of sidecar edits; recorded as a single catalog change.
+
+        json_mtimes gives the sidecar mtime each meta was written with. Without it the mtime is read
+        now, which is only right if no other edit of that sidecar can have landed in between.
+        """
+        json_mtimes = json_mtimes or {}
+        updated = []
+        with self._lock:
+            for lora_name, meta in metas.items():
+                entry = self._entries.get(lora_name)
+                if not entry:
+                    continue
+                tags, tags_lower = _entry_tags(meta)
+                entry = dict(entry,
+                             meta=meta,
+                             json_mtime=json_mtimes[lora_name] if lora_name in json_mtimes else _get_mtime(entry["json_path"]),
+                             tags=tags,
+                             tags_lower=tags_lower)
+                self._set_entry(lora_name, entry)
+                self._touch_dir(entry)
+                updated.append(entry)
+            if updated:
+                self._record_changes(updated=updated)
+
+    def refresh_preview(self, lora_name):
+        """Write-through hook for preview files saved or deleted by the gallery itself."""
+        with self._lock:
+            entry = self._entries.get(lora_name)
+            if not entry:
+                return
+            preview_url, preview_type = get_lora_preview_asset_info(lora_name, entry["path"])
+            entry = dict(entry, preview_url=preview_url, preview_type=preview_type)
+            self._set_entry(lora_name, entry)
+            self._touch_dir(entry)
+            self._record_changes(updated=[entry])
+
+    def name_for_stem(self, stem):
+        """Maps a path without extension (a LoRA, its sidecar or a preview) to the LoRA name."""
+        with self._lock:
+            return self._stems.get(os.path.normpath(stem))
+
+    def reload_entry(self, lora_name):
+        """Re-reads a LoRA's sidecar and previews after they were changed outside the gallery."""
+        with self._lock:
+            entry = self._entries.get(lora_name)
+            if not entry:
+                return
+            preview_dir_cache.invalidate(os.path.dirname(entry["path"]))
+            new_entry = self._build_entry(lora_name, entry["path"], entry["root"], entry)
+            if _entry_differs(entry, new_entry):
+                self._set_entry(lora_name, new_entry)
+                self._record_changes(updated=[new_entry])
+
+    def stale_entries(self):
+        """Names whose sidecar or preview was edited in place, which leaves the directory mtime alone.
+
+        Costs a stat per sidecar and a scandir per folder, so watchers without file events only
+        run it occasionally.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        stale = []
+        rescanned = set()
+        for entry in entries:
+            directory = os.path.dirname(entry["path"])
+            if directory not in rescanned:
+                preview_dir_cache.invalidate(directory)
+                rescanned.add(directory)
+            preview_url, preview_type = get_lora_preview_asset_info(entry["name"], entry["path"])
+            if (_get_mtime(entry["json_path"]) != entry["json_mtime"]
+                    or (preview_url, preview_type) != (entry["preview_url"], entry["preview_type"])):
+                stale.append(entry["name"])
+        return stale
+
+lora_catalog = LoraCatalog()
+
+PREVIEW_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def _is_not_modified(request, etag, mtime=None):
+    """Evaluates If-None-Match (preferred) or If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+    if mtime is not None:
+        if_modified_since = request.if_modified_since
+        if if_modified_since is not None:
+            return int(mtime) <= if_modified_since.timestamp()
+    return False
+
+def _listing_headers(etag):
+    # Listings change with the catalog, so clients must revalidate, but a 304 skips the body.
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+class HostRateLimiter:
+    """Spaces out requests to the same host so bulk jobs stay within API rate limits."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+
+    async def wait(self, url):
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+civitai_rate_limiter = HostRateLimiter(CIVITAI_MIN_REQUEST_INTERVAL)
+
+_http_session = None
+_http_session_loop = None
+
+def get_http_session():
+    """Returns the module-wide pooled ClientSession, creating it on the running loop if needed."""
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=60,
+            ttl_dns_cache=300)
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+        _http_session_loop = loop
+    return _http_session
+
+async def close_http_session(app=None):
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+try:
+    server.PromptServer.instance.app.on_cleanup.append(close_http_session)
+except Exception as e:
+    print(f"INFO: Local Lora Gallery - Could not register HTTP session cleanup: {e}")
+
+class CivitaiResponseCache:
+    """On-disk cache of Civitai by-hash lookups.
+
+    Found models are kept for CIVITAI_CACHE_TTL and 404s for CIVITAI_NEGATIVE_CACHE_TTL, so rerunning a
+    sync across a library only reaches the network for LoRAs that were never looked up.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS by_hash ("
+                "hash TEXT PRIMARY KEY, status INTEGER NOT NULL, body TEXT, fetched_at REAL NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, model_hash):
+        """Returns (status, data) for a fresh cached lookup, or None."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status, body, fetched_at FROM by_hash WHERE hash = ?", (model_hash.lower(),)).fetchone()
+        if not row:
+            return None
+        status, body, fetched_at = row
+        ttl = CIVITAI_CACHE_TTL if status == 200 else CIVITAI_NEGATIVE_CACHE_TTL
+        if time.time() - fetched_at > ttl:
+            return None
+        return status, json.loads(body) if body else None
+
+    def put(self, model_hash, status, data=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO by_hash (hash, status, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (model_hash.lower(), status, json.dumps(data) if data is not None else None, time.time()))
+            conn.commit()
+
+civitai_response_cache = CivitaiResponseCache(CIVITAI_CACHE_DB_FILE)
+
+async def fetch_civitai_version(model_hash, refresh=False):
+    """Returns (status, version_data) for a model hash, answered from the response cache when possible."""
+    if not refresh:
+        cached = await run_in_gallery_executor(civitai_response_cache.get, model_hash)
+        if cached:
+            return cached
+
+    civitai_version_url = f"{CIVITAI_API_BASE}/model-versions/by-hash/{model_hash}"
+    await civitai_rate_limiter.wait(civitai_version_url)
+    async with get_http_session().get(civitai_version_url) as response:
+        if response.status == 200:
+            civitai_version_data = await response.json()
+            await run_in_gallery_executor(civitai_response_cache.put, model_hash, 200, civitai_version_data)
+            return 200, civitai_version_data
+        if response.status == 404:
+            await run_in_gallery_executor(civitai_response_cache.put, model_hash, 404)
+        return response.status, None
+
+async def sync_lora_with_civitai(lora_name, sync_image=True, sync_trigger=True, sync_url=True, persist=False, refresh=False):
+    """Looks a LoRA up on Civitai by hash, downloads its preview and collects trigger words and URL.
+
+    Returns (payload, http_status) shaped like the sync_civitai response. With persist=True the
+    collected trigger words and URL are also written to the sidecar; refresh=True bypasses the
+    cached by-hash lookup.
+    """
+    lora_full_path = await run_in_gallery_executor(folder_paths.get_full_path, "loras", lora_name)
+    if not lora_full_path:
+        return {"status": "error", "message": "LoRA file not found"}, 404
+
+    lora_meta = await run_in_gallery_executor(load_lora_metadata, lora_name)
+
+    model_hash = lora_meta.get('hash')
+    if not model_hash:
+        print(f"Local Lora Gallery: Calculating hash for {lora_name}...")
+        model_hash = await compute_lora_hash(lora_name, lora_full_path)
+        if model_hash:
+            lora_meta['hash'] = model_hash
+            await run_in_gallery_executor(save_lora_metadata, lora_name, {'hash': model_hash}, merge=True)
+        else:
+            return {"status": "error", "message": "Failed to calculate hash"}, 500
+
+    status, civitai_version_data = await fetch_civitai_version(model_hash, refresh)
+    if status != 200:
+        return {"status": "error", "message": f"Civitai API returned {status}. Model not found."}, status
+    model_id = civitai_version_data.get('modelId')
+
+    if sync_image:
+        images = civitai_version_data.get('images', [])
+        if images:
+            preview_media = next((img for img in images if img.get('type') == 'image'), images[0])
+            preview_url = preview_media.get('url')
+            is_video = preview_media.get('type') == 'video'
+
+            try:
+                if is_video:
+                    if '/original=true/' in preview_url:
+                        temp_url = preview_url.replace('/original=true/', '/transcode=true,width=450,optimized=true/')
+                        final_url = os.path.splitext(temp_url)[0] + '.webm'
+                    else:
+                        url_obj = urlparse(preview_url)
+                        path_parts = url_obj.path.split('/')
+                        filename = path_parts.pop()
+                        filename_base = os.path.splitext(filename)[0]
+                        new_path = f"{'/'.join(path_parts)}/transcode=true,width=450,optimized=true/{filename_base}.webm"
+                        final_url = url_obj._replace(path=new_path).geturl()
+                    file_ext = '.webm'
+                else:
+                    if '/original=true/' in preview_url:
+                       final_url = preview_url.replace('/original=true/', '/width=450/')
+                    else:
+                        final_url = preview_url.replace('/width=\d+/', '/width=450/') if '/width=' in preview_url else preview_url.replace(urlparse(preview_url).path, f"/width=450{urlparse(preview_url).path}")
+
+                    path = urlparse(final_url).path
+                    file_ext = os.path.splitext(path)[1]
+                    if not file_ext or file_ext.lower() not in IMAGE_EXTENSIONS:
+                        file_ext = '.jpg'
+            except Exception as e:
+                final_url = preview_url
+                file_ext = '.jpg' if not is_video else '.mp4'
+
+            lora_dir = os.path.dirname(lora_full_path)
+            lora_basename = os.path.splitext(os.path.basename(lora_full_path))[0]
+            save_path = os.path.join(lora_dir, lora_basename + file_ext)
+
+            await civitai_rate_limiter.wait(final_url)
+            download_timeout = aiohttp.ClientTimeout(total=None, sock_connect=DOWNLOAD_CONNECT_TIMEOUT,
+                                                     sock_read=DOWNLOAD_READ_TIMEOUT)
+            async with get_http_session().get(final_url, timeout=download_timeout) as download_response:
+                if download_response.status == 200:
+                    f = await run_in_gallery_executor(open, save_path, 'wb')
+                    try:
+                        async for chunk in download_response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            await run_in_gallery_executor(f.write, chunk)
+                    finally:
+                        await run_in_gallery_executor(f.close)
+                    await run_in_gallery_executor(record_preview_change, lora_name, lora_dir, lora_basename,
+                                                  added=[os.path.basename(save_path)])
+
+    new_meta_data = {}
     
-    current_data = {}
-    if merge and os.path.exists(json_path):
-        current_data = load_json_file(json_path)
+    if sync_trigger:
+        trained_words = civitai_version_data.get('trainedWords', [])
+        if trained_words:
+            new_meta_data['activation text'] = ", ".join(trained_words)
     
-    current_data.update(new_data)
-    save_json_file(current_data, json_path)
-    return True
+    if sync_url and model_id:
+        new_meta_data['download_url'] = f"https://civitai.com/models/{model_id}"
 
-def migrate_legacy_metadata():
-    if not os.path.exists(LEGACY_METADATA_FILE):
-        return
+    lora_meta.update(new_meta_data)
+    if persist and new_meta_data:
+        await run_in_gallery_executor(save_lora_metadata, lora_name, new_meta_data, merge=True)
+    
+    new_local_url, new_preview_type = await run_in_gallery_executor(get_lora_preview_asset_info, lora_name)
     
+    return {
+        "status": "ok", 
+        "metadata": { 
+            "preview_url": new_local_url, 
+            "preview_type": new_preview_type, 
+            **new_meta_data 
+        }
+    }, 200
+
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/sync_civitai")
+async def sync_civitai_metadata(request):
     try:
-        legacy_data = load_json_file(LEGACY_METADATA_FILE)
+        data = await request.json()
+        lora_name = data.get("lora_name")
+
+        if not lora_name:
+            return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
+
+        payload, status = await sync_lora_with_civitai(
+            lora_name,
+            sync_image=data.get("sync_image", True),
+            sync_trigger=data.get("sync_trigger", True),
+            sync_url=data.get("sync_url", True),
+            refresh=data.get("refresh", False))
+        return web.json_response(payload, status=status)
+
     except Exception as e:
-        print(f"❌ Error loading legacy metadata: {e}")
-        return
+        import traceback
+        print(f"Error in sync_civitai_metadata: {traceback.format_exc()}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
 
-    migrated_count = 0
-    
-    key_map = {
+class CivitaiSyncJob:
+    """Server-side bulk Civitai sync over a fixed list of LoRAs.
+
+    Workers share the pooled ClientSession and are bounded by SYNC_JOB_CONCURRENCY. Progress is pushed over
+    the PromptServer websocket and the per-LoRA results are persisted, so an interrupted job resumes
+    with the LoRAs it had not finished.
+    """
+
+    def __init__(self, lora_names, options, state_file, results=None, job_id=None):
+        self.id = job_id or f"{int(time.time() * 1000):x}"
+        self.lora_names = list(lora_names)
+        self.options = options
+        self.results = dict(results or {})
+        self.state_file = state_file
+        self.status = "pending"
+        self.error = None
+        self.current = set()
+        self._task = None
+        self._last_saved = 0.0
+        self._last_reported = 0.0
+
+    @classmethod
+    def load(cls, state_file):
+        data = load_json_file(state_file, {})
+        if not data.get("lora_names"):
+            return None
+        job = cls(data["lora_names"], data.get("options", {}), state_file, data.get("results"), data.get("id"))
+        # A job persisted as running was cut short by a server restart.
+        job.status = "interrupted" if data.get("status") == "running" else data.get("status", "interrupted")
+        return job
+
+    @property
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    def summary(self):
+        succeeded = sum(1 for result in self.results.values() if result == "ok")
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": len(self.lora_names),
+            "done": len(self.results),
+            "succeeded": succeeded,
+            "failed": len(self.results) - succeeded,
+            "current": sorted(self.current),
+            "error": self.error,
+        }
+
+    async def _save_state(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_saved < SYNC_JOB_SAVE_INTERVAL:
+            return
+        self._last_saved = now
+        await run_in_gallery_executor(save_json_file, {
+            "id": self.id,
+            "status": self.status,
+            "options": self.options,
+            "lora_names": list(self.lora_names),
+            "results": dict(self.results),
+        }, self.state_file)
+
+    def _report(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_reported < 0.5:
+            return
+        self._last_reported = now
+        server.PromptServer.instance.send_sync("lora_gallery.sync_job", self.summary())
+
+    async def _sync_one(self, lora_name):
+        for attempt in range(SYNC_JOB_MAX_RETRIES + 1):
+            payload, status = await sync_lora_with_civitai(lora_name, persist=True, **self.options)
+            if status != 429 or attempt == SYNC_JOB_MAX_RETRIES:
+                break
+            # Civitai is throttling us; back off before retrying the same LoRA.
+            await asyncio.sleep(2 ** attempt)
+        if status == 200:
+            return "ok"
+        return payload.get("message", f"HTTP {status}")
+
+    async def _worker(self, queue):
+        while True:
+            try:
+                lora_name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            self.current.add(lora_name)
+            try:
+                self.results[lora_name] = await self._sync_one(lora_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Local Lora Gallery: Sync job failed for {lora_name}: {e}")
+                self.results[lora_name] = str(e)
+            finally:
+                self.current.discard(lora_name)
+            await self._save_state()
+            self._report()
+
+    async def run(self):
+        queue = asyncio.Queue()
+        for lora_name in self.lora_names:
+            if lora_name not in self.results:
+                queue.put_nowait(lora_name)
+
+        self.status = "running"
+        await self._save_state(force=True)
+        self._report(force=True)
+        try:
+            workers = [asyncio.create_task(self._worker(queue))
+                       for _ in range(max(1, min(SYNC_JOB_CONCURRENCY, queue.qsize())))]
+            await asyncio.gather(*workers)
+            self.status = "completed"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+        except Exception as e:
+            print(f"Local Lora Gallery: Sync job {self.id} failed: {e}")
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.current.clear()
+            await self._save_state(force=True)
+            self._report(force=True)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def cancel(self):
+        if self.is_running:
+            self._task.cancel()
+
+class LegacyMetadataMigration:
+    """Moves the entries of the old single-file lora_gallery_metadata.json into per-LoRA sidecars.
+
+    Runs off the server loop: LoRA paths come from the catalog in one pass, sidecars are merged on
+    a small thread pool, and the LoRAs already handled are checkpointed to state_file so an
+    interrupted migration resumes where it stopped. Keys a sidecar already has are never
+    overwritten. A dry run reports what would change without writing anything.
+    """
+
+    KEY_MAP = {
         "trigger_words": "activation text",
         "preferred_weight": "preferred weight",
         "negative_prompt": "negative text",
         "sd_version": "sd version"
     }
 
-    for lora_name, old_meta in legacy_data.items():
-        lora_full_path = folder_paths.get_full_path("loras", lora_name)
-        
-        if not lora_full_path or not os.path.exists(lora_full_path):
-            continue
-            
-        base_name, _ = os.path.splitext(lora_full_path)
-        json_path = base_name + ".json"
-        
-        current_sidecar_data = {}
-        if os.path.exists(json_path):
-            current_sidecar_data = load_json_file(json_path)
-        
-        data_to_save = current_sidecar_data.copy()
-        is_modified = False
+    def __init__(self, legacy_file, state_file, workers=MIGRATION_WORKERS):
+        self.legacy_file = legacy_file
+        self.state_file = state_file
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._running = False
+        self.status = "idle"
+        self.total = 0
+        self.done = 0
+        self.updated = 0
+        self.missing = 0
+        self.errors = {}
+        self._last_reported = 0.0
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def summary(self):
+        return {
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "updated": self.updated,
+            "missing": self.missing,
+            "errors": dict(self.errors),
+            "legacy_file_present": os.path.exists(self.legacy_file),
+        }
+
+    def _report(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_reported < 0.5:
+            return
+        self._last_reported = now
+        server.PromptServer.instance.send_sync("lora_gallery.legacy_migration", self.summary())
 
+    @classmethod
+    def _changes(cls, old_meta, current):
+        """The sidecar keys a legacy entry would add, renamed to the current key names."""
+        changes = {}
         for old_key, val in old_meta.items():
-            new_key = key_map.get(old_key, old_key)
-            
-            if new_key not in current_sidecar_data:
-                if val is not None and val != "":
-                    if new_key == "tags" and not isinstance(val, list):
-                        continue
-                    
-                    data_to_save[new_key] = val
-                    is_modified = True
-        
-        if is_modified:
-            save_json_file(data_to_save, json_path)
-            migrated_count += 1
+            new_key = cls.KEY_MAP.get(old_key, old_key)
+            if new_key in current or val is None or val == "":
+                continue
+            if new_key == "tags" and not isinstance(val, list):
+                continue
+            changes[new_key] = val
+        return changes
+
+    def _migrate_one(self, json_path, old_meta, dry_run):
+        with sidecar_lock(json_path):
+            current = lora_metadata_cache.load_path(json_path)
+            changes = self._changes(old_meta, current)
+            if changes and not dry_run:
+                current.update(changes)
+                if not save_json_file(current, json_path):
+                    raise OSError(f"Could not write {json_path}")
+                lora_metadata_cache.store(json_path, current)
+        return changes, current
+
+    def _checkpoint(self, legacy_mtime, done_names, catalog_updates):
+        if catalog_updates:
+            lora_catalog.update_metadata_many(catalog_updates)
+            catalog_updates.clear()
+        save_json_file({"legacy_mtime": legacy_mtime, "done": sorted(done_names)}, self.state_file)
+
+    def run(self, dry_run=False):
+        """Migrates (or with dry_run, reports) the legacy file in the calling thread and returns the result."""
+        with self._lock:
+            if self._running:
+                return self.summary()
+            self._running = True
+        try:
+            return self._run(dry_run)
+        except Exception as e:
+            print(f"Local Lora Gallery: Legacy metadata migration failed: {e}")
+            if dry_run:
+                raise
+            self.status = "failed"
+            self.errors = {"*": str(e)}
+            return self.summary()
+        finally:
+            self._running = False
+            if not dry_run:
+                self._report(force=True)
+
+    def _run(self, dry_run):
+        legacy_mtime = _get_mtime(self.legacy_file)
+        if legacy_mtime is None:
+            self.status = "idle"
+            return {"dry_run": True, "total": 0, "would_update": {}, "unchanged": 0, "missing": []} if dry_run else self.summary()
+
+        legacy_data = load_json_file(self.legacy_file, {})
+        if not isinstance(legacy_data, dict):
+            legacy_data = {}
+        plan, missing = {}, []
+        for lora_name, old_meta in legacy_data.items():
+            entry = lora_catalog.get(lora_name)
+            if entry and isinstance(old_meta, dict):
+                plan[lora_name] = (entry["json_path"], old_meta)
+            else:
+                missing.append(lora_name)
+
+        done_names = set()
+        errors = {}
+        if not dry_run:
+            state = load_json_file(self.state_file, {})
+            # A checkpoint only applies to the legacy file it was taken for.
+            if isinstance(state, dict) and state.get("legacy_mtime") == legacy_mtime:
+                done_names = set(state.get("done", [])) & plan.keys()
+            self.status = "running"
+            self.total, self.done, self.updated, self.missing = len(plan), len(done_names), 0, len(missing)
+            self.errors = errors
+            self._report(force=True)
+
+        would_update = {}
+        catalog_updates = {}
+        last_checkpoint = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lora_gallery_migrate") as pool:
+            futures = {pool.submit(self._migrate_one, json_path, old_meta, dry_run): lora_name
+                       for lora_name, (json_path, old_meta) in plan.items() if lora_name not in done_names}
+            for future in as_completed(futures):
+                lora_name = futures[future]
+                try:
+                    changes, meta = future.result()
+                except Exception as e:
+                    # Left out of the checkpoint, so a later run retries it.
+                    print(f"Local Lora Gallery: Could not migrate metadata for {lora_name}: {e}")
+                    errors[lora_name] = str(e)
+                    continue
+                if dry_run:
+                    if changes:
+                        would_update[lora_name] = sorted(changes)
+                    continue
+                done_names.add(lora_name)
+                self.done += 1
+                if changes:
+                    self.updated += 1
+                    catalog_updates[lora_name] = meta
+                if time.monotonic() - last_checkpoint >= MIGRATION_CHECKPOINT_INTERVAL:
+                    self._checkpoint(legacy_mtime, done_names, catalog_updates)
+                    last_checkpoint = time.monotonic()
+                    self._report()
+
+        if dry_run:
+            return {
+                "dry_run": True,
+                "total": len(plan),
+                "would_update": would_update,
+                "unchanged": len(plan) - len(would_update) - len(errors),
+                "missing": sorted(missing),
+                "errors": errors,
+            }
 
-    try:
-        backup_path = LEGACY_METADATA_FILE + ".migrated"
-        os.rename(LEGACY_METADATA_FILE, backup_path)
-    except Exception as e:
-        print(f"⚠️ Migration finished but failed to rename legacy file: {e}")
+        self._checkpoint(legacy_mtime, done_names, catalog_updates)
+        if errors:
+            self.status = "incomplete"
+            return self.summary()
 
-load_ui_state = lambda: load_json_file(UI_STATE_FILE)
-save_ui_state = lambda data: save_json_file(data, UI_STATE_FILE)
-load_presets = lambda: load_json_file(PRESETS_FILE)
-save_presets = lambda data: save_json_file(data, PRESETS_FILE)
+        try:
+            os.rename(self.legacy_file, self.legacy_file + ".migrated")
+            os.remove(self.state_file)
+        except OSError as e:
+            print(f"⚠️ Migration finished but failed to rename legacy file: {e}")
+        self.status = "completed"
+        print(f"Local Lora Gallery: Migrated legacy metadata for {self.updated} of {self.total} LoRAs.")
+        return self.summary()
 
-def get_lora_preview_asset_info(lora_name):
-    """Finds a preview asset (image or video) for a given LoRA and returns its info."""
-    lora_path = folder_paths.get_full_path("loras", lora_name)
-    if lora_path is None:
-        return None, "none"
-    base_name, _ = os.path.splitext(lora_path)
-
-    for ext in IMAGE_EXTENSIONS + VIDEO_EXTENSIONS:
-        preview_path = base_name + ext
-        if os.path.exists(preview_path):
-            preview_filename = os.path.basename(preview_path)
-            encoded_lora_name = urllib.parse.quote_plus(lora_name)
-            encoded_filename = urllib.parse.quote_plus(preview_filename)
-            url = f"/LocalLoraGalleryRemix/preview?filename={encoded_filename}&lora_name={encoded_lora_name}"
-            
-            preview_type = "none"
-            if ext.lower() in VIDEO_EXTENSIONS:
-                preview_type = "video"
-            elif ext.lower() in IMAGE_EXTENSIONS:
-                preview_type = "image"
-            
-            return url, preview_type
+legacy_migration = LegacyMetadataMigration(LEGACY_METADATA_FILE, MIGRATION_STATE_FILE)
 
-    return None, "none"
+def migrate_legacy_metadata(dry_run=False):
+    """Runs the legacy metadata migration (blocking) and returns its summary or dry-run report."""
+    return legacy_migration.run(dry_run)
 
-@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/sync_civitai")
-async def sync_civitai_metadata(request):
-    try:
-        data = await request.json()
-        lora_name = data.get("lora_name")
+def _migrate_legacy_metadata_in_background():
+    if os.path.exists(LEGACY_METADATA_FILE):
+        migrate_legacy_metadata()
 
-        do_sync_image = data.get("sync_image", True)
-        do_sync_trigger = data.get("sync_trigger", True) 
-        do_sync_url = data.get("sync_url", True)  
+async def start_legacy_migration(app):
+    # Not awaited: sidecars are written while the server is already serving.
+    asyncio.get_running_loop().run_in_executor(gallery_executor, _migrate_legacy_metadata_in_background)
 
-        if not lora_name:
-            return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
+try:
+    server.PromptServer.instance.app.on_startup.append(start_legacy_migration)
+except Exception as e:
+    print(f"INFO: Local Lora Gallery - Could not schedule the legacy metadata migration: {e}")
 
-        lora_full_path = folder_paths.get_full_path("loras", lora_name)
-        if not lora_full_path:
-            return web.json_response({"status": "error", "message": "LoRA file not found"}, status=404)
+@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/legacy_migration")
+async def get_legacy_migration_status(request):
+    return web.json_response(legacy_migration.summary())
 
-        lora_meta = load_lora_metadata(lora_name)
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/legacy_migration")
+async def start_legacy_migration_endpoint(request):
+    try:
+        data = await request.json() if request.can_read_body else {}
+        if legacy_migration.is_running:
+            return web.json_response({"status": "error", "message": "The migration is already running",
+                                      "migration": legacy_migration.summary()}, status=409)
+        if data.get("dry_run"):
+            return web.json_response(await run_in_gallery_executor(migrate_legacy_metadata, True))
+        if not os.path.exists(LEGACY_METADATA_FILE):
+            return web.json_response({"status": "error", "message": "No legacy metadata file to migrate"}, status=404)
+        asyncio.get_running_loop().run_in_executor(gallery_executor, migrate_legacy_metadata)
+        return web.json_response({"status": "ok", "migration": legacy_migration.summary()})
+    except Exception as e:
+        print(f"Local Lora Gallery: Could not start the legacy metadata migration: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
 
-        model_hash = lora_meta.get('hash')
-        if not model_hash:
-            print(f"Local Lora Gallery: Calculating hash for {lora_name}...")
-            model_hash = calculate_sha256(lora_full_path)
-            if model_hash:
-                lora_meta['hash'] = model_hash
-                save_lora_metadata(lora_name, {'hash': model_hash}, merge=True)
-            else:
-                 return web.json_response({"status": "error", "message": "Failed to calculate hash"}, status=500)
+current_sync_job = None
 
-        civitai_version_url = f"https://civitai.com/api/v1/model-versions/by-hash/{model_hash}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(civitai_version_url) as response:
-                if response.status != 200:
-                    return web.json_response({"status": "error", "message": f"Civitai API returned {response.status}. Model not found."}, status=response.status)
-                
-                civitai_version_data = await response.json()
-                model_id = civitai_version_data.get('modelId')
+_sync_job_load_lock = threading.Lock()
 
-            if do_sync_image:
-                images = civitai_version_data.get('images', [])
-                if images:
-                    preview_media = next((img for img in images if img.get('type') == 'image'), images[0])
-                    preview_url = preview_media.get('url')
-                    is_video = preview_media.get('type') == 'video'
+def _get_sync_job():
+    """The current job, loaded from SYNC_JOB_STATE_FILE on first use (blocking; call through the executor)."""
+    global current_sync_job
+    with _sync_job_load_lock:
+        if current_sync_job is None:
+            current_sync_job = CivitaiSyncJob.load(SYNC_JOB_STATE_FILE)
+        return current_sync_job
 
-                    try:
-                        if is_video:
-                            if '/original=true/' in preview_url:
-                                temp_url = preview_url.replace('/original=true/', '/transcode=true,width=450,optimized=true/')
-                                final_url = os.path.splitext(temp_url)[0] + '.webm'
-                            else:
-                                url_obj = urlparse(preview_url)
-                                path_parts = url_obj.path.split('/')
-                                filename = path_parts.pop()
-                                filename_base = os.path.splitext(filename)[0]
-                                new_path = f"{'/'.join(path_parts)}/transcode=true,width=450,optimized=true/{filename_base}.webm"
-                                final_url = url_obj._replace(path=new_path).geturl()
-                            file_ext = '.webm'
-                        else:
-                            if '/original=true/' in preview_url:
-                               final_url = preview_url.replace('/original=true/', '/width=450/')
-                            else:
-                                final_url = preview_url.replace('/width=\d+/', '/width=450/') if '/width=' in preview_url else preview_url.replace(urlparse(preview_url).path, f"/width=450{urlparse(preview_url).path}")
-
-                            path = urlparse(final_url).path
-                            file_ext = os.path.splitext(path)[1]
-                            if not file_ext or file_ext.lower() not in IMAGE_EXTENSIONS:
-                                file_ext = '.jpg'
-                    except Exception as e:
-                        final_url = preview_url
-                        file_ext = '.jpg' if not is_video else '.mp4'
-
-                    lora_dir = os.path.dirname(lora_full_path)
-                    lora_basename = os.path.splitext(os.path.basename(lora_full_path))[0]
-                    save_path = os.path.join(lora_dir, lora_basename + file_ext)
-
-                    async with session.get(final_url) as download_response:
-                        if download_response.status == 200:
-                            with open(save_path, 'wb') as f:
-                                while True:
-                                    chunk = await download_response.content.read(8192)
-                                    if not chunk: break
-                                    f.write(chunk)
-
-            new_meta_data = {}
-            
-            if do_sync_trigger:
-                trained_words = civitai_version_data.get('trainedWords', [])
-                if trained_words:
-                    new_meta_data['activation text'] = ", ".join(trained_words)
-            
-            if do_sync_url and model_id:
-                new_meta_data['download_url'] = f"https://civitai.com/models/{model_id}"
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/sync_job/start")
+async def start_sync_job(request):
+    global current_sync_job
+    try:
+        data = await request.json()
+        job = await run_in_gallery_executor(_get_sync_job)
+        if job and job.is_running:
+            return web.json_response({"status": "error", "message": "A sync job is already running", "job": job.summary()}, status=409)
 
-            lora_meta.update(new_meta_data)
-            
-            new_local_url, new_preview_type = get_lora_preview_asset_info(lora_name)
-            
-            return web.json_response({
-                "status": "ok", 
-                "metadata": { 
-                    "preview_url": new_local_url, 
-                    "preview_type": new_preview_type, 
-                    **new_meta_data 
-                }
-            })
+        if data.get("resume"):
+            if not job or job.status == "completed":
+                return web.json_response({"status": "error", "message": "No unfinished sync job to resume"}, status=404)
+        else:
+            lora_names = data.get("lora_names")
+            if not lora_names:
+                entries = await run_in_gallery_executor(filter_catalog_entries, **parse_filter_params(data))
+                if data.get("skip_synced", False):
+                    entries = [entry for entry in entries if not entry["meta"].get("download_url")]
+                lora_names = sorted((entry["name"] for entry in entries), key=lambda x: x.lower())
+            if not lora_names:
+                return web.json_response({"status": "error", "message": "No LoRAs match the selection"}, status=400)
+
+            options = {
+                "sync_image": bool(data.get("sync_image", True)),
+                "sync_trigger": bool(data.get("sync_trigger", True)),
+                "sync_url": bool(data.get("sync_url", True)),
+                "refresh": bool(data.get("refresh", False)),
+            }
+            job = CivitaiSyncJob(lora_names, options, SYNC_JOB_STATE_FILE)
 
+        current_sync_job = job
+        job.start()
+        return web.json_response({"status": "ok", "job": job.summary()})
     except Exception as e:
-        import traceback
-        print(f"Error in sync_civitai_metadata: {traceback.format_exc()}")
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 
+@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/sync_job/status")
+async def get_sync_job_status(request):
+    job = await run_in_gallery_executor(_get_sync_job)
+    return web.json_response({"status": "ok", "job": job.summary() if job else None})
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/sync_job/cancel")
+async def cancel_sync_job(request):
+    job = await run_in_gallery_executor(_get_sync_job)
+    if not job or not job.is_running:
+        return web.json_response({"status": "error", "message": "No sync job is running"}, status=404)
+    job.cancel()
+    return web.json_response({"status": "ok", "job": job.summary()})
+
+def remove_image_previews(lora_dir, lora_basename):
+    """Deletes the image previews next to a LoRA and returns the removed filenames."""
+    removed_previews = []
+    for preview_filename in preview_dir_cache.list_previews(lora_dir, lora_basename):
+        if os.path.splitext(preview_filename)[1].lower() not in IMAGE_EXTENSIONS:
+            continue
+        preview_path = os.path.join(lora_dir, preview_filename)
+        try:
+            os.remove(preview_path)
+            removed_previews.append(preview_filename)
+        except Exception as e:
+            print(f"Failed to remove preview {preview_path}: {e}")
+    return removed_previews
+
+def write_preview_png(source_path, target_path):
+    try:
+        from PIL import Image, ImageOps
+
+        img = Image.open(source_path)
+        img = ImageOps.exif_transpose(img)
+        img.save(target_path, "PNG")
+    except Exception as e:
+        print(f"Error processing image with PIL: {e}, trying copy...")
+        shutil.copy2(source_path, target_path)
+
 @server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/save_preview")
 async def save_preview(request):
     try:
@@ -323,21 +2526,15 @@ async def save_preview(request):
         if not lora_name:
             return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
 
-        lora_full_path = folder_paths.get_full_path("loras", lora_name)
+        lora_full_path = await run_in_gallery_executor(folder_paths.get_full_path, "loras", lora_name)
         if not lora_full_path:
             return web.json_response({"status": "error", "message": "LoRA file not found"}, status=404)
 
         lora_dir = os.path.dirname(lora_full_path)
         lora_basename = os.path.splitext(os.path.basename(lora_full_path))[0]
         
-        extensions_to_check = ['.png', '.jpg', '.jpeg', '.webp', '.gif']
-        for ext in extensions_to_check:
-            old_preview = os.path.join(lora_dir, lora_basename + ext)
-            if os.path.exists(old_preview):
-                try:
-                    os.remove(old_preview)
-                except Exception as e:
-                    print(f"Failed to remove old preview {old_preview}: {e}")
+        removed_previews = await run_in_gallery_executor(remove_image_previews, lora_dir, lora_basename)
+        await run_in_gallery_executor(preview_dir_cache.record, lora_dir, lora_basename, removed=removed_previews)
         
         target_path = os.path.join(lora_dir, lora_basename + ".png")
         
@@ -349,21 +2546,17 @@ async def save_preview(request):
                 
             source_path = os.path.join(base_dir, subfolder, filename)
 
-            if source_path and os.path.exists(source_path):
-                try:
-                    img = Image.open(source_path)
-                    from PIL import ImageOps
-                    img = ImageOps.exif_transpose(img) 
-                    img.save(target_path, "PNG")
-                except Exception as e:
-                    print(f"Error processing image with PIL: {e}, trying copy...")
-                    shutil.copy2(source_path, target_path)
+            if source_path and await run_in_gallery_executor(os.path.exists, source_path):
+                await run_in_gallery_executor(write_preview_png, source_path, target_path)
+                await run_in_gallery_executor(preview_dir_cache.record, lora_dir, lora_basename,
+                                              added=[os.path.basename(target_path)])
             else:
                  return web.json_response({"status": "error", "message": f"Source image not found: {source_path}"}, status=404)
         else:
              return web.json_response({"status": "error", "message": "No filename provided"}, status=400)
 
-        new_local_url, new_preview_type = get_lora_preview_asset_info(lora_name)
+        await run_in_gallery_executor(lora_catalog.refresh_preview, lora_name)
+        new_local_url, new_preview_type = await run_in_gallery_executor(get_lora_preview_asset_info, lora_name)
         
         return web.json_response({
             "status": "ok", 
@@ -385,26 +2578,18 @@ async def delete_preview(request):
         if not lora_name:
             return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
 
-        lora_full_path = folder_paths.get_full_path("loras", lora_name)
+        lora_full_path = await run_in_gallery_executor(folder_paths.get_full_path, "loras", lora_name)
         if not lora_full_path:
             return web.json_response({"status": "error", "message": "LoRA file not found"}, status=404)
 
         lora_dir = os.path.dirname(lora_full_path)
         lora_basename = os.path.splitext(os.path.basename(lora_full_path))[0]
         
-        extensions_to_check = ['.png', '.jpg', '.jpeg', '.webp', '.gif']
-        deleted_count = 0
-        
-        for ext in extensions_to_check:
-            preview_path = os.path.join(lora_dir, lora_basename + ext)
-            if os.path.exists(preview_path):
-                try:
-                    os.remove(preview_path)
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"Failed to remove preview {preview_path}: {e}")
+        removed_previews = await run_in_gallery_executor(remove_image_previews, lora_dir, lora_basename)
+        deleted_count = len(removed_previews)
 
-        new_local_url, new_preview_type = get_lora_preview_asset_info(lora_name)
+        await run_in_gallery_executor(record_preview_change, lora_name, lora_dir, lora_basename, removed=removed_previews)
+        new_local_url, new_preview_type = await run_in_gallery_executor(get_lora_preview_asset_info, lora_name)
         
         return web.json_response({
             "status": "ok", 
@@ -420,7 +2605,7 @@ async def delete_preview(request):
 
 @server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/get_presets")
 async def get_presets(request):
-    presets = load_presets()
+    presets = await run_in_gallery_executor(presets_store.snapshot)
     return web.json_response(presets)
 
 @server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/save_preset")
@@ -432,9 +2617,8 @@ async def save_preset(request):
         if not preset_name or not preset_data:
             return web.json_response({"status": "error", "message": "Missing preset name or data"}, status=400)
         
-        presets = load_presets()
-        presets[preset_name] = preset_data
-        save_presets(presets)
+        await run_in_gallery_executor(presets_store.set, preset_name, preset_data)
+        presets = await run_in_gallery_executor(presets_store.snapshot)
         return web.json_response({"status": "ok", "presets": presets})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
@@ -447,126 +2631,420 @@ async def delete_preset(request):
         if not preset_name:
             return web.json_response({"status": "error", "message": "Missing preset name"}, status=400)
         
-        presets = load_presets()
-        if preset_name in presets:
-            del presets[preset_name]
-            save_presets(presets)
+        await run_in_gallery_executor(presets_store.delete, preset_name)
+        presets = await run_in_gallery_executor(presets_store.snapshot)
         return web.json_response({"status": "ok", "presets": presets})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 
-@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/get_loras")
-async def get_loras_endpoint(request):
-    try:
-        filter_tags_str = request.query.get('filter_tag', '').strip().lower()
-        filter_tags = [tag.strip() for tag in filter_tags_str.split(',') if tag.strip()]
-        filter_mode = request.query.get('mode', 'OR').upper()
-        filter_folder = request.query.get('folder', '').strip()
-        name_filter = request.query.get('name_filter', '').strip().lower()
-        selected_loras = request.query.getall('selected_loras', [])
-        
-        page = int(request.query.get('page', 1))
-        per_page = int(request.query.get('per_page', 50))
-
-        lora_files = folder_paths.get_filename_list("loras")
-        lora_roots = folder_paths.get_folder_paths("loras")
-        #metadata = load_metadata()
-        all_folders = set()
-
-        filtered_loras = []
-        for lora in lora_files:
-            lora_full_path = folder_paths.get_full_path("loras", lora)
-            if not lora_full_path: continue
-
-            this_lora_root = None
-            for root in lora_roots:
-                if os.path.normpath(lora_full_path).startswith(os.path.normpath(root)):
-                    this_lora_root = root
-                    break
-            
-            if not this_lora_root:
-                print(f"Local Lora Gallery: Could not find a root folder for {lora_full_path}. Skipping.")
-                continue
-
-            relative_path = os.path.relpath(os.path.dirname(lora_full_path), this_lora_root)
-            folder = "." if relative_path == "." else relative_path
-            all_folders.add(folder)
+def parse_filter_params(params):
+    """Reads the gallery's filter_tag/mode/folder/name_filter parameters from a query or JSON body."""
+    filter_tags_str = str(params.get('filter_tag', '')).strip().lower()
+    return {
+        "filter_tags": [tag.strip() for tag in filter_tags_str.split(',') if tag.strip()],
+        "filter_mode": str(params.get('mode', 'OR')).upper(),
+        "filter_folder": str(params.get('folder', '')).strip(),
+        "name_filter": str(params.get('name_filter', '')).strip().lower(),
+        "base_model": str(params.get('base_model', '')).strip().lower(),
+    }
 
-            if name_filter and name_filter not in lora.lower():
-                continue
+def catalog_entry_matcher(filter_tags=(), filter_mode="OR", filter_folder="", name_filter="", base_model=""):
+    """Returns a predicate for the gallery's tag, folder, search and training base model filters."""
+    tagged_loras = lora_catalog.names_with_tags(filter_tags, filter_mode) if filter_tags else None
+    search_hits = lora_catalog.search(name_filter) if name_filter else None
+
+    def matches(entry):
+        if search_hits is not None and entry["name"] not in search_hits:
+            return False
+
+        if filter_folder and filter_folder != entry["folder"]:
+            return False
+
+        if tagged_loras is not None and entry["name"] not in tagged_loras:
+            return False
+
+        if base_model and base_model not in training_info_cache.get_summary(entry["path"])["base_model"].lower():
+            return False
+
+        return True
+    return matches
+
+def filter_catalog_entries(**filters):
+    """Returns the catalog entries matching the gallery's tag, folder, name and training base model filters."""
+    matches = catalog_entry_matcher(**filters)
+    return [entry for entry in lora_catalog.entries() if matches(entry)]
+
+def lora_card_info(entry):
+    """The per-LoRA card data the gallery renders, as returned by get_loras."""
+    lora_meta = entry["meta"]
+    return {
+        "name": entry["name"],
+        "preview_url": entry["preview_url"] or "",
+        "preview_type": entry["preview_type"],
+        "tags": lora_meta.get('tags', []),
+        "download_url": lora_meta.get('download_url', ''),
+        "activation text": lora_meta.get('activation text', ''),
+        "preferred weight": lora_meta.get('preferred weight', 1.0),
+        "negative text": lora_meta.get('negative text', ''),
+        "sd version": lora_meta.get('sd version', 'Unknown'),
+        "notes": lora_meta.get('notes', ''),
+    }
 
-            if filter_folder and filter_folder != folder:
-                continue
+LORA_CARD_FIELDS = ("name", "preview_url", "preview_type", "tags", "download_url", "activation text",
+                    "preferred weight", "negative text", "sd version", "notes")
 
-            #lora_meta = metadata.get(lora, {})
-            lora_meta = load_lora_metadata(lora)
-            tags = [t.lower() for t in lora_meta.get('tags', [])]
+def parse_card_fields(value):
+    """Parses a fields= projection into a tuple of card keys; the name is always included."""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in LORA_CARD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(["name"] + [field for field in fields if field != "name"])
 
-            if filter_tags:
-                if filter_mode == 'AND':
-                    if not all(ft in tags for ft in filter_tags):
-                        continue
-                else:
-                    if not any(ft in tags for ft in filter_tags):
-                        continue
-            
-            filtered_loras.append(lora)
+def project_card(info, fields):
+    return info if fields is None else {field: info[field] for field in fields}
 
-        pinned_items_dict = {name: None for name in selected_loras}
-        remaining_items = []
-        for lora in filtered_loras:
-            if lora in pinned_items_dict:
-                pinned_items_dict[lora] = lora
-            else:
-                remaining_items.append(lora)
+def encode_listing_cursor(snapshot_id, offset):
+    return base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode("utf-8")).decode("ascii").rstrip("=")
 
-        pinned_items = [lora for lora in selected_loras if pinned_items_dict.get(lora)]
+def decode_listing_cursor(cursor):
+    try:
+        snapshot_id, offset = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8").split(":")
+        return snapshot_id, max(0, int(offset))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+class ListingSnapshots:
+    """Recently built, fully ordered listings keyed by catalog generation and query.
+
+    Infinite scroll and cursors slice a stored snapshot instead of filtering and sorting
+    the whole catalog again for every page.
+    """
+
+    def __init__(self, max_snapshots=LISTING_SNAPSHOT_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+
+    @staticmethod
+    def snapshot_id(key):
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+
+    def get(self, snapshot_id):
+        with self._lock:
+            names = self._snapshots.get(snapshot_id)
+            if names is not None:
+                self._snapshots.move_to_end(snapshot_id)
+            return names
+
+    def get_or_build(self, key, build):
+        """Returns (snapshot_id, names) for the query key, building the ordered names on a miss."""
+        snapshot_id = self.snapshot_id(key)
+        names = self.get(snapshot_id)
+        if names is None:
+            names = build()
+            with self._lock:
+                self._snapshots[snapshot_id] = names
+                while len(self._snapshots) > self._max_snapshots:
+                    self._snapshots.popitem(last=False)
+        return snapshot_id, names
+
+listing_snapshots = ListingSnapshots()
+
+def order_lora_names(filters, selected_loras, sort_field="name", descending=False):
+    """The full gallery order for a query: the selected LoRAs pinned first, then the rest sorted."""
+    filtered_loras = [entry["name"] for entry in filter_catalog_entries(**filters)]
+
+    pinned_items_dict = {name: None for name in selected_loras}
+    remaining_items = []
+    for lora in filtered_loras:
+        if lora in pinned_items_dict:
+            pinned_items_dict[lora] = lora
+        else:
+            remaining_items.append(lora)
+
+    pinned_items = [lora for lora in selected_loras if pinned_items_dict.get(lora)]
+
+    remaining_items.sort(key=lambda x: x.lower(), reverse=descending and sort_field not in TRAINING_INFO_SORT_FIELDS + ["relevance"])
+    if sort_field == "relevance" and filters.get("name_filter"):
+        # Best match first regardless of order; ties keep the name order.
+        search_hits = lora_catalog.search(filters["name_filter"])
+        remaining_items.sort(key=lambda name: search_hits.get(name, 0.0), reverse=True)
+    if sort_field in TRAINING_INFO_SORT_FIELDS:
+        # Stable sort on top of the name order; LoRAs without the field always go last.
+        keyed = [(training_sort_key(sort_field, training_info_cache.get_summary(lora_catalog.get(name)["path"])), name)
+                 for name in remaining_items]
+        present = [item for item in keyed if item[0] is not None]
+        present.sort(key=lambda item: item[0], reverse=descending)
+        remaining_items = [name for _, name in present] + [name for key, name in keyed if key is None]
+    return pinned_items + remaining_items
+
+def build_lora_listing(filters, selected_loras, page, per_page, sort_field="name", descending=False,
+                       cursor=None, fields=None):
+    """Builds one page of the gallery listing from a catalog snapshot, pinning the selected LoRAs first.
+
+    A cursor continues the snapshot it was issued for, even if the catalog changed since; once that
+    snapshot has been evicted the listing is rebuilt and continues at the same offset.
+    """
+    lora_catalog.ensure_fresh()
+    names = None
+    if cursor:
+        snapshot_id, start_index = decode_listing_cursor(cursor)
+        names = listing_snapshots.get(snapshot_id)
+    else:
+        start_index = (page - 1) * per_page
+    if names is None:
+        key = (lora_catalog.epoch, lora_catalog.generation, sorted(filters.items()), tuple(selected_loras),
+               sort_field, descending)
+        snapshot_id, names = listing_snapshots.get_or_build(
+            key, lambda: order_lora_names(filters, selected_loras, sort_field, descending))
+
+    end_index = start_index + per_page
+    lora_info_list = []
+    for lora in names[start_index:end_index]:
+        entry = lora_catalog.get(lora)
+        # Entries removed after the snapshot was taken are skipped; the since= delta reports them.
+        if entry:
+            lora_info_list.append(project_card(lora_card_info(entry), fields))
+
+    return {
+        "loras": lora_info_list,
+        "folders": lora_catalog.folders(),
+        "total_pages": (len(names) + per_page - 1) // per_page,
+        "current_page": start_index // per_page + 1,
+        "total": len(names),
+        "snapshot": snapshot_id,
+        "generation": lora_catalog.generation,
+        "epoch": lora_catalog.epoch,
+        "next_cursor": encode_listing_cursor(snapshot_id, end_index) if end_index < len(names) else None,
+    }
 
-        remaining_items.sort(key=lambda x: x.lower())
-        final_lora_list = pinned_items + remaining_items
+def build_lora_delta(filters, since, epoch=None, fields=None):
+    """Lists what changed for a filtered listing since a generation: added/updated cards and removed names.
+
+    Updated LoRAs that no longer match the filters are reported as removed. reset is set when the
+    changelog cannot answer (another server run, or the generation is too old) and the client must reload.
+    """
+    changes = None if epoch and epoch != lora_catalog.epoch else lora_catalog.changes_since(since)
+    response = {"generation": lora_catalog.generation, "epoch": lora_catalog.epoch, "reset": changes is None,
+                "added": [], "updated": [], "removed": []}
+    if changes is None:
+        return response
+
+    added, removed, updated = changes
+    matches = catalog_entry_matcher(**filters)
+    response["removed"] = sorted(removed)
+    for key, names in (("added", added), ("updated", updated)):
+        for name in sorted(names, key=str.lower):
+            entry = lora_catalog.get(name)
+            if entry and matches(entry):
+                response[key].append(project_card(lora_card_info(entry), fields))
+            elif key == "updated" or entry is None:
+                response["removed"].append(name)
+    return response
 
-        total_loras = len(final_lora_list)
-        total_pages = (total_loras + per_page - 1) // per_page
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        paginated_loras = final_lora_list[start_index:end_index]
-
-        lora_info_list = []
-        for lora in paginated_loras:
-            #lora_meta = metadata.get(lora, {})
-            lora_meta = load_lora_metadata(lora) 
-            preview_url, preview_type = get_lora_preview_asset_info(lora)
-
-            lora_info_list.append({
-                "name": lora,
-                "preview_url": preview_url or "",
-                "preview_type": preview_type,
-                "tags": lora_meta.get('tags', []),
-                "download_url": lora_meta.get('download_url', ''),
-                "activation text": lora_meta.get('activation text', ''),
-                "preferred weight": lora_meta.get('preferred weight', 1.0),
-                "negative text": lora_meta.get('negative text', ''),
-                "sd version": lora_meta.get('sd version', 'Unknown'),
-                "notes": lora_meta.get('notes', ''),
-            })
-
-        sorted_folders = sorted(list(all_folders), key=lambda s: s.lower())
+@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/get_loras")
+async def get_loras_endpoint(request):
+    try:
+        filters = parse_filter_params(request.query)
+        selected_loras = request.query.getall('selected_loras', [])
         
-        return web.json_response({
-            "loras": lora_info_list, 
-            "folders": sorted_folders,
-            "total_pages": total_pages,
-            "current_page": page
-        })
+        page = max(1, int(request.query.get('page', 1)))
+        per_page = max(1, int(request.query.get('per_page', 50)))
+        cursor = request.query.get('cursor')
+        since = request.query.get('since')
+        try:
+            fields = parse_card_fields(request.query.get('fields', ''))
+            if cursor:
+                decode_listing_cursor(cursor)
+            since = int(since) if since is not None else None
+        except ValueError as e:
+            return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+        etag = await run_in_gallery_executor(lora_catalog.etag, "get_loras", request.query_string)
+        if _is_not_modified(request, etag):
+            return web.Response(status=304, headers=_listing_headers(etag))
+
+        if since is not None:
+            delta = await run_in_gallery_executor(build_lora_delta, filters, since,
+                                                  request.query.get('epoch'), fields)
+            return web.json_response(delta, headers=_listing_headers(etag))
+
+        sort_field = request.query.get('sort', 'relevance' if filters["name_filter"] else 'name')
+        descending = request.query.get('order', 'asc').lower() == 'desc'
+        listing = await run_in_gallery_executor(build_lora_listing, filters, selected_loras, page, per_page,
+                                                sort_field, descending, cursor, fields)
+        return web.json_response(listing, headers=_listing_headers(etag))
     except Exception as e:
         import traceback
         print(f"Error in get_loras_endpoint: {traceback.format_exc()}")
         return web.json_response({"error": str(e)}, status=500)
 
+def broadcast_catalog_change(change):
+    """Pushes catalog deltas to open galleries so they only re-render the affected cards."""
+    cards = [lora_card_info(entry) for entry in change["updated"]]
+    server.PromptServer.instance.send_sync("lora_gallery.catalog_changed", {
+        "generation": change["generation"],
+        "added": [entry["name"] for entry in change["added"]],
+        "removed": change["removed"],
+        "updated": cards if len(cards) <= CATALOG_EVENT_MAX_CARDS else [],
+        "reload": len(cards) > CATALOG_EVENT_MAX_CARDS,
+    })
+
+lora_catalog.add_listener(broadcast_catalog_change)
+
+class LoraLibraryWatcher:
+    """Keeps the catalog in step with the LoRA folders while the server runs.
+
+    Uses watchdog's native file events when it is installed. Otherwise it polls only the directory
+    mtimes, backing off from WATCHER_POLL_INTERVAL to WATCHER_POLL_MAX_INTERVAL while nothing
+    changes; the catalog rescan then re-reads sidecars and previews in the changed folders only.
+    Files edited in place do not move their directory mtime, so a sweep every WATCHER_SWEEP_INTERVAL
+    catches those. Added, renamed and deleted files go through the catalog's incremental rescan;
+    sidecars and previews edited in place reload just their entry. Every resulting change reaches
+    the browser via broadcast_catalog_change.
+    """
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._paths = set()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    def _queue_paths(self, *paths):
+        with self._lock:
+            self._paths.update(path for path in paths if path)
+        self._wakeup.set()
+
+    def _start_observer(self, roots):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return None
+
+        watcher = self
+        class LibraryEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Opened/closed events are also produced by our own reads.
+                if event.event_type in ("created", "deleted", "modified", "moved"):
+                    watcher._queue_paths(os.fsdecode(event.src_path), os.fsdecode(getattr(event, "dest_path", "") or ""))
+
+        observer = Observer()
+        for root in roots:
+            observer.schedule(LibraryEventHandler(), root, recursive=True)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    def _process(self, paths):
+        rescan = False
+        reload_names = set()
+        for path in paths:
+            stem, ext = os.path.splitext(path)
+            ext = ext.lower()
+            if os.path.isdir(path):
+                # Folder names may contain dots, so directories are told apart by the filesystem.
+                rescan = True
+            elif ext == ".json" or ext in PREVIEW_EXTENSIONS:
+                lora_name = self.catalog.name_for_stem(stem)
+                if lora_name:
+                    reload_names.add(lora_name)
+                elif ext in PREVIEW_EXTENSIONS:
+                    rescan = True
+            elif ext in LORA_FILE_EXTENSIONS:
+                rescan = True
+        if rescan:
+            self.catalog.ensure_fresh(force=True)
+        for lora_name in reload_names:
+            self.catalog.reload_entry(lora_name)
+
+    def _poll(self, sweep):
+        """One polling pass; returns True if the catalog changed."""
+        generation = self.catalog.generation
+        self.catalog.ensure_fresh()
+        if sweep:
+            for lora_name in self.catalog.stale_entries():
+                self.catalog.reload_entry(lora_name)
+        return self.catalog.generation != generation
+
+    def _run(self):
+        try:
+            self.catalog.ensure_fresh()
+        except Exception as e:
+            print(f"Local Lora Gallery: Initial catalog build failed: {e}")
+        interval = WATCHER_POLL_INTERVAL
+        last_sweep = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                if self._observer is not None:
+                    self._wakeup.wait()
+                    self._stopped.wait(WATCHER_DEBOUNCE)
+                    self._wakeup.clear()
+                    with self._lock:
+                        paths, self._paths = self._paths, set()
+                    if paths:
+                        self._process(paths)
+                else:
+                    if self._stopped.wait(interval):
+                        break
+                    sweep = time.monotonic() - last_sweep >= WATCHER_SWEEP_INTERVAL
+                    if sweep:
+                        last_sweep = time.monotonic()
+                    if self._poll(sweep):
+                        interval = WATCHER_POLL_INTERVAL
+                    else:
+                        interval = min(interval * 2, WATCHER_POLL_MAX_INTERVAL)
+            except Exception as e:
+                print(f"Local Lora Gallery: Library watcher error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        roots = [root for root in folder_paths.get_folder_paths("loras") if os.path.isdir(root)]
+        try:
+            self._observer = self._start_observer(roots)
+        except Exception as e:
+            print(f"Local Lora Gallery: File events unavailable, polling the LoRA folders instead: {e}")
+            self._observer = None
+        mode = "file events" if self._observer is not None else f"polling every {WATCHER_POLL_INTERVAL:g}-{WATCHER_POLL_MAX_INTERVAL:g}s"
+        print(f"Local Lora Gallery: Watching {len(roots)} LoRA folder(s) using {mode}.")
+        self._thread = threading.Thread(target=self._run, name="lora_gallery_watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+library_watcher = LoraLibraryWatcher(lora_catalog)
+
+async def start_library_watcher(app):
+    library_watcher.start()
+
+async def stop_library_watcher(app):
+    library_watcher.stop()
+
+try:
+    server.PromptServer.instance.app.on_startup.append(start_library_watcher)
+    server.PromptServer.instance.app.on_cleanup.append(stop_library_watcher)
+except Exception as e:
+    print(f"INFO: Local Lora Gallery - Could not register the library watcher: {e}")
+
 @server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/preview")
 async def get_preview_image(request):
     filename = request.query.get('filename')
     lora_name = request.query.get('lora_name')
+    version = request.query.get('v')
+    try:
+        thumbnail_size = int(request.query.get('size', 0))
+    except ValueError:
+        thumbnail_size = 0
 
     if not filename or not lora_name or ".." in filename or "/" in filename or "\\" in filename:
         return web.Response(status=403)
@@ -575,15 +3053,39 @@ async def get_preview_image(request):
         lora_name_decoded = urllib.parse.unquote_plus(lora_name)
         filename_decoded = urllib.parse.unquote_plus(filename)
 
-        lora_full_path = folder_paths.get_full_path("loras", lora_name_decoded)
+        lora_full_path = await run_in_gallery_executor(folder_paths.get_full_path, "loras", lora_name_decoded)
         if not lora_full_path:
             return web.Response(status=404, text=f"Lora '{lora_name_decoded}' not found.")
         
         image_path = os.path.join(os.path.dirname(lora_full_path), filename_decoded)
-        if os.path.exists(image_path):
-            return web.FileResponse(image_path)
-        else:
+        try:
+            stat = await run_in_gallery_executor(os.stat, image_path)
+        except OSError:
             return web.Response(status=404, text=f"Preview '{filename_decoded}' not found.")
+
+        ext = os.path.splitext(image_path)[1].lower()
+        # Animated GIFs and videos are served as-is.
+        use_thumbnail = thumbnail_size > 0 and ext in IMAGE_EXTENSIONS and ext != '.gif'
+
+        file_etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        etag = f"{file_etag}-{ThumbnailCache.bucket_for(thumbnail_size)}" if use_thumbnail else file_etag
+        headers = {
+            "ETag": f'"{etag}"',
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": PREVIEW_IMMUTABLE_CACHE_CONTROL if version == f"{stat.st_mtime_ns:x}" else "no-cache",
+        }
+        if _is_not_modified(request, headers["ETag"], stat.st_mtime):
+            return web.Response(status=304, headers=headers)
+
+        if use_thumbnail:
+            try:
+                thumb_bytes = await run_in_gallery_executor(thumbnail_cache.read_thumbnail, image_path, thumbnail_size)
+                return web.Response(body=thumb_bytes, content_type=thumbnail_cache.content_type, headers=headers)
+            except Exception as e:
+                print(f"Local Lora Gallery: Failed to create thumbnail for {image_path}: {e}")
+                # The full image is served instead, so it must not carry the thumbnail's ETag.
+                headers["ETag"] = f'"{file_etag}"'
+        return web.FileResponse(image_path, headers=headers)
             
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
@@ -599,11 +3101,7 @@ async def set_ui_state(request):
         if not gallery_id: return web.Response(status=400)
 
         node_key = f"{gallery_id}_{node_id}"
-        ui_states = load_ui_state()
-        if node_key not in ui_states:
-            ui_states[node_key] = {}
-        ui_states[node_key].update(state)
-        save_ui_state(ui_states)
+        await run_in_gallery_executor(ui_state_store.update, node_key, state)
         return web.json_response({"status": "ok"})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
@@ -618,8 +3116,7 @@ async def get_ui_state(request):
             return web.json_response({"error": "node_id or gallery_id is required"}, status=400)
 
         node_key = f"{gallery_id}_{node_id}"
-        ui_states = load_ui_state()
-        node_state = ui_states.get(node_key, {"is_collapsed": False})
+        node_state = await run_in_gallery_executor(ui_state_store.get, node_key, {"is_collapsed": False})
         return web.json_response(node_state)
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
@@ -675,6 +3172,18 @@ async def update_lora_metadata(request):
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 '''
 
+EDITABLE_METADATA_FIELDS = ["tags", "activation text", "download_url", "preferred weight", "negative text", "notes", "sd version"]
+
+def normalize_metadata_field(field, val):
+    """Coerces an edited value to the type stored in the sidecar; raises ValueError if it cannot be."""
+    if field == "tags":
+        if isinstance(val, str):
+            val = val.split(",")
+        return [str(tag).strip() for tag in val if str(tag).strip()]
+    if field == "preferred weight":
+        return float(val)
+    return str(val)
+
 @server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/update_metadata")
 async def update_lora_metadata(request):
     try:
@@ -682,25 +3191,18 @@ async def update_lora_metadata(request):
         lora_name = data.get("lora_name")
         
         update_data = {}
-        fields = ["tags", "activation text", "download_url", "preferred weight", "negative text", "notes", "sd version"]
-        
-        for field in fields:
+        for field in EDITABLE_METADATA_FIELDS:
             val = data.get(field)
             if val is not None:
-                if field == "tags":
-                    update_data[field] = [str(tag).strip() for tag in val if str(tag).strip()]
-                elif field == "preferred weight":
-                    try:
-                        update_data[field] = float(val)
-                    except:
-                        pass
-                else:
-                    update_data[field] = str(val)
+                try:
+                    update_data[field] = normalize_metadata_field(field, val)
+                except (TypeError, ValueError):
+                    pass
 
         if not lora_name:
             return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
         
-        success = save_lora_metadata(lora_name, update_data, merge=True)
+        success = await run_in_gallery_executor(save_lora_metadata, lora_name, update_data, merge=True)
         
         if success:
             return web.json_response({"status": "ok"})
@@ -710,6 +3212,302 @@ async def update_lora_metadata(request):
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 
+def _split_trigger_words(text):
+    return [word.strip() for word in str(text or "").split(",") if word.strip()]
+
+def _add_unique(items, additions):
+    """Appends the additions not already present, compared case-insensitively."""
+    items = list(items)
+    seen = {str(item).lower() for item in items}
+    for addition in additions:
+        if addition.lower() not in seen:
+            items.append(addition)
+            seen.add(addition.lower())
+    return items
+
+def parse_metadata_operations(operations):
+    """Validates batch edit operations and normalises their values; raises ValueError on a bad one.
+
+    Supported ops: add_tag / remove_tag (tags), add_trigger / remove_trigger (words), set (field,
+    value) and replace (field, find, replace; applied to each tag for "tags").
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    parsed = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ValueError(f"operation {index} must be an object")
+        op = operation.get("op")
+        if op in ("add_tag", "remove_tag", "add_trigger", "remove_trigger"):
+            key = "tags" if op.endswith("_tag") else "words"
+            values = operation.get(key, operation.get(key[:-1]))
+            if isinstance(values, str):
+                values = values.split(",")
+            values = [str(value).strip() for value in values or () if str(value).strip()]
+            if not values:
+                raise ValueError(f"operation {index} ({op}) needs '{key}'")
+            parsed.append({"op": op, "values": values})
+        elif op in ("set", "replace"):
+            field = operation.get("field")
+            if field not in EDITABLE_METADATA_FIELDS:
+                raise ValueError(f"operation {index} ({op}) has an unknown field: {field!r}")
+            if op == "set":
+                try:
+                    value = normalize_metadata_field(field, operation.get("value", ""))
+                except (TypeError, ValueError):
+                    raise ValueError(f"operation {index} (set) has an invalid value for {field!r}")
+                parsed.append({"op": op, "field": field, "value": value})
+            else:
+                if field == "preferred weight":
+                    raise ValueError(f"operation {index} (replace) cannot be applied to {field!r}")
+                find = str(operation.get("find", ""))
+                if not find:
+                    raise ValueError(f"operation {index} (replace) needs 'find'")
+                parsed.append({"op": op, "field": field, "find": find, "replace": str(operation.get("replace", ""))})
+        else:
+            raise ValueError(f"operation {index} has an unknown op: {op!r}")
+    return parsed
+
+def apply_metadata_operations(meta, operations):
+    """Applies parsed operations to a copy of meta; returns {field: new value} for fields that changed."""
+    edited = {}
+
+    def current(field):
+        return edited[field] if field in edited else meta.get(field)
+
+    for operation in operations:
+        op = operation["op"]
+        if op in ("add_tag", "remove_tag"):
+            tags = list(current("tags") or [])
+            if op == "add_tag":
+                tags = _add_unique(tags, operation["values"])
+            else:
+                removed = {tag.lower() for tag in operation["values"]}
+                tags = [tag for tag in tags if str(tag).lower() not in removed]
+            edited["tags"] = tags
+        elif op in ("add_trigger", "remove_trigger"):
+            words = _split_trigger_words(current("activation text"))
+            if op == "add_trigger":
+                words = _add_unique(words, operation["values"])
+            else:
+                removed = {word.lower() for word in operation["values"]}
+                words = [word for word in words if word.lower() not in removed]
+            edited["activation text"] = ", ".join(words)
+        elif op == "set":
+            edited[operation["field"]] = operation["value"]
+        else:
+            field = operation["field"]
+            value = current(field)
+            if field == "tags":
+                replaced = []
+                for tag in value or []:
+                    tag = str(tag).replace(operation["find"], operation["replace"]).strip()
+                    if tag and tag not in replaced:
+                        replaced.append(tag)
+                edited[field] = replaced
+            elif value is not None:
+                edited[field] = str(value).replace(operation["find"], operation["replace"])
+    return {field: value for field, value in edited.items() if meta.get(field) != value}
+
+def _batch_update_metadata(lora_names, operations, dry_run):
+    results = {}
+    for lora_name in lora_names:
+        try:
+            if not get_lora_json_path(lora_name):
+                results[lora_name] = {"status": "error", "message": "LoRA file not found"}
+                continue
+            if dry_run:
+                changed = apply_metadata_operations(load_lora_metadata(lora_name), operations)
+            else:
+                changed = edit_lora_metadata(lora_name, lambda current: apply_metadata_operations(current, operations),
+                                             deferred=True, update_catalog=False)
+                if changed is None:
+                    results[lora_name] = {"status": "error", "message": "Failed to resolve file path"}
+                    continue
+            results[lora_name] = {"status": "updated" if changed else "unchanged", "changed": changed}
+        except Exception as e:
+            results[lora_name] = {"status": "error", "message": str(e)}
+    return results
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/batch_update_metadata")
+async def batch_update_metadata(request):
+    """Applies the same edit operations to many LoRAs in one request.
+
+    Without lora_names, the gallery's filter parameters select the LoRAs. Each sidecar gets a
+    single read-merge-write with every operation applied; batches run concurrently on the
+    gallery I/O pool. With the metadata store enabled, the edits land in the store and the
+    sidecars are written back in the background. With dry_run, changes are only reported.
+    """
+    try:
+        data = await request.json()
+        try:
+            operations = parse_metadata_operations(data.get("operations"))
+        except ValueError as e:
+            return web.json_response({"status": "error", "message": str(e)}, status=400)
+        dry_run = bool(data.get("dry_run", False))
+
+        lora_names = data.get("lora_names")
+        if not lora_names:
+            entries = await run_in_gallery_executor(filter_catalog_entries, **parse_filter_params(data))
+            lora_names = sorted((entry["name"] for entry in entries), key=lambda x: x.lower())
+        lora_names = list(dict.fromkeys(str(name) for name in lora_names))
+
+        batches = [lora_names[i:i + BATCH_UPDATE_SIZE] for i in range(0, len(lora_names), BATCH_UPDATE_SIZE)]
+        results = {}
+        for batch_results in await asyncio.gather(*(
+                run_in_gallery_executor(_batch_update_metadata, batch, operations, dry_run)
+                for batch in batches)):
+            results.update(batch_results)
+        # One catalog change (one generation bump and one websocket event) for the whole request.
+        updated_names = [lora_name for lora_name, result in results.items() if result["status"] == "updated"]
+        if updated_names and not dry_run:
+            await run_in_gallery_executor(update_catalog_metadata, updated_names)
+
+        statuses = Counter(result["status"] for result in results.values())
+        return web.json_response({
+            "status": "ok",
+            "dry_run": dry_run,
+            "total": len(lora_names),
+            "updated": statuses["updated"],
+            "unchanged": statuses["unchanged"],
+            "errors": statuses["error"],
+            "results": results,
+        })
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+def read_safetensors_metadata(lora_full_path):
+    """Reads only the length prefix and JSON header of a .safetensors file; no tensor data is touched."""
+    with open(lora_full_path, 'rb') as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError("File is too small to be a safetensors file")
+        (header_size,) = struct.unpack('<Q', prefix)
+        if header_size > SAFETENSORS_MAX_HEADER_BYTES:
+            raise ValueError(f"Header size {header_size} exceeds the {SAFETENSORS_MAX_HEADER_BYTES} byte limit")
+        header_bytes = f.read(header_size)
+    if len(header_bytes) != header_size:
+        raise ValueError("Truncated safetensors header")
+    header = json.loads(header_bytes)
+    metadata = header.get("__metadata__") if isinstance(header, dict) else None
+    return metadata if isinstance(metadata, dict) else None
+
+def _parse_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def top_training_tags(metadata, limit=TRAINING_INFO_TOP_TAGS):
+    """Most frequent captions tags from kohya's ss_tag_frequency, summed over all dataset folders."""
+    try:
+        tag_frequency = json.loads((metadata or {}).get("ss_tag_frequency") or "{}")
+    except (TypeError, ValueError):
+        return []
+    counts = {}
+    if isinstance(tag_frequency, dict):
+        for dataset_tags in tag_frequency.values():
+            if not isinstance(dataset_tags, dict):
+                continue
+            for tag, count in dataset_tags.items():
+                tag = str(tag).strip()
+                if tag:
+                    counts[tag] = counts.get(tag, 0) + (count if isinstance(count, (int, float)) else 0)
+    return [tag for tag, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]]
+
+def summarize_training_metadata(metadata):
+    metadata = metadata or {}
+    resolution = [int(n) for n in re.findall(r"\d+", str(metadata.get("ss_resolution") or ""))[:2]]
+    if len(resolution) == 1:
+        resolution *= 2
+    return {
+        "base_model": metadata.get("ss_base_model_version") or metadata.get("modelspec.architecture") or "",
+        "network_dim": _parse_number(metadata.get("ss_network_dim")),
+        "network_alpha": _parse_number(metadata.get("ss_network_alpha")),
+        "resolution": "x".join(str(n) for n in resolution),
+        "tags": top_training_tags(metadata),
+    }
+
+def sd_version_from_metadata(metadata):
+    """Maps kohya/modelspec base model fields to the sidecar's "sd version" values, or None if unknown."""
+    metadata = metadata or {}
+    base = str(metadata.get("ss_base_model_version") or metadata.get("modelspec.architecture") or "").lower()
+    if "xl" in base:
+        return "SDXL"
+    if base.startswith("sd_v2") or "stable-diffusion-v2" in base or str(metadata.get("ss_v2", "")).lower() == "true":
+        return "SD2"
+    if base.startswith("sd_v1") or "stable-diffusion-v1" in base:
+        return "SD1"
+    return None
+
+def derive_lora_metadata(lora_name, top_n=DERIVED_TRIGGER_WORDS):
+    """Suggests activation text and sd version for a LoRA from its safetensors header alone."""
+    lora_path = lora_metadata_cache.resolve_path(lora_name)
+    if not lora_path:
+        return None
+    metadata = training_info_cache.get_metadata(lora_path)
+    suggested = {}
+    trigger_words = top_training_tags(metadata, top_n)
+    if trigger_words:
+        suggested["activation text"] = ", ".join(trigger_words)
+    sd_version = sd_version_from_metadata(metadata)
+    if sd_version:
+        suggested["sd version"] = sd_version
+    return suggested
+
+class TrainingInfoCache:
+    """Safetensors header metadata cached per (path, size, mtime).
+
+    Compact summaries are kept for every file seen; full headers, which can hold large
+    tag-frequency tables, only for the most recently used files.
+    """
+    def __init__(self, max_metadata=SAFETENSORS_METADATA_CACHE_SIZE):
+        self.max_metadata = max_metadata
+        self._lock = threading.Lock()
+        self._metadata = OrderedDict()
+        self._summaries = {}
+
+    def get_metadata(self, lora_path):
+        state = _get_file_state(lora_path)
+        with self._lock:
+            cached = self._metadata.get(lora_path)
+            if cached and cached[0] == state:
+                self._metadata.move_to_end(lora_path)
+                return cached[1]
+        metadata = read_safetensors_metadata(lora_path) if lora_path.endswith(".safetensors") else None
+        with self._lock:
+            self._metadata[lora_path] = (state, metadata)
+            while len(self._metadata) > self.max_metadata:
+                self._metadata.popitem(last=False)
+            self._summaries[lora_path] = (state, summarize_training_metadata(metadata))
+        return metadata
+
+    def get_summary(self, lora_path):
+        state = _get_file_state(lora_path)
+        with self._lock:
+            cached = self._summaries.get(lora_path)
+            if cached and cached[0] == state:
+                return cached[1]
+        try:
+            self.get_metadata(lora_path)
+        except Exception as e:
+            print(f"Local Lora Gallery: Failed to read safetensors header of {lora_path}: {e}")
+            with self._lock:
+                self._summaries[lora_path] = (state, summarize_training_metadata(None))
+        with self._lock:
+            return self._summaries[lora_path][1]
+
+training_info_cache = TrainingInfoCache()
+
+def training_sort_key(field, summary):
+    value = summary.get(field)
+    if field == "resolution":
+        dims = [int(n) for n in value.split("x")] if value else []
+        value = dims[0] * dims[1] if len(dims) == 2 else None
+    elif field == "base_model":
+        value = value.lower() if value else None
+    return value
+
 @server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/get_lora_training_info")
 async def get_lora_training_info(request):
     try:
@@ -719,8 +3517,8 @@ async def get_lora_training_info(request):
         if not lora_name:
             return web.json_response({"status": "error", "message": "Missing lora_name"}, status=400)
 
-        lora_full_path = folder_paths.get_full_path("loras", lora_name)
-        if not lora_full_path or not os.path.exists(lora_full_path):
+        lora_full_path = await run_in_gallery_executor(folder_paths.get_full_path, "loras", lora_name)
+        if not lora_full_path or not await run_in_gallery_executor(os.path.exists, lora_full_path):
             return web.json_response({"status": "error", "message": "LoRA file not found"}, status=404)
 
         if not lora_full_path.endswith(".safetensors"):
@@ -731,8 +3529,7 @@ async def get_lora_training_info(request):
 
         metadata = {}
         try:
-            with safe_open(lora_full_path, framework="pt", device="cpu") as f:
-                metadata = f.metadata()
+            metadata = await run_in_gallery_executor(training_info_cache.get_metadata, lora_full_path)
         except Exception as e:
             print(f"Error reading safetensors metadata: {e}")
             return web.json_response({"status": "error", "message": f"Failed to read metadata: {str(e)}"}, status=500)
@@ -744,6 +3541,92 @@ async def get_lora_training_info(request):
 
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/get_lora_training_info_batch")
+async def get_lora_training_info_batch(request):
+    try:
+        data = await request.json()
+        lora_names = data.get("lora_names") or []
+        if not isinstance(lora_names, list) or not all(isinstance(name, str) for name in lora_names):
+            return web.json_response({"status": "error", "message": "lora_names must be a list of strings"}, status=400)
+
+        def collect():
+            info = {}
+            for lora_name in lora_names:
+                lora_path = lora_metadata_cache.resolve_path(lora_name)
+                if not lora_path:
+                    info[lora_name] = {"error": "LoRA file not found"}
+                    continue
+                info[lora_name] = training_info_cache.get_summary(lora_path)
+            return info
+
+        info = await run_in_gallery_executor(collect)
+        return web.json_response({"status": "ok", "info": info})
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+def _derive_metadata_batch(lora_names, top_n, fill, overwrite):
+    results = {}
+    for lora_name in lora_names:
+        try:
+            suggested = derive_lora_metadata(lora_name, top_n)
+            if suggested is None:
+                results[lora_name] = {"error": "LoRA file not found"}
+                continue
+            applied = {}
+            if fill and suggested:
+                def fill_fields(current):
+                    return {field: value for field, value in suggested.items()
+                            if overwrite or not current.get(field) or (field == "sd version" and current.get(field) == "Unknown")}
+                applied = edit_lora_metadata(lora_name, fill_fields, update_catalog=False) or {}
+            results[lora_name] = {"suggested": suggested, "applied": sorted(applied)}
+        except Exception as e:
+            results[lora_name] = {"error": str(e)}
+    return results
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/derive_metadata")
+async def derive_metadata(request):
+    """Derives trigger words and sd version from embedded training metadata, without any network access.
+
+    action "suggest" only reports; action "fill" writes empty fields (or all with overwrite) to the sidecars.
+    Without lora_names, the gallery's filter parameters select the LoRAs.
+    """
+    try:
+        data = await request.json()
+        action = data.get("action", "suggest")
+        if action not in ("suggest", "fill"):
+            return web.json_response({"status": "error", "message": "action must be 'suggest' or 'fill'"}, status=400)
+        try:
+            top_n = max(1, int(data.get("top_n", DERIVED_TRIGGER_WORDS)))
+        except (TypeError, ValueError):
+            return web.json_response({"status": "error", "message": "top_n must be an integer"}, status=400)
+        overwrite = bool(data.get("overwrite", False))
+
+        lora_names = data.get("lora_names")
+        if not lora_names:
+            entries = await run_in_gallery_executor(filter_catalog_entries, **parse_filter_params(data))
+            lora_names = sorted((entry["name"] for entry in entries), key=lambda x: x.lower())
+
+        batches = [lora_names[i:i + DERIVE_BATCH_SIZE] for i in range(0, len(lora_names), DERIVE_BATCH_SIZE)]
+        results = {}
+        for batch_results in await asyncio.gather(*(
+                run_in_gallery_executor(_derive_metadata_batch, batch, top_n, action == "fill", overwrite)
+                for batch in batches)):
+            results.update(batch_results)
+        updated_names = [lora_name for lora_name, result in results.items() if result.get("applied")]
+        if updated_names:
+            await run_in_gallery_executor(update_catalog_metadata, updated_names)
+
+        return web.json_response({
+            "status": "ok",
+            "action": action,
+            "total": len(lora_names),
+            "with_suggestions": sum(1 for result in results.values() if result.get("suggested")),
+            "updated": sum(1 for result in results.values() if result.get("applied")),
+            "results": results,
+        })
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
     
 '''
 @server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/get_all_tags")
@@ -759,29 +3642,365 @@ async def get_all_tags(request):
 @server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/get_all_tags")
 async def get_all_tags(request):
     try:
-        lora_files = folder_paths.get_filename_list("loras")
-        all_tags = set()
-        
-        for lora in lora_files:
-            meta = load_lora_metadata(lora)
-            tags = meta.get("tags", [])
-            if isinstance(tags, list):
-                for tag in tags:
-                    all_tags.add(tag)
+        etag = await run_in_gallery_executor(lora_catalog.etag, "get_all_tags")
+        if _is_not_modified(request, etag):
+            return web.Response(status=304, headers=_listing_headers(etag))
 
-        return web.json_response({"tags": sorted(list(all_tags), key=lambda s: s.lower())})
+        tag_counts = await run_in_gallery_executor(lora_catalog.tag_counts)
+        return web.json_response({
+            "tags": [tag for tag, _ in tag_counts],
+            "counts": {tag: count for tag, count in tag_counts}
+        }, headers=_listing_headers(etag))
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/cache_stats")
+async def get_cache_stats(request):
+    store_stats = await run_in_gallery_executor(metadata_store.stats) if metadata_store is not None else None
+    return web.json_response({
+        "metadata": lora_metadata_cache.stats(),
+        "patched_models": patched_model_cache.stats(),
+        "lora_tensors": lora_tensor_cache.stats(),
+        "metadata_store": store_stats,
+        "json_writes": json_group_committer.stats(),
+    })
+
+def sync_metadata_store():
+    """Two-way sync between the metadata store and the sidecars of every LoRA in the catalog."""
+    lora_catalog.ensure_fresh()
+    metadata_store.refresh(force=True)
+    imported, removed = metadata_store.import_sidecars(entry["json_path"] for entry in lora_catalog.entries())
+    exported = metadata_store.export_dirty()
+    metadata_store.flush()
+    return {"imported": imported, "exported": exported, "removed": removed}
+
+def _sync_metadata_store_in_background():
+    try:
+        result = sync_metadata_store()
+        print(f"Local Lora Gallery: Metadata store synced ({result['imported']} imported, "
+              f"{result['exported']} exported, {result['removed']} removed).")
+    except Exception as e:
+        print(f"Local Lora Gallery: Metadata store sync failed: {e}")
+    metadata_store.start_polling()
+
+async def start_metadata_store_sync(app):
+    # Not awaited, so a large library does not hold up server start.
+    asyncio.get_running_loop().run_in_executor(gallery_executor, _sync_metadata_store_in_background)
+
+if metadata_store is not None:
+    try:
+        server.PromptServer.instance.app.on_startup.append(start_metadata_store_sync)
+    except Exception as e:
+        print(f"INFO: Local Lora Gallery - Could not register the metadata store sync: {e}")
+
+def _metadata_store_disabled():
+    return web.json_response({"status": "error",
+                              "message": "The metadata store is disabled; set LORA_GALLERY_METADATA_STORE=sqlite to enable it."},
+                             status=400)
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/metadata_store/sync")
+async def sync_metadata_store_endpoint(request):
+    if metadata_store is None:
+        return _metadata_store_disabled()
+    try:
+        result = await run_in_gallery_executor(sync_metadata_store)
+        return web.json_response({"status": "ok", **result})
+    except Exception as e:
+        print(f"Local Lora Gallery: Metadata store sync failed: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+@server.PromptServer.instance.routes.get("/LocalLoraGalleryRemix/metadata_store/query")
+async def query_metadata_store_endpoint(request):
+    """Answers tag/folder/sd version queries from the store's indexes instead of the sidecars."""
+    if metadata_store is None:
+        return _metadata_store_disabled()
+    filters = parse_filter_params(request.query)
+    sd_version = request.query.get('sd_version', '').strip()
+
+    def run_query():
+        lora_catalog.ensure_fresh()
+        json_paths = metadata_store.query(filters["filter_tags"], filters["filter_mode"],
+                                          filters["filter_folder"], sd_version)
+        names = (lora_catalog.name_for_stem(os.path.splitext(json_path)[0]) for json_path in json_paths)
+        return sorted((name for name in names if name), key=str.lower)
+
+    try:
+        return web.json_response({"loras": await run_in_gallery_executor(run_query)})
+    except Exception as e:
+        print(f"Local Lora Gallery: Metadata store query failed: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+def _get_file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (0, None)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def get_lora_file_state(lora_name):
+    """(size, mtime_ns) of a LoRA file, or (0, None) if it cannot be found."""
+    lora_path = lora_metadata_cache.resolve_path(lora_name)
+    return _get_file_state(lora_path) if lora_path else (0, None)
+
+def lora_stack_fingerprint(selection_data, uses_clip=True):
+    """Hash of everything load_loras' output depends on, ignoring UI-only fields and no-op entries.
+
+    Mirrors load_loras: enabled entries with use_trigger contribute their sidecar mtime (trigger
+    words are collected even at zero strength), and entries that are actually applied contribute
+    their strengths plus the LoRA file size and mtime.
+    """
+    try:
+        lora_configs = json.loads(selection_data)
+    except Exception:
+        lora_configs = []
+    if not isinstance(lora_configs, list):
+        return hashlib.sha256(str(selection_data).encode("utf-8")).hexdigest()
+
+    effective = []
+    for config in lora_configs:
+        if not isinstance(config, dict) or not config.get('on', True) or not config.get('lora'):
+            continue
+        lora_name = config['lora']
+        item = [lora_name, None, None]
+
+        if config.get('use_trigger', True):
+            lora_path = lora_metadata_cache.resolve_path(lora_name)
+            item[1] = _get_mtime(os.path.splitext(lora_path)[0] + ".json") if lora_path else None
+
+        try:
+            strength_model = float(config.get('strength', 1.0))
+            strength_clip = float(config.get('strength_clip', strength_model)) if uses_clip else 0.0
+        except (TypeError, ValueError):
+            strength_model = strength_clip = 0.0
+        if strength_model != 0 or strength_clip != 0:
+            item[2] = (strength_model, strength_clip, get_lora_file_state(lora_name))
+
+        if config.get('use_trigger', True) or item[2] is not None:
+            effective.append(item)
+
+    return hashlib.sha256(json.dumps(effective).encode("utf-8")).hexdigest()
+
+class PatchedModelCache:
+    """Bounded cache of already-patched MODEL/CLIP pairs keyed by the base objects and the LoRA stack.
+
+    Base models are tracked through weak references, so a recycled id() never matches and an
+    entry goes away with its base. Patched clones reference their parent, though, so an entry
+    keeps its base alive and that callback alone never fires. The cache therefore holds entries
+    for at most max_bases base models: when another base is patched, every entry for the least
+    recently used base is dropped, whichever node created it. Two nodes on different checkpoints
+    keep their entries, and a base that is no longer used is released after max_bases others.
+    The LoRA memory is approximated by the on-disk size of the applied LoRAs, which is what their
+    patch weights occupy once loaded; entries are evicted least recently used first.
+    """
+    def __init__(self, max_entries=PATCHED_MODEL_CACHE_MAX_ENTRIES, max_bytes=PATCHED_MODEL_CACHE_MAX_BYTES,
+                 max_bases=PATCHED_MODEL_CACHE_MAX_BASES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_bases = max_bases
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()
+        self._bases = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, loader_type, model, clip, stack):
+        """stack is the ordered list of (lora_name, strength_model, strength_clip) actually applied."""
+        files = tuple(get_lora_file_state(lora_name) for lora_name, _, _ in stack)
+        return (loader_type, id(model), id(clip) if clip is not None else None, tuple(stack), files)
+
+    def _discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._total_bytes -= entry["bytes"]
+                if not any(other_key[1] == key[1] for other_key in self._entries):
+                    self._bases.pop(key[1], None)
+
+    def get(self, key, model, clip):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["model_ref"]() is model and (entry["clip_ref"] is None or entry["clip_ref"]() is clip):
+                self._entries.move_to_end(key)
+                self._bases.move_to_end(key[1])
+                self.hits += 1
+                return entry["result"]
+            self.misses += 1
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bases.clear()
+            self._total_bytes = 0
+
+    def _touch_base(self, base_id):
+        """Marks base_id most recently used and drops the entries of bases beyond max_bases."""
+        self._bases[base_id] = None
+        self._bases.move_to_end(base_id)
+        while len(self._bases) > self.max_bases:
+            evicted_base, _ = self._bases.popitem(last=False)
+            for other_key in [other_key for other_key in self._entries if other_key[1] == evicted_base]:
+                self._discard(other_key)
+
+    def put(self, key, model, clip, result):
+        try:
+            model_ref = weakref.ref(model, lambda _ref, key=key: self._discard(key))
+            clip_ref = weakref.ref(clip, lambda _ref, key=key: self._discard(key)) if clip is not None else None
+        except TypeError:
+            return
+        entry_bytes = sum(size for size, _ in key[4])
+        if entry_bytes > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._touch_base(key[1])
+            self._entries[key] = {"model_ref": model_ref, "clip_ref": clip_ref, "result": result,
+                                  "bytes": entry_bytes}
+            self._total_bytes += entry_bytes
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._total_bytes}
+
+patched_model_cache = PatchedModelCache()
+
+def _load_lora_tensors(lora_path):
+    try:
+        import comfy.utils
+    except ImportError:
+        return None
+    return comfy.utils.load_torch_file(lora_path, safe_load=True)
+
+def _has_free_ram(needed_bytes):
+    try:
+        import psutil
+    except ImportError:
+        return True
+    return psutil.virtual_memory().available - needed_bytes > LORA_TENSOR_CACHE_MIN_FREE_RAM
+
+def _warm_page_cache(lora_path):
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    with open(lora_path, 'rb', buffering=0) as f:
+        while f.readinto(buffer):
+            pass
+
+class LoraTensorCache:
+    """Bounded in-RAM cache of LoRA state dicts read ahead of execution by warm-up requests.
+
+    Entries are keyed by path and validated against size/mtime, so the node hands LoraLoader
+    exactly what it would have loaded itself. Files that do not fit the budget, or that are
+    warmed outside ComfyUI, are only read through the OS page cache.
+    """
+    def __init__(self, max_bytes=LORA_TENSOR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = set()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, lora_name):
+        """Returns (path, tensors) in the shape of LoraLoader.loaded_lora, or None."""
+        lora_path = lora_metadata_cache.resolve_path(lora_name)
+        if not lora_path:
+            return None
+        state = _get_file_state(lora_path)
+        with self._lock:
+            entry = self._entries.get(lora_path)
+            if entry and entry["state"] == state:
+                self._entries.move_to_end(lora_path)
+                self.hits += 1
+                return (lora_path, entry["tensors"])
+            self.misses += 1
+        return None
+
+    def _store(self, lora_path, state, tensors):
+        with self._lock:
+            previous = self._entries.pop(lora_path, None)
+            if previous:
+                self._total_bytes -= previous["bytes"]
+            self._entries[lora_path] = {"state": state, "tensors": tensors, "bytes": state[0]}
+            self._total_bytes += state[0]
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted["bytes"]
+
+    def _warm(self, lora_path):
+        try:
+            state = _get_file_state(lora_path)
+            with self._lock:
+                entry = self._entries.get(lora_path)
+                if entry and entry["state"] == state:
+                    return
+            tensors = None
+            if state[0] <= self.max_bytes and _has_free_ram(state[0]):
+                tensors = _load_lora_tensors(lora_path)
+            if tensors is None:
+                _warm_page_cache(lora_path)
+            else:
+                self._store(lora_path, state, tensors)
+        except Exception as e:
+            print(f"Local Lora Gallery: Failed to warm up {lora_path}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(lora_path)
+
+    def submit(self, lora_path):
+        """Queues a background warm-up; returns False if the file is already queued or cached."""
+        state = _get_file_state(lora_path)
+        with self._lock:
+            entry = self._entries.get(lora_path)
+            if lora_path in self._pending or (entry and entry["state"] == state):
+                return False
+            self._pending.add(lora_path)
+        warmup_executor.submit(self._warm, lora_path)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "bytes": self._total_bytes, "pending": len(self._pending)}
+
+lora_tensor_cache = LoraTensorCache()
+
+@server.PromptServer.instance.routes.post("/LocalLoraGalleryRemix/warmup_loras")
+async def warmup_loras(request):
+    try:
+        data = await request.json()
+        lora_names = data.get("lora_names") or []
+        if not isinstance(lora_names, list):
+            return web.json_response({"status": "error", "message": "lora_names must be a list"}, status=400)
+
+        def queue_warmups():
+            queued = 0
+            for lora_name in lora_names:
+                lora_path = lora_metadata_cache.resolve_path(str(lora_name))
+                if lora_path and lora_tensor_cache.submit(lora_path):
+                    queued += 1
+            return queued
+
+        queued = await run_in_gallery_executor(queue_warmups)
+        return web.json_response({"status": "ok", "queued": queued})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 
 class BaseLoraGallery:
     """Base class for common functionality."""
     
+    # Whether strength_clip affects the output of this node.
+    USES_CLIP = True
+
     @classmethod
-    def IS_CHANGED(cls, selection_data, **kwargs):
-        return selection_data
+    def IS_CHANGED(cls, selection_data="[]", **kwargs):
+        return lora_stack_fingerprint(selection_data, cls.USES_CLIP)
 
     def _get_nunchaku_model_type(self, model):
         """Checks if the model is a Nunchaku-accelerated model and returns its type."""
+        detect_nunchaku_loaders()
         if not (is_nunchaku_flux_available or is_nunchaku_qwen_available or is_nunchaku_zimage_available):
             return 'none'
         
@@ -828,6 +4047,7 @@ class LocalLoraGalleryRemix(BaseLoraGallery):
 
         current_model, current_clip = model, clip
         applied_count = 0
+        lora_stack = []
 
         nunchaku_model_type = self._get_nunchaku_model_type(model)
         loader_instance = None
@@ -865,20 +4085,41 @@ class LocalLoraGalleryRemix(BaseLoraGallery):
             try:
                 strength_model = float(config.get('strength', 1.0))
                 strength_clip = float(config.get('strength_clip', strength_model))
-
-                if strength_model == 0 and strength_clip == 0:
-                    continue
-
-                if nunchaku_model_type in ['flux', 'qwen', 'zimage']:
-                    (current_model,) = loader_instance.load_lora(current_model, lora_name, strength_model)
-                else:
-                    current_model, current_clip = loader_instance.load_lora(current_model, current_clip, lora_name, strength_model, strength_clip)
-
-                applied_count += 1
             except Exception as e:
                 print(f"LocalLoraGalleryRemix: Failed to load LoRA '{lora_name}': {e}")
+                continue
+
+            if strength_model == 0 and strength_clip == 0:
+                continue
+            lora_stack.append((lora_name, strength_model, strength_clip))
+
+        cache_key = patched_model_cache.make_key(nunchaku_model_type, model, clip, lora_stack)
+        cached = patched_model_cache.get(cache_key, model, clip)
+        if cached:
+            current_model, current_clip = cached
+            applied_count = len(lora_stack)
+            print(f"LocalLoraGalleryRemix: Reusing {applied_count} already applied LoRAs.")
+        else:
+            failed = False
+            for lora_name, strength_model, strength_clip in lora_stack:
+                try:
+                    if nunchaku_model_type == 'none':
+                        warmed = lora_tensor_cache.get(lora_name)
+                        if warmed is not None:
+                            loader_instance.loaded_lora = warmed
+                    if nunchaku_model_type in ['flux', 'qwen', 'zimage']:
+                        (current_model,) = loader_instance.load_lora(current_model, lora_name, strength_model)
+                    else:
+                        current_model, current_clip = loader_instance.load_lora(current_model, current_clip, lora_name, strength_model, strength_clip)
+
+                    applied_count += 1
+                except Exception as e:
+                    failed = True
+                    print(f"LocalLoraGalleryRemix: Failed to load LoRA '{lora_name}': {e}")
+            if lora_stack and not failed:
+                patched_model_cache.put(cache_key, model, clip, (current_model, current_clip))
 
-        print(f"LocalLoraGalleryRemix: Applied {applied_count} LoRAs.")
+            print(f"LocalLoraGalleryRemix: Applied {applied_count} LoRAs.")
 
         trigger_words_string = ", ".join(trigger_words_list)
         negative_trigger_words_string = ", ".join(negative_trigger_words_list)
@@ -886,6 +4127,8 @@ class LocalLoraGalleryRemix(BaseLoraGallery):
         return (current_model, current_clip, trigger_words_string, negative_trigger_words_string)
 
 class LocalLoraGalleryRemixModelOnly(BaseLoraGallery):
+    USES_CLIP = False
+
     @classmethod
     def INPUT_TYPES(cls):
         return {
@@ -914,6 +4157,7 @@ class LocalLoraGalleryRemixModelOnly(BaseLoraGallery):
 
         current_model = model
         applied_count = 0
+        lora_stack = []
 
         nunchaku_model_type = self._get_nunchaku_model_type(model)
         loader_instance = None
@@ -950,25 +4194,46 @@ class LocalLoraGalleryRemixModelOnly(BaseLoraGallery):
 
             try:
                 strength_model = float(config.get('strength', 1.0))
-                if strength_model == 0:
-                    continue
-
-                if nunchaku_model_type in ['flux', 'qwen', 'zimage']:
-                    (current_model,) = loader_instance.load_lora(current_model, lora_name, strength_model)
-                else:
-                    (current_model,) = loader_instance.load_lora_model_only(current_model, lora_name, strength_model)
-
-                applied_count += 1
             except Exception as e:
                 print(f"LocalLoraGalleryRemixModelOnly: Failed to load LoRA '{lora_name}': {e}")
+                continue
+
+            if strength_model == 0:
+                continue
+            lora_stack.append((lora_name, strength_model, None))
+
+        cache_key = patched_model_cache.make_key(f"{nunchaku_model_type}_model_only", model, None, lora_stack)
+        cached = patched_model_cache.get(cache_key, model, None)
+        if cached:
+            current_model = cached[0]
+            applied_count = len(lora_stack)
+            print(f"LocalLoraGalleryRemixModelOnly: Reusing {applied_count} already applied LoRAs.")
+        else:
+            failed = False
+            for lora_name, strength_model, _ in lora_stack:
+                try:
+                    if nunchaku_model_type == 'none':
+                        warmed = lora_tensor_cache.get(lora_name)
+                        if warmed is not None:
+                            loader_instance.loaded_lora = warmed
+                    if nunchaku_model_type in ['flux', 'qwen', 'zimage']:
+                        (current_model,) = loader_instance.load_lora(current_model, lora_name, strength_model)
+                    else:
+                        (current_model,) = loader_instance.load_lora_model_only(current_model, lora_name, strength_model)
+
+                    applied_count += 1
+                except Exception as e:
+                    failed = True
+                    print(f"LocalLoraGalleryRemixModelOnly: Failed to load LoRA '{lora_name}': {e}")
+            if lora_stack and not failed:
+                patched_model_cache.put(cache_key, model, None, (current_model,))
 
-        print(f"LocalLoraGalleryRemixModelOnly: Applied {applied_count} LoRAs.")
+            print(f"LocalLoraGalleryRemixModelOnly: Applied {applied_count} LoRAs.")
 
         trigger_words_string = ", ".join(trigger_words_list)
         negative_trigger_words_string = ", ".join(negative_trigger_words_list)
         return (current_model, trigger_words_string, negative_trigger_words_string)
 
-migrate_legacy_metadata()
 
 NODE_CLASS_MAPPINGS = {
     "LocalLoraGalleryRemix": LocalLoraGalleryRemix,
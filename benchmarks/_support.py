@@ -0,0 +1,141 @@
+"""
+Shared pieces of the benchmark scripts: stand-in ComfyUI modules, synthetic LoRA libraries and
+loading a scratch copy of the gallery module.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import struct
+import sys
+import types
+
+from aiohttp import web
+from PIL import Image
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeModel:
+    """Stands in for a ComfyUI ModelPatcher/CLIP; the gallery only needs identity and weakrefs."""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.model = types.SimpleNamespace()
+
+
+def install_stub_modules(lora_root):
+    """Registers minimal folder_paths, server and nodes modules pointing at the synthetic library."""
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.get_folder_paths = lambda kind: [lora_root]
+    folder_paths.supported_pt_extensions = {".safetensors"}
+
+    def get_filename_list(kind):
+        names = []
+        for dirpath, _, files in os.walk(lora_root):
+            for f in files:
+                if f.endswith(".safetensors"):
+                    names.append(os.path.relpath(os.path.join(dirpath, f), lora_root))
+        return sorted(names)
+
+    def get_full_path(kind, name):
+        path = os.path.join(lora_root, name)
+        return path if os.path.isfile(path) else None
+
+    folder_paths.get_filename_list = get_filename_list
+    folder_paths.get_full_path = get_full_path
+    folder_paths.get_output_directory = lambda: lora_root
+    folder_paths.get_temp_directory = lambda: lora_root
+
+    server = types.ModuleType("server")
+
+    class PromptServer:
+        instance = None
+
+        def __init__(self):
+            self.routes = web.RouteTableDef()
+            self.app = web.Application()
+
+        def send_sync(self, event, data, sid=None):
+            pass
+
+    PromptServer.instance = PromptServer()
+    server.PromptServer = PromptServer
+
+    nodes = types.ModuleType("nodes")
+
+    def read_lora(lora_name):
+        with open(get_full_path("loras", lora_name), "rb") as f:
+            return f.read()
+
+    class LoraLoader:
+        def __init__(self):
+            self.loaded_lora = None
+
+        def load_lora(self, model, clip, lora_name, strength_model, strength_clip):
+            read_lora(lora_name)
+            return FakeModel(model), FakeModel(clip)
+
+    class LoraLoaderModelOnly(LoraLoader):
+        def load_lora_model_only(self, model, lora_name, strength_model):
+            read_lora(lora_name)
+            return (FakeModel(model),)
+
+    nodes.LoraLoader = LoraLoader
+    nodes.LoraLoaderModelOnly = LoraLoaderModelOnly
+    nodes.NODE_CLASS_MAPPINGS = {}
+
+    sys.modules.update({"folder_paths": folder_paths, "server": server, "nodes": nodes})
+    return server
+
+
+def _safetensors_bytes(index, payload_size):
+    metadata = {
+        "ss_base_model_version": ("sdxl_base_v1-0", "sd_v1", "flux1")[index % 3],
+        "ss_network_dim": str(8 << (index % 4)),
+        "ss_network_alpha": str(4 << (index % 4)),
+        "ss_resolution": "(1024, 1024)",
+        "ss_tag_frequency": json.dumps({"dataset": {f"concept_{index % 50}": 12, f"subject_{index}": 30}}),
+    }
+    header = json.dumps({"__metadata__": metadata}).encode("utf-8")
+    return struct.pack("<Q", len(header)) + header + b"\0" * payload_size
+
+
+def build_library(lora_root, count, image_size=1024, preview_every=1, payload_size=1024):
+    """Writes count fake LoRAs in nested folders, each with a safetensors header carrying training
+    metadata and a JSON sidecar, plus a PNG preview for every preview_every-th LoRA."""
+    preview = None
+    for i in range(count):
+        folder = os.path.join(lora_root, f"set_{i % 10:02d}", f"group_{i % 7}")
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, f"lora_{i:05d}")
+        with open(base + ".safetensors", "wb") as f:
+            f.write(_safetensors_bytes(i, payload_size))
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"tags": [f"tag_{i % 25}", f"style_{i % 7}"], "activation text": f"trigger_{i}",
+                       "notes": f"synthetic lora {i}"}, f)
+        if preview_every and i % preview_every == 0:
+            if preview and image_size <= 128:
+                # Small previews only need to exist; copy the first encoded one.
+                shutil.copyfile(preview, base + ".png")
+            else:
+                Image.new("RGB", (image_size, image_size), ((i * 37) % 255, (i * 11) % 255, 128)).save(base + ".png")
+                preview = base + ".png"
+
+
+def load_gallery_module(work_dir):
+    """Imports a copy of the gallery module so its caches and state files live in the scratch directory."""
+    module_path = os.path.join(work_dir, "Local_Lora_Gallery.py")
+    shutil.copy(os.path.join(REPO_DIR, "Local_Lora_Gallery.py"), module_path)
+    spec = importlib.util.spec_from_file_location("Local_Lora_Gallery", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
@@ -0,0 +1,267 @@
+"""
+Measures how the gallery backend scales with the size of the LoRA library.
+
+For each library size a synthetic library is generated (fake .safetensors files with training
+metadata headers, JSON sidecars, PNG previews, nested folders), the gallery routes are served
+with stand-in folder_paths/server/nodes modules and a set of scenarios is timed: the cold
+catalog build, listing pages, cursor scrolling, tag and search filters, get_all_tags, preview
+lookups, load_loras with and without the patched-model cache, and the legacy metadata migration.
+
+Every scenario reports latency percentiles and the file-system calls made per call: the audit
+events (open, os.listdir, os.scandir, ...) plus os.stat/os.lstat, which raise no audit event and
+are counted by wrapping them (os.path.exists, isfile, getsize, getmtime, ... go through os.stat).
+Stats served by os.scandir's DirEntry objects are not counted. --trace-memory adds the
+tracemalloc peak per scenario. Use --json or --output to get a machine-readable report for
+tracking regressions between releases.
+
+    python benchmarks/backend_scaling.py --sizes 1000,10000,50000 --output scaling.json
+    python benchmarks/backend_scaling.py --sizes 1000 --iterations 50
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from _support import FakeModel, build_library, install_stub_modules, load_gallery_module, percentile
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+AUDITED_PREFIXES = ("os.", "shutil.", "sqlite3.connect")
+# Not audited by CPython, so these are wrapped instead.
+COUNTED_OS_FUNCTIONS = ("stat", "lstat")
+SEARCH_TERMS = ["l", "lo", "lora_0", "trigger_1", "synthetic", "tag_3", "style", "trigegr_42", "set_05 lora", "group_2"]
+
+
+class AuditCounter:
+    """Counts file-system audit events and os.stat/os.lstat calls while active; audit hooks cannot be
+    removed, so it is installed once."""
+
+    def __init__(self):
+        self.active = False
+        self.counts = Counter()
+        sys.addaudithook(self)
+        for name in COUNTED_OS_FUNCTIONS:
+            setattr(os, name, self._counted(f"os.{name}", getattr(os, name)))
+
+    def _counted(self, event, func):
+        @functools.wraps(func)
+        def counted(*args, **kwargs):
+            if self.active:
+                self.counts[event] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def __call__(self, event, args):
+        if self.active and (event == "open" or event.startswith(AUDITED_PREFIXES)):
+            self.counts[event] += 1
+
+
+class ScenarioTimer:
+    def __init__(self, audit, trace_memory):
+        self.audit = audit
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    async def run(self, name, iterations, call):
+        """Times call(i) for each iteration; call may return an awaitable."""
+        self.audit.counts.clear()
+        if self.trace_memory:
+            tracemalloc.start()
+        self.audit.active = True
+        durations = []
+        try:
+            for i in range(iterations):
+                start = time.perf_counter()
+                result = call(i)
+                if asyncio.iscoroutine(result):
+                    await result
+                durations.append((time.perf_counter() - start) * 1000.0)
+        finally:
+            self.audit.active = False
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if self.trace_memory:
+                tracemalloc.stop()
+
+        self.results[name] = {
+            "iterations": iterations,
+            "latency_ms": {
+                "mean": round(statistics.fmean(durations), 3),
+                "p50": round(percentile(durations, 50), 3),
+                "p90": round(percentile(durations, 90), 3),
+                "p99": round(percentile(durations, 99), 3),
+                "max": round(max(durations), 3),
+            },
+            "audit_events_per_call": {event: round(count / iterations, 2)
+                                      for event, count in sorted(self.audit.counts.items())},
+        }
+        if peak is not None:
+            self.results[name]["peak_memory_kib"] = round(peak / 1024, 1)
+
+
+async def get_json(client, path, **params):
+    async with client.get(path, params=params) as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+
+def write_legacy_metadata(gallery, lora_names):
+    legacy = {name: {"trigger_words": f"legacy_{i}", "preferred_weight": 0.8, "negative_prompt": "lowres"}
+              for i, name in enumerate(lora_names)}
+    with open(gallery.LEGACY_METADATA_FILE, "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+
+
+async def run_scenarios(gallery, app, timer, args):
+    iterations = args.iterations
+    listing = "/LocalLoraGalleryRemix/get_loras"
+    async with TestClient(TestServer(app)) as client:
+        await timer.run("catalog_build", 1, lambda i: get_json(client, listing, per_page=args.per_page))
+        names = [entry["name"] for entry in gallery.lora_catalog.entries()]
+
+        await timer.run("get_loras_first_page", iterations,
+                        lambda i: get_json(client, listing, per_page=args.per_page))
+
+        async def scroll(i):
+            page = await get_json(client, listing, per_page=args.per_page, sort="name", order="desc")
+            for _ in range(args.scroll_pages):
+                if not page["next_cursor"]:
+                    break
+                page = await get_json(client, listing, per_page=args.per_page, cursor=page["next_cursor"])
+        await timer.run("get_loras_cursor_scroll", max(1, iterations // 5), scroll)
+
+        await timer.run("get_loras_tag_filter", iterations,
+                        lambda i: get_json(client, listing, per_page=args.per_page,
+                                           filter_tag=f"tag_{i % 25},style_{i % 7}", mode=("OR", "AND")[i % 2]))
+        await timer.run("get_loras_search", iterations,
+                        lambda i: get_json(client, listing, per_page=args.per_page,
+                                           name_filter=SEARCH_TERMS[i % len(SEARCH_TERMS)]))
+        await timer.run("get_all_tags", iterations, lambda i: get_json(client, "/LocalLoraGalleryRemix/get_all_tags"))
+
+        sample = [names[(i * 7919) % len(names)] for i in range(iterations)]
+        paths = {name: gallery.lora_catalog.get(name)["path"] for name in sample}
+        await timer.run("preview_asset_info", iterations,
+                        lambda i: gallery.get_lora_preview_asset_info(sample[i], paths[sample[i]]))
+
+        node = gallery.LocalLoraGalleryRemix()
+        stack = json.dumps([{"lora": name, "strength": 0.8, "on": True} for name in names[:args.stack_size]])
+        await timer.run("load_loras_cold", iterations,
+                        lambda i: node.load_loras(FakeModel(), FakeModel(), "bench", stack))
+        model, clip = FakeModel(), FakeModel()
+        node.load_loras(model, clip, "bench", stack)
+        await timer.run("load_loras_cached", iterations, lambda i: node.load_loras(model, clip, "bench", stack))
+
+        write_legacy_metadata(gallery, names)
+        await timer.run("migrate_legacy_metadata", 1, lambda i: gallery.migrate_legacy_metadata())
+
+
+async def bench_size(size, args, audit):
+    work_dir = tempfile.mkdtemp(prefix="lora_gallery_scaling_")
+    try:
+        lora_root = os.path.join(work_dir, "loras")
+        started = time.perf_counter()
+        build_library(lora_root, size, image_size=args.image_size, preview_every=args.preview_every,
+                      payload_size=args.payload_size)
+        library_seconds = time.perf_counter() - started
+
+        server = install_stub_modules(lora_root)
+        started = time.perf_counter()
+        gallery = load_gallery_module(work_dir)
+        import_seconds = time.perf_counter() - started
+
+        app = server.PromptServer.instance.app
+        app.add_routes(server.PromptServer.instance.routes)
+        timer = ScenarioTimer(audit, args.trace_memory)
+
+        # The gallery logs every load_loras call; keep that out of the report unless asked for.
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            await run_scenarios(gallery, app, timer, args)
+
+        result = {
+            "loras": size,
+            "library_build_s": round(library_seconds, 2),
+            "module_import_s": round(import_seconds, 3),
+            "scenarios": timer.results,
+        }
+        if resource is not None:
+            # ru_maxrss is KiB on Linux and bytes on macOS.
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            result["max_rss_mib"] = round(max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+        return result
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+async def run_benchmark(args, sizes):
+    audit = AuditCounter()
+    results = []
+    for size in sizes:
+        results.append(await bench_size(size, args, audit))
+    return {
+        "benchmark": "backend_scaling",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("json", "output", "verbose")},
+        "results": results,
+    }
+
+
+def print_report(report):
+    for result in report["results"]:
+        print(f"{result['loras']} LoRAs (library built in {result['library_build_s']}s, "
+              f"module import {result['module_import_s']}s, max RSS {result.get('max_rss_mib', '?')} MiB)")
+        for name, scenario in result["scenarios"].items():
+            lat = scenario["latency_ms"]
+            io = sum(scenario["audit_events_per_call"].values())
+            memory = f"  peak {scenario['peak_memory_kib']} KiB" if "peak_memory_kib" in scenario else ""
+            print(f"  {name:<26} p50 {lat['p50']:>9.2f}  p90 {lat['p90']:>9.2f}  p99 {lat['p99']:>9.2f} ms"
+                  f"  fs events/call {io:>9.1f}{memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated library sizes")
+    parser.add_argument("--iterations", type=int, default=20, help="calls per scenario")
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--scroll-pages", type=int, default=10, help="cursor pages followed per scroll")
+    parser.add_argument("--stack-size", type=int, default=3, help="LoRAs applied per load_loras call")
+    parser.add_argument("--image-size", type=int, default=64, help="edge length of the synthetic preview images")
+    parser.add_argument("--preview-every", type=int, default=2, help="write a preview for every Nth LoRA")
+    parser.add_argument("--payload-size", type=int, default=4096, help="tensor bytes after each safetensors header")
+    parser.add_argument("--trace-memory", action="store_true", help="record the tracemalloc peak per scenario (slower)")
+    parser.add_argument("--verbose", action="store_true", help="show the gallery's own log output")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    report = asyncio.run(run_benchmark(args, sizes))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Measures how responsive the server event loop stays while the gallery is under concurrent load.
+
+Runs the gallery routes on a local aiohttp server against a synthetic LoRA library (stand-in
+folder_paths/server/nodes modules, no ComfyUI needed) and samples event-loop lag with a ticker
+task while clients page through listings and request fresh thumbnails.
+
+    python benchmarks/loop_responsiveness.py --loras 500 --clients 8
+    python benchmarks/loop_responsiveness.py --inline   # same load with the handlers' blocking work run on the loop
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
+from _support import build_library, install_stub_modules, load_gallery_module, percentile
+
+
+async def ticker(interval, lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected) * 1000.0)
+
+
+async def client_load(session, base_url, client_id, args, latencies):
+    page = 1 + client_id
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        async with session.get(f"{base_url}/LocalLoraGalleryRemix/get_loras",
+                               params={"page": page, "per_page": args.per_page, "client": client_id}) as resp:
+            listing = await resp.json()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+        for lora in listing.get("loras", []):
+            if not lora["preview_url"]:
+                continue
+            start = time.perf_counter()
+            async with session.get(base_url + lora["preview_url"] + f"&size={args.thumbnail_size}") as resp:
+                await resp.read()
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+        page = page % max(1, listing.get("total_pages", 1)) + 1
+
+
+async def run_benchmark(args):
+    work_dir = tempfile.mkdtemp(prefix="lora_gallery_bench_")
+    try:
+        lora_root = os.path.join(work_dir, "loras")
+        build_library(lora_root, args.loras, args.image_size)
+        server = install_stub_modules(lora_root)
+        gallery = load_gallery_module(work_dir)
+
+        if args.inline:
+            async def run_inline(func, *a, **kw):
+                return func(*a, **kw)
+            gallery.run_in_gallery_executor = run_inline
+
+        app = server.PromptServer.instance.app
+        app.add_routes(server.PromptServer.instance.routes)
+        test_server = TestServer(app)
+        await test_server.start_server()
+        base_url = str(test_server.make_url("")).rstrip("/")
+
+        lags, latencies = [], []
+        stop = asyncio.Event()
+        ticker_task = asyncio.create_task(ticker(args.tick_ms / 1000.0, lags, stop))
+        started = time.perf_counter()
+        try:
+            async with ClientSession() as session:
+                await asyncio.gather(*(client_load(session, base_url, i, args, latencies) for i in range(args.clients)))
+        finally:
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await ticker_task
+            await test_server.close()
+            await gallery.close_http_session()
+
+        return {
+            "mode": "inline" if args.inline else "executor",
+            "loras": args.loras,
+            "clients": args.clients,
+            "requests": len(latencies),
+            "elapsed_s": round(elapsed, 3),
+            "loop_lag_ms": {
+                "mean": round(statistics.fmean(lags), 2) if lags else 0.0,
+                "p50": round(percentile(lags, 50), 2),
+                "p99": round(percentile(lags, 99), 2),
+                "max": round(max(lags), 2) if lags else 0.0,
+            },
+            "request_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p99": round(percentile(latencies, 99), 2),
+            },
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loras", type=int, default=300)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=3, help="listing pages fetched per client")
+    parser.add_argument("--per-page", type=int, default=30)
+    parser.add_argument("--image-size", type=int, default=1024, help="edge length of the synthetic preview images")
+    parser.add_argument("--thumbnail-size", type=int, default=256)
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="ticker interval used to sample loop lag")
+    parser.add_argument("--inline", action="store_true", help="run the handlers' blocking work directly on the loop")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    lag, req = result["loop_lag_ms"], result["request_ms"]
+    print(f"{result['mode']}: {result['requests']} requests from {result['clients']} clients in {result['elapsed_s']}s")
+    print(f"  loop lag ms   mean {lag['mean']}  p50 {lag['p50']}  p99 {lag['p99']}  max {lag['max']}")
+    print(f"  request ms    p50 {req['p50']}  p99 {req['p99']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,28 @@ const LocalLoraGalleryRemixNode = {
     isLoading: false,
     currentPage: 1,
     totalPages: 1,
+    thumbnailSize: 256,
+
+    getThumbnailUrl(url) {
+        if (!url || url.startsWith('data:')) return url;
+        const separator = url.includes('?') ? '&' : '?';
+        return `${url}${separator}size=${this.thumbnailSize}`;
+    },
     
-    async getLoras(filter_tag = "", mode = "OR", folder = "", page = 1, selected_loras = [], name_filter = "") {
+    async getLoras(filter_tag = "", mode = "OR", folder = "", page = 1, selected_loras = [], name_filter = "", cursor = null) {
         this.isLoading = true;
         try {
             let url = `/LocalLoraGalleryRemix/get_loras?filter_tag=${encodeURIComponent(filter_tag)}&mode=${mode}&folder=${encodeURIComponent(folder)}&page=${page}&name_filter=${encodeURIComponent(name_filter)}`;
             selected_loras.forEach(lora => {
                 url += `&selected_loras=${encodeURIComponent(lora)}`;
             });
+            // Later pages continue the server-side snapshot of the first page instead of re-sorting the library.
+            if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
             const response = await api.fetchApi(url);
             const data = await response.json();
             this.totalPages = data.total_pages || 1;
             this.currentPage = data.current_page || 1;
+            this.nextCursor = data.next_cursor || null;
             return data;
         } catch (error) {
             console.error("LocalLoraGalleryRemix: Error fetching LoRAs:", error);
@@ -40,6 +50,50 @@ const LocalLoraGalleryRemixNode = {
         }
     },
 
+    async batchUpdateMetadata(loraNames, operations) {
+        try {
+            const response = await api.fetchApi("/LocalLoraGalleryRemix/batch_update_metadata", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ lora_names: loraNames, operations }),
+            });
+            const data = await response.json();
+            return data.results || {};
+        } catch(e) {
+            console.error("LocalLoraGalleryRemix: Failed to batch update metadata", e);
+            return {};
+        }
+    },
+
+    async getTrainingInfo(loraNames) {
+        if (!loraNames.length) return {};
+        try {
+            const response = await api.fetchApi("/LocalLoraGalleryRemix/get_lora_training_info_batch", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ lora_names: loraNames }),
+            });
+            const data = await response.json();
+            return data.info || {};
+        } catch(e) {
+            console.error("LocalLoraGalleryRemix: Failed to fetch training info", e);
+            return {};
+        }
+    },
+
+    async warmupLoras(loraNames) {
+        if (!loraNames.length) return;
+        try {
+            await api.fetchApi("/LocalLoraGalleryRemix/warmup_loras", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ lora_names: loraNames }),
+            });
+        } catch(e) {
+            console.error("LocalLoraGalleryRemix: Failed to warm up LoRAs", e);
+        }
+    },
+
     async setUiState(nodeId, galleryId, state) {
         try {
             await api.fetchApi("/LocalLoraGalleryRemix/set_ui_state", {
@@ -63,6 +117,14 @@ const LocalLoraGalleryRemixNode = {
             this.isDeserialized = true;
         };
 
+        const onRemoved = nodeType.prototype.onRemoved;
+        nodeType.prototype.onRemoved = function () {
+            // The api is shared by every node, so its listeners must go with the node.
+            this.apiListeners?.forEach(([type, handler]) => api.removeEventListener(type, handler));
+            this.apiListeners = [];
+            return onRemoved?.apply(this, arguments);
+        };
+
         const onNodeCreated = nodeType.prototype.onNodeCreated;
         nodeType.prototype.onNodeCreated = function () {
             const result = onNodeCreated?.apply(this, arguments);
@@ -217,7 +279,7 @@ const LocalLoraGalleryRemixNode = {
                         <div class="locallora-controls">
                             <div class="locallora-controls-row">
                                 <button class="toggle-all-btn">Toggle All</button>
-                                <input type="text" class="search-input" placeholder="Filter by Name..." style="flex-grow: 1;">
+                                <input type="text" class="search-input" placeholder="Search names, triggers, tags, notes..." style="flex-grow: 1;">
                                 <button class="save-preset-btn" title="Save current stack as preset">Save Preset</button>
                                 <div class="locallora-preset-container">
                                     <button class="load-preset-btn">Load Preset ▼</button>
@@ -258,6 +320,8 @@ const LocalLoraGalleryRemixNode = {
                                 <select class="folder-filter-select" style="max-width: 150px;">
                                     <option value="">All Folders</option>
                                 </select>
+                                <button class="sync-all-btn" title="Sync all LoRAs matching the current filters with Civitai" style="flex-shrink: 0;">☁️ Sync All</button>
+                                <button class="derive-metadata-btn" title="Fill empty trigger words and SD versions from the training metadata inside the files" style="flex-shrink: 0;">📝 From Files</button>
                                 <button class="toggle-gallery-btn" title="Toggle Gallery" style="margin-left: auto; flex-shrink: 0;">Hide Gallery</button>
                             </div>
                         </div>
@@ -401,6 +465,8 @@ const LocalLoraGalleryRemixNode = {
             const savePresetBtn = widgetContainer.querySelector(".save-preset-btn");
             const loadPresetBtn = widgetContainer.querySelector(".load-preset-btn");
             const presetDropdown = widgetContainer.querySelector(".preset-dropdown");
+            const syncAllBtn = widgetContainer.querySelector(".sync-all-btn");
+            const deriveMetadataBtn = widgetContainer.querySelector(".derive-metadata-btn");
 
             const saveStateAndFetch = () => {
                 const stateToSave = {
@@ -437,6 +503,14 @@ const LocalLoraGalleryRemixNode = {
                     is_collapsed: mainContainer.classList.contains("gallery-collapsed"),
                     lora_stack: serializableData 
                 });
+
+                const warmupNames = serializableData.filter(item => item.on !== false && item.lora).map(item => item.lora);
+                const warmupKey = warmupNames.join("\n");
+                if (warmupKey !== this.lastWarmupKey) {
+                    this.lastWarmupKey = warmupKey;
+                    clearTimeout(this.warmupTimer);
+                    this.warmupTimer = setTimeout(() => LocalLoraGalleryRemixNode.warmupLoras(warmupNames), 500);
+                }
             };
             
             let draggedIndex = -1;
@@ -569,7 +643,7 @@ const LocalLoraGalleryRemixNode = {
                         
                         const mediaContainer = card.querySelector('.locallora-media-container');
                         if (mediaContainer) {
-                            mediaContainer.innerHTML = `<img src="${newUrl}" style="width:100%; height:100%; object-fit:cover;">`;
+                            mediaContainer.innerHTML = `<img src="${LocalLoraGalleryRemixNode.getThumbnailUrl(newUrl)}" style="width:100%; height:100%; object-fit:cover;">`;
                         }
                         
                         if(callback) callback(true, "Success");
@@ -595,7 +669,9 @@ const LocalLoraGalleryRemixNode = {
                         lora_name: loraName,
                         sync_image: syncImage,
                         sync_trigger: syncTrigger,
-                        sync_url: syncUrl
+                        sync_url: syncUrl,
+                        // A sync of one LoRA is an explicit retry, so skip the server's cached "not found".
+                        refresh: true
                     };
 
                     const response = await api.fetchApi("/LocalLoraGalleryRemix/sync_civitai", {
@@ -640,7 +716,7 @@ const LocalLoraGalleryRemixNode = {
                                 card.addEventListener('mouseenter', () => video.play().catch(e => {}));
                                 card.addEventListener('mouseleave', () => { video.pause(); video.currentTime = 0; });
                             } else {
-                                mediaContainer.innerHTML = `<img src="${preview_url}">`;
+                                mediaContainer.innerHTML = `<img src="${LocalLoraGalleryRemixNode.getThumbnailUrl(preview_url)}">`;
                             }
                         }
 
@@ -694,13 +770,16 @@ const LocalLoraGalleryRemixNode = {
                 }
             };
 
-            const renderGallery = (append = false) => {
-                if (!append) galleryEl.innerHTML = "";
-                const nameFilter = searchInput.value.toLowerCase();
-                const lorasToRender = this.availableLoras.filter(lora => lora.name.toLowerCase().includes(nameFilter));
+            const renderGallery = (append = false, replaceNames = null) => {
+                if (!append && !replaceNames) galleryEl.innerHTML = "";
+                // The server returns ranked matches for the fetched term; only narrow locally while a new term is pending.
+                const nameFilter = searchInput.value.trim().toLowerCase();
+                const lorasToRender = nameFilter === this.fetchedSearchTerm ? this.availableLoras : this.availableLoras.filter(lora =>
+                    [lora.name, lora["activation text"], lora.notes, ...(lora.tags || [])].some(text => (text || "").toLowerCase().includes(nameFilter)));
                 const existingCardNames = new Set(Array.from(galleryEl.querySelectorAll('.locallora-lora-card')).map(c => c.dataset.loraName));
 
                 lorasToRender.forEach(lora => {
+                    if (replaceNames && !(replaceNames.has(lora.name) && existingCardNames.has(lora.name))) return;
                     if (append && existingCardNames.has(lora.name)) return;
                     
                     const card = document.createElement("div");
@@ -718,7 +797,7 @@ const LocalLoraGalleryRemixNode = {
                     if (lora.preview_type === 'video' && previewUrl) {
                         mediaHTML = `<video muted loop playsinline src="${previewUrl}"></video>`;
                     } else {
-                        mediaHTML = `<img src="${previewUrl || empty_lora_image}" loading="lazy">`;
+                        mediaHTML = `<img src="${LocalLoraGalleryRemixNode.getThumbnailUrl(previewUrl) || empty_lora_image}" loading="lazy">`;
                     }
                     
                     const linkBtnHTML = lora.download_url ? `<a href="${lora.download_url}" target="_blank" class="card-btn lora-card-link-btn" title="Open download page">🔗</a>` : '';
@@ -738,7 +817,13 @@ const LocalLoraGalleryRemixNode = {
                     if (lora.preview_type !== 'video') {
                         card.querySelector("img").onerror = (e) => { e.target.src = empty_lora_image; };
                     }
-                    galleryEl.appendChild(card);
+                    const replacedCard = replaceNames ? galleryEl.querySelector(`.locallora-lora-card[data-lora-name="${CSS.escape(lora.name)}"]`) : null;
+                    if (replacedCard) {
+                        if (this.selectedCardsForEditing.delete(replacedCard)) this.selectedCardsForEditing.add(card);
+                        replacedCard.replaceWith(card);
+                    } else {
+                        galleryEl.appendChild(card);
+                    }
                     
                     card.querySelector(".lora-card-link-btn")?.addEventListener("click", e => e.stopPropagation());
                     /*card.querySelector(".sync-civitai-btn").addEventListener("click", e => {
@@ -1179,9 +1264,11 @@ const LocalLoraGalleryRemixNode = {
                     folderFilterSelect.value, 
                     pageToFetch, 
                     this.loraData.map(item => item.lora),
-                    currentSearchTerm
+                    currentSearchTerm,
+                    append ? this.nextCursor : null
                 );
 
+                this.fetchedSearchTerm = currentSearchTerm.toLowerCase();
                 if (append) {
                     const existingNames = new Set(this.availableLoras.map(l => l.name));
                     this.availableLoras.push(...(loras || []).filter(l => !existingNames.has(l.name)));
@@ -1191,6 +1278,21 @@ const LocalLoraGalleryRemixNode = {
                     galleryEl.scrollTop = 0;
                 }
                 renderGallery(append);
+                annotateTrainingInfo((loras || []).map(l => l.name));
+            };
+
+            const annotateTrainingInfo = async (loraNames) => {
+                const info = await LocalLoraGalleryRemixNode.getTrainingInfo(loraNames);
+                galleryEl.querySelectorAll('.locallora-lora-card').forEach(card => {
+                    const summary = info[card.dataset.loraName];
+                    if (!summary || summary.error) return;
+                    const lines = [card.dataset.loraName];
+                    if (summary.base_model) lines.push(`Base model: ${summary.base_model}`);
+                    if (summary.network_dim !== null) lines.push(`Dim/Alpha: ${summary.network_dim}/${summary.network_alpha ?? '?'}`);
+                    if (summary.resolution) lines.push(`Resolution: ${summary.resolution}`);
+                    if (summary.tags && summary.tags.length) lines.push(`Training tags: ${summary.tags.slice(0, 10).join(', ')}`);
+                    card.title = lines.join('\n');
+                });
             };
 
             const handleTagSelectionChange = () => {
@@ -1211,7 +1313,8 @@ const LocalLoraGalleryRemixNode = {
                             checkbox.type = 'checkbox';
                             checkbox.value = tag;
                             checkbox.addEventListener('change', handleTagSelectionChange);
-                            label.append(checkbox, ` ${tag}`);
+                            const count = data.counts?.[tag];
+                            label.append(checkbox, count !== undefined ? ` ${tag} (${count})` : ` ${tag}`);
                             multiSelectTagDropdown.appendChild(label);
                         });
                     }
@@ -1326,19 +1429,7 @@ const LocalLoraGalleryRemixNode = {
                     removeEl.textContent = "ⓧ";
                     removeEl.onclick = async (e) => {
                         e.stopPropagation();
-                        const updatePromises = Array.from(this.selectedCardsForEditing).map(async (card) => {
-                            const loraName = card.dataset.loraName;
-                            const tags = card.dataset.tags ? card.dataset.tags.split(',').filter(Boolean) : [];
-                            const newTags = tags.filter(t => t !== tag);
-                            
-                            await LocalLoraGalleryRemixNode.updateMetadata(loraName, { tags: newTags });
-
-                            card.dataset.tags = newTags.join(',');
-                            const loraInDataSource = this.availableLoras.find(lora => lora.name === loraName);
-                            if (loraInDataSource) loraInDataSource.tags = newTags;
-                            renderCardTags(card);
-                        });
-                        await Promise.all(updatePromises);
+                        await applyBatchTagEdit({ op: "remove_tag", tags: [tag] });
                         await loadAllTags();
                         renderMetadataEditor();
                     };
@@ -1360,6 +1451,20 @@ const LocalLoraGalleryRemixNode = {
                 metadataEditor.classList.add("visible");
             };
             
+            const applyBatchTagEdit = async (operation) => {
+                const cards = Array.from(this.selectedCardsForEditing);
+                const results = await LocalLoraGalleryRemixNode.batchUpdateMetadata(cards.map(card => card.dataset.loraName), [operation]);
+                cards.forEach(card => {
+                    const loraName = card.dataset.loraName;
+                    const newTags = results[loraName]?.changed?.tags;
+                    if (!newTags) return;
+                    card.dataset.tags = newTags.join(',');
+                    const loraInDataSource = this.availableLoras.find(lora => lora.name === loraName);
+                    if (loraInDataSource) loraInDataSource.tags = [...newTags];
+                    renderCardTags(card);
+                });
+            };
+
             const renderCardTags = (card) => {
                 const tagContainer = card.querySelector(".lora-card-tags");
                 tagContainer.innerHTML = "";
@@ -1560,20 +1665,7 @@ const LocalLoraGalleryRemixNode = {
                         e.preventDefault();
                         const newTag = tagEditorInput.value.trim();
                         if (newTag) {
-                            const updatePromises = Array.from(this.selectedCardsForEditing).map(async (card) => {
-                                const loraName = card.dataset.loraName;
-                                const tags = card.dataset.tags ? card.dataset.tags.split(',').filter(Boolean) : [];
-                                
-                                if (!tags.includes(newTag)) {
-                                    tags.push(newTag);
-                                    await LocalLoraGalleryRemixNode.updateMetadata(loraName, { tags: tags });
-                                    card.dataset.tags = tags.join(',');
-                                    const loraInDataSource = this.availableLoras.find(lora => lora.name === loraName);
-                                    if (loraInDataSource) loraInDataSource.tags = [...tags];
-                                    renderCardTags(card);
-                                }
-                            });
-                            await Promise.all(updatePromises);
+                            await applyBatchTagEdit({ op: "add_tag", tags: [newTag] });
                             await loadAllTags();
                             renderMetadataEditor();
                             e.target.value = "";
@@ -1629,6 +1721,112 @@ const LocalLoraGalleryRemixNode = {
                     }
                 });
 
+                const renderSyncJob = (job) => {
+                    const running = job && (job.status === 'running' || job.status === 'pending');
+                    syncAllBtn.dataset.running = running ? "true" : "false";
+                    syncAllBtn.textContent = running ? `⏹ ${job.done}/${job.total}` : "☁️ Sync All";
+                    syncAllBtn.title = running ? "Cancel the Civitai sync" : "Sync all LoRAs matching the current filters with Civitai";
+                };
+
+                syncAllBtn.addEventListener("click", async () => {
+                    try {
+                        if (syncAllBtn.dataset.running === "true") {
+                            await api.fetchApi("/LocalLoraGalleryRemix/sync_job/cancel", { method: "POST" });
+                            return;
+                        }
+                        if (!confirm("Sync every LoRA matching the current filters with Civitai?")) return;
+                        const res = await api.fetchApi("/LocalLoraGalleryRemix/sync_job/start", {
+                            method: "POST",
+                            headers: { "Content-Type": "application/json" },
+                            body: JSON.stringify({
+                                filter_tag: tagFilterInput.value,
+                                mode: tagFilterModeBtn.textContent,
+                                folder: folderFilterSelect.value,
+                                name_filter: searchInput.value.trim()
+                            }),
+                        });
+                        const data = await res.json();
+                        if (data.job) renderSyncJob(data.job);
+                        else if (data.message) alert(data.message);
+                    } catch (e) { console.error("LocalLoraGalleryRemix: Failed to control sync job:", e); }
+                });
+
+                this.apiListeners = [];
+                const listenToApi = (type, handler) => {
+                    api.addEventListener(type, handler);
+                    this.apiListeners.push([type, handler]);
+                };
+
+                listenToApi("lora_gallery.sync_job", ({ detail }) => {
+                    const wasRunning = syncAllBtn.dataset.running === "true";
+                    renderSyncJob(detail);
+                    if (wasRunning && syncAllBtn.dataset.running !== "true") {
+                        fetchAndRender(false);
+                        loadAllTags();
+                    }
+                });
+
+                deriveMetadataBtn.addEventListener("click", async () => {
+                    if (!confirm("Fill empty trigger words and SD versions of every LoRA matching the current filters from their embedded training metadata?")) return;
+                    deriveMetadataBtn.disabled = true;
+                    try {
+                        const res = await api.fetchApi("/LocalLoraGalleryRemix/derive_metadata", {
+                            method: "POST",
+                            headers: { "Content-Type": "application/json" },
+                            body: JSON.stringify({
+                                action: "fill",
+                                filter_tag: tagFilterInput.value,
+                                mode: tagFilterModeBtn.textContent,
+                                folder: folderFilterSelect.value,
+                                name_filter: searchInput.value.trim()
+                            }),
+                        });
+                        const data = await res.json();
+                        if (data.status !== "ok") throw new Error(data.message || "Failed to derive metadata");
+                        alert(`Updated ${data.updated} of ${data.total} LoRAs.`);
+                        if (data.updated) fetchAndRender(false);
+                    } catch (e) {
+                        console.error("LocalLoraGalleryRemix: Failed to derive metadata:", e);
+                        alert(e.message);
+                    } finally {
+                        deriveMetadataBtn.disabled = false;
+                    }
+                });
+
+                const refreshForNewLoras = debounce(() => { fetchAndRender(false); loadAllTags(); }, 1000);
+                const reloadTags = debounce(() => loadAllTags(), 1000);
+
+                listenToApi("lora_gallery.catalog_changed", ({ detail }) => {
+                    if (detail.reload || detail.added.length) {
+                        refreshForNewLoras();
+                        return;
+                    }
+
+                    detail.removed.forEach(name => {
+                        this.availableLoras = this.availableLoras.filter(l => l.name !== name);
+                        const card = galleryEl.querySelector(`.locallora-lora-card[data-lora-name="${CSS.escape(name)}"]`);
+                        if (card) {
+                            this.selectedCardsForEditing.delete(card);
+                            card.remove();
+                        }
+                    });
+
+                    const changedNames = new Set();
+                    detail.updated.forEach(info => {
+                        const index = this.availableLoras.findIndex(l => l.name === info.name);
+                        if (index === -1 || JSON.stringify(this.availableLoras[index]) === JSON.stringify(info)) return;
+                        this.availableLoras[index] = info;
+                        changedNames.add(info.name);
+                    });
+                    if (changedNames.size) renderGallery(false, changedNames);
+                    if (detail.removed.length || changedNames.size) reloadTags();
+                });
+
+                api.fetchApi("/LocalLoraGalleryRemix/sync_job/status")
+                    .then(res => res.json())
+                    .then(data => renderSyncJob(data.job))
+                    .catch(() => {});
+
                 loadPresetBtn.addEventListener("click", (e) => {
                     e.stopPropagation();
                     presetDropdown.style.display = presetDropdown.style.display === 'block' ? 'none' : 'block';
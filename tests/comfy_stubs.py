@@ -0,0 +1,109 @@
+"""
+Stand-in folder_paths, server and nodes modules for importing the gallery outside ComfyUI, plus
+helpers that write LoRA files and load a scratch copy of the gallery module.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import struct
+import sys
+import types
+
+from aiohttp import web
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeModel:
+    """Stands in for a ComfyUI ModelPatcher/CLIP; the gallery only needs identity, weakrefs and parent."""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+
+
+def install_stub_modules(lora_root):
+    """Registers minimal folder_paths, server and nodes modules serving LoRAs from lora_root.
+
+    Websocket messages sent through PromptServer.instance.send_sync are kept in its sent list.
+    """
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.supported_pt_extensions = {".safetensors"}
+    folder_paths.get_folder_paths = lambda kind: [lora_root]
+
+    def get_filename_list(kind):
+        names = []
+        for dirpath, _, files in os.walk(lora_root):
+            names.extend(os.path.relpath(os.path.join(dirpath, f), lora_root)
+                         for f in files if f.endswith(".safetensors"))
+        return sorted(names)
+
+    def get_full_path(kind, name):
+        path = os.path.join(lora_root, name)
+        return path if os.path.isfile(path) else None
+
+    folder_paths.get_filename_list = get_filename_list
+    folder_paths.get_full_path = get_full_path
+    folder_paths.get_output_directory = lambda: lora_root
+    folder_paths.get_temp_directory = lambda: lora_root
+
+    server = types.ModuleType("server")
+
+    class PromptServer:
+        instance = None
+
+        def __init__(self):
+            self.routes = web.RouteTableDef()
+            self.app = web.Application()
+            self.sent = []
+
+        def send_sync(self, event, data, sid=None):
+            self.sent.append((event, data))
+
+    PromptServer.instance = PromptServer()
+    server.PromptServer = PromptServer
+
+    nodes = types.ModuleType("nodes")
+
+    class LoraLoader:
+        def __init__(self):
+            self.loaded_lora = None
+
+        def load_lora(self, model, clip, lora_name, strength_model, strength_clip):
+            return FakeModel(model), FakeModel(clip)
+
+    class LoraLoaderModelOnly(LoraLoader):
+        def load_lora_model_only(self, model, lora_name, strength_model):
+            return (FakeModel(model),)
+
+    nodes.LoraLoader = LoraLoader
+    nodes.LoraLoaderModelOnly = LoraLoaderModelOnly
+    nodes.NODE_CLASS_MAPPINGS = {}
+
+    sys.modules.update({"folder_paths": folder_paths, "server": server, "nodes": nodes})
+    return server
+
+
+def write_lora(lora_root, name, meta=None, training_metadata=None):
+    """Writes a small .safetensors file (with an optional __metadata__ header) and, if meta is
+    given, its JSON sidecar. Returns the LoRA's full path."""
+    path = os.path.join(lora_root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = json.dumps({"__metadata__": training_metadata or {}}).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)) + header + b"\0" * 16)
+    if meta is not None:
+        with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    return path
+
+
+def load_gallery_module(work_dir):
+    """Imports a copy of the gallery module so its caches and state files live in work_dir."""
+    module_path = os.path.join(work_dir, "Local_Lora_Gallery.py")
+    shutil.copy(os.path.join(REPO_DIR, "Local_Lora_Gallery.py"), module_path)
+    spec = importlib.util.spec_from_file_location("Local_Lora_Gallery", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,43 @@
+import asyncio
+import tempfile
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+import comfy_stubs
+
+# The repository root is itself the ComfyUI package, which pytest imports before any test runs,
+# so the stand-in ComfyUI modules have to be registered first.
+comfy_stubs.install_stub_modules(tempfile.mkdtemp(prefix="lora_gallery_tests_"))
+
+
+@pytest.fixture
+def lora_root(tmp_path):
+    root = tmp_path / "loras"
+    root.mkdir()
+    return str(root)
+
+
+@pytest.fixture
+def gallery(tmp_path, lora_root):
+    """A fresh copy of the gallery module whose LoRA folder is lora_root."""
+    comfy_stubs.install_stub_modules(lora_root)
+    return comfy_stubs.load_gallery_module(str(tmp_path))
+
+
+@pytest.fixture
+def request_routes(gallery):
+    """Runs a coroutine function client -> result against the gallery's routes.
+
+    Each run gets its own application, since one is bound to the event loop that first served it.
+    """
+    def run(scenario):
+        app = web.Application()
+        app.add_routes(gallery.server.PromptServer.instance.routes)
+
+        async def main():
+            async with TestClient(TestServer(app)) as client:
+                return await scenario(client)
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def catalog(gallery, lora_root, monkeypatch):
+    comfy_stubs.write_lora(lora_root, "root.safetensors", meta={"tags": ["style"]})
+    comfy_stubs.write_lora(lora_root, os.path.join("chars", "hero.safetensors"))
+    monkeypatch.setattr(gallery, "CATALOG_REVALIDATE_INTERVAL", 0.0)
+    gallery.lora_catalog.ensure_fresh(force=True)
+    return gallery.lora_catalog
+
+
+def names(catalog):
+    return sorted(entry["name"] for entry in catalog.entries())
+
+
+def test_entries_and_folders_come_from_one_scan(catalog):
+    assert names(catalog) == [os.path.join("chars", "hero.safetensors"), "root.safetensors"]
+    assert catalog.folders() == [".", "chars"]
+    entry = catalog.get("root.safetensors")
+    assert entry["tags"] == ["style"] and entry["folder"] == "."
+
+
+def test_unchanged_directories_are_not_rescanned(gallery, catalog, monkeypatch):
+    generation = catalog.generation
+    monkeypatch.setattr(gallery.folder_paths, "get_filename_list",
+                        lambda kind: pytest.fail("the LoRA folders were rescanned"))
+
+    catalog.ensure_fresh()
+
+    assert catalog.generation == generation
+    assert len(catalog.entries()) == 2
+
+
+def test_only_changed_directories_are_rebuilt(gallery, catalog, lora_root, monkeypatch):
+    hero = catalog.get(os.path.join("chars", "hero.safetensors"))
+    generation = catalog.generation
+    comfy_stubs.write_lora(lora_root, "new.safetensors")
+
+    catalog.ensure_fresh()
+
+    assert "new.safetensors" in names(catalog)
+    assert catalog.get(os.path.join("chars", "hero.safetensors")) is hero
+    assert catalog.generation == generation + 1
+    assert catalog.changes_since(generation) == ({"new.safetensors"}, set(), set())
+
+
+def test_removed_loras_leave_the_catalog_and_tag_index(catalog, lora_root):
+    os.remove(os.path.join(lora_root, "root.safetensors"))
+
+    catalog.ensure_fresh()
+
+    assert names(catalog) == [os.path.join("chars", "hero.safetensors")]
+    assert catalog.names_with_tags(["style"]) == set()
+
+
+@pytest.fixture
+def tagged(gallery, lora_root, monkeypatch):
+    comfy_stubs.write_lora(lora_root, "a.safetensors", meta={"tags": ["Style", "anime"]})
+    comfy_stubs.write_lora(lora_root, "b.safetensors", meta={"tags": ["style", "Style", "photo"]})
+    comfy_stubs.write_lora(lora_root, "c.safetensors", meta={"tags": "not a list"})
+    monkeypatch.setattr(gallery, "CATALOG_REVALIDATE_INTERVAL", 0.0)
+    gallery.lora_catalog.ensure_fresh(force=True)
+    return gallery.lora_catalog
+
+
+def test_tag_index_answers_and_or_filters_case_insensitively(tagged):
+    assert tagged.names_with_tags(["style"], "OR") == {"a.safetensors", "b.safetensors"}
+    assert tagged.names_with_tags(["style", "photo"], "AND") == {"b.safetensors"}
+    assert tagged.names_with_tags(["anime", "photo"], "OR") == {"a.safetensors", "b.safetensors"}
+    assert tagged.names_with_tags(["anime", "photo"], "AND") == set()
+    assert tagged.tag_counts() == [("anime", 1), ("photo", 1), ("Style", 2)]
+
+
+def test_tag_index_follows_metadata_edits(gallery, tagged):
+    gallery.save_lora_metadata("a.safetensors", {"tags": ["photo"]})
+
+    assert tagged.names_with_tags(["style"]) == {"b.safetensors"}
+    assert tagged.names_with_tags(["photo"]) == {"a.safetensors", "b.safetensors"}
+    assert dict(tagged.tag_counts()) == {"photo": 2, "Style": 1}
+
+
+def test_get_all_tags_returns_counts(tagged, request_routes):
+    async def scenario(client):
+        response = await client.get("/LocalLoraGalleryRemix/get_all_tags")
+        return await response.json()
+
+    assert request_routes(scenario) == {"tags": ["anime", "photo", "Style"],
+                                        "counts": {"anime": 1, "photo": 1, "Style": 2}}
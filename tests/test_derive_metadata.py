@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+import comfy_stubs
+
+TAG_FREQUENCY = json.dumps({
+    "10_hero": {"hero": 40, "red cape": 25, "smile": 5},
+    "5_city": {"hero": 10, "city": 30},
+})
+
+
+@pytest.fixture
+def library(gallery, lora_root):
+    training = {"ss_tag_frequency": TAG_FREQUENCY, "ss_base_model_version": "sdxl_base_v1-0"}
+    comfy_stubs.write_lora(lora_root, "empty.safetensors", meta={"sd version": "Unknown"}, training_metadata=training)
+    comfy_stubs.write_lora(lora_root, "filled.safetensors", meta={"activation text": "mine"}, training_metadata=training)
+    comfy_stubs.write_lora(lora_root, "plain.safetensors")
+    gallery.lora_catalog.ensure_fresh(force=True)
+    return gallery.lora_catalog
+
+
+def derive(request_routes, **body):
+    async def scenario(client):
+        response = await client.post("/LocalLoraGalleryRemix/derive_metadata", json=body)
+        return response.status, await response.json()
+    return request_routes(scenario)
+
+
+def test_suggestions_come_from_the_summed_tag_frequency(gallery, library):
+    assert gallery.derive_lora_metadata("empty.safetensors") == {
+        "activation text": "hero, city, red cape", "sd version": "SDXL"}
+    assert gallery.derive_lora_metadata("empty.safetensors", top_n=1)["activation text"] == "hero"
+    assert gallery.derive_lora_metadata("plain.safetensors") == {}
+    assert gallery.derive_lora_metadata("missing.safetensors") is None
+
+
+def test_suggest_writes_nothing(gallery, library, request_routes):
+    status, body = derive(request_routes, action="suggest")
+
+    assert status == 200
+    assert (body["total"], body["with_suggestions"], body["updated"]) == (3, 2, 0)
+    assert gallery.load_lora_metadata("empty.safetensors") == {"sd version": "Unknown"}
+
+
+def test_fill_only_writes_empty_fields_in_one_catalog_change(gallery, library, request_routes):
+    generation = library.generation
+
+    status, body = derive(request_routes, action="fill")
+
+    assert status == 200 and body["updated"] == 2
+    assert body["results"]["empty.safetensors"]["applied"] == ["activation text", "sd version"]
+    assert body["results"]["filled.safetensors"]["applied"] == ["sd version"]
+    assert gallery.load_lora_metadata("filled.safetensors")["activation text"] == "mine"
+    assert library.get("empty.safetensors")["meta"]["sd version"] == "SDXL"
+    assert library.generation == generation + 1
+
+
+def test_fill_with_overwrite_replaces_existing_fields(gallery, library, request_routes):
+    derive(request_routes, action="fill", overwrite=True, lora_names=["filled.safetensors"])
+
+    assert gallery.load_lora_metadata("filled.safetensors")["activation text"] == "hero, city, red cape"
+
+
+@pytest.mark.parametrize("body", [{"action": "delete"}, {"action": "fill", "top_n": "many"}])
+def test_bad_requests_are_rejected(library, request_routes, body):
+    status, _ = derive(request_routes, **body)
+    assert status == 400
@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def store(gallery, tmp_path):
+    return gallery.LoraHashStore(str(tmp_path / "hashes.db"))
+
+
+def paths_in(store):
+    with store._lock:
+        return {path for (path,) in store._connect().execute("SELECT path FROM hashes")}
+
+
+def test_a_miss_computes_the_fingerprint_once(gallery, store, lora_root, monkeypatch):
+    path = comfy_stubs.write_lora(lora_root, "a.safetensors")
+    fingerprints = []
+    quick_fingerprint = gallery.calculate_quick_fingerprint
+    monkeypatch.setattr(gallery, "calculate_quick_fingerprint",
+                        lambda *args: (fingerprints.append(args), quick_fingerprint(*args))[1])
+
+    with open(path, "rb") as f:
+        assert store.get_sha256(path) == hashlib.sha256(f.read()).hexdigest()
+    assert len(fingerprints) == 1
+
+
+def test_a_renamed_file_moves_its_row(store, lora_root):
+    path = comfy_stubs.write_lora(lora_root, "old.safetensors")
+    sha256 = store.get_sha256(path)
+    renamed = os.path.join(lora_root, "new.safetensors")
+    os.rename(path, renamed)
+
+    assert store.lookup(renamed) == sha256
+    assert paths_in(store) == {renamed}
+
+
+def test_prune_drops_deleted_files_but_keeps_likely_renames(store, lora_root):
+    kept = comfy_stubs.write_lora(lora_root, "kept.safetensors")
+    deleted = comfy_stubs.write_lora(lora_root, "deleted.safetensors", training_metadata={"a": "1"})
+    renamed = comfy_stubs.write_lora(lora_root, "renamed.safetensors", training_metadata={"b": "2"})
+    for path in (kept, deleted, renamed):
+        store.get_sha256(path)
+    new_path = os.path.join(lora_root, "moved.safetensors")
+    os.rename(renamed, new_path)
+    os.remove(deleted)
+
+    assert store.prune([deleted, renamed], [new_path]) == 1
+    assert paths_in(store) == {kept, renamed}
+
+
+def test_catalog_rebuild_prunes_removed_loras(gallery, lora_root, tmp_path, monkeypatch):
+    store = gallery.LoraHashStore(str(tmp_path / "hashes.db"))
+    monkeypatch.setattr(gallery, "lora_hash_store", store)
+    path = comfy_stubs.write_lora(lora_root, "gone.safetensors")
+    store.get_sha256(path)
+    gallery.lora_catalog.ensure_fresh(force=True)
+
+    os.remove(path)
+    gallery.lora_catalog.ensure_fresh(force=True)
+
+    assert paths_in(store) == set()
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def library(gallery, lora_root):
+    comfy_stubs.write_lora(lora_root, "card.safetensors", meta={"tags": ["old"]})
+    with open(os.path.join(lora_root, "card.png"), "wb") as f:
+        f.write(b"not really a png")
+    gallery.lora_catalog.ensure_fresh(force=True)
+    return gallery.lora_catalog
+
+
+def test_listing_revalidates_with_etag_until_the_catalog_changes(gallery, library, request_routes):
+    async def scenario(client):
+        first = await client.get("/LocalLoraGalleryRemix/get_loras")
+        etag = first.headers["ETag"]
+        unchanged = await client.get("/LocalLoraGalleryRemix/get_loras", headers={"If-None-Match": etag})
+        other_query = await client.get("/LocalLoraGalleryRemix/get_loras?per_page=10",
+                                       headers={"If-None-Match": etag})
+        gallery.save_lora_metadata("card.safetensors", {"tags": ["new"]})
+        changed = await client.get("/LocalLoraGalleryRemix/get_loras", headers={"If-None-Match": etag})
+        return first, unchanged, other_query, changed, await changed.json()
+
+    first, unchanged, other_query, changed, body = request_routes(scenario)
+
+    assert first.status == 200 and first.headers["Cache-Control"] == "no-cache"
+    assert unchanged.status == 304 and unchanged.headers["ETag"] == first.headers["ETag"]
+    assert other_query.status == 200
+    assert changed.status == 200 and changed.headers["ETag"] != first.headers["ETag"]
+    assert body["loras"][0]["tags"] == ["new"]
+
+
+def test_preview_validators_and_immutable_versioned_urls(library, request_routes):
+    preview_url = library.get("card.safetensors")["preview_url"]
+    assert "&v=" in preview_url
+    unversioned_url = preview_url.split("&v=")[0]
+
+    async def scenario(client):
+        versioned = await client.get(preview_url)
+        unversioned = await client.get(unversioned_url)
+        by_etag = await client.get(preview_url, headers={"If-None-Match": versioned.headers["ETag"]})
+        by_date = await client.get(preview_url, headers={"If-Modified-Since": versioned.headers["Last-Modified"]})
+        stale = await client.get(preview_url, headers={"If-None-Match": '"something-else"'})
+        return versioned, unversioned, by_etag, by_date, stale
+
+    versioned, unversioned, by_etag, by_date, stale = request_routes(scenario)
+
+    assert versioned.status == 200
+    assert versioned.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert unversioned.headers["Cache-Control"] == "no-cache"
+    assert by_etag.status == 304 and by_date.status == 304
+    assert stale.status == 200
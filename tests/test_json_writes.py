@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+
+import pytest
+
+
+def test_batched_writes_share_directory_syncs_and_keep_every_edit(gallery, tmp_path, monkeypatch):
+    synced_files, dir_syncs = [], []
+    sync_files, sync_dirs = gallery._sync_files, gallery._sync_dirs
+    monkeypatch.setattr(gallery, "JSON_FSYNC_MODE", "batch")
+    monkeypatch.setattr(gallery, "_sync_files", lambda paths: (synced_files.extend(paths), sync_files(paths)))
+    monkeypatch.setattr(gallery, "_sync_dirs", lambda paths: (dir_syncs.append(paths), sync_dirs(paths)))
+    monkeypatch.setattr(gallery.os, "sync", lambda: pytest.fail("the whole filesystem was synced"))
+
+    paths = [str(tmp_path / f"{i}.json") for i in range(8)]
+    barrier = threading.Barrier(16)
+
+    def work(worker):
+        barrier.wait()
+        for k in range(worker, 64, 16):
+            path = paths[k % len(paths)]
+            with gallery.sidecar_lock(path):
+                current = dict(gallery.load_json_file(path, {}))
+                current[str(k)] = k
+                assert gallery.save_json_file(current, path)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(len(json.load(open(path))) for path in paths) == 64
+    # Only the batch's own temp files are fsynced, and the folder once per batch.
+    assert len(synced_files) == 64 and all(path.endswith(".tmp") for path in synced_files)
+    assert sum(len(paths) for paths in dir_syncs) == 64
+    assert len(dir_syncs) < 64
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def test_commit_needs_no_thread(gallery, tmp_path, monkeypatch):
+    monkeypatch.setattr(gallery, "JSON_FSYNC_MODE", "batch")
+
+    def no_threads(*args, **kwargs):
+        raise RuntimeError("can't create new thread at interpreter shutdown")
+    monkeypatch.setattr(threading.Thread, "start", no_threads)
+
+    path = str(tmp_path / "state.json")
+    assert gallery.save_json_file({"a": 1}, path)
+    assert json.load(open(path)) == {"a": 1}
+
+
+def test_flush_state_stores_continues_after_a_failing_store(gallery, tmp_path, monkeypatch):
+    failing = gallery.JsonStateStore(str(tmp_path / "missing" / "ui_state.json"))
+    presets = gallery.JsonStateStore(str(tmp_path / "presets.json"))
+    failing.set("node", {"is_collapsed": True})
+    presets.set("preset", [])
+    monkeypatch.setattr(gallery, "ui_state_store", failing)
+    monkeypatch.setattr(gallery, "presets_store", presets)
+    monkeypatch.setattr(threading.Timer, "start", lambda self: (_ for _ in ()).throw(RuntimeError("shutdown")))
+
+    gallery.flush_state_stores()
+
+    assert json.load(open(presets.file_path)) == {"preset": []}
+    assert failing._dirty and failing._timer is None
@@ -0,0 +1,50 @@
+import os
+
+import comfy_stubs
+
+
+def touch(path, mtime):
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_poll_stats_directories_and_sweeps_in_place_edits(gallery, lora_root, monkeypatch):
+    path = comfy_stubs.write_lora(lora_root, "style.safetensors", meta={"tags": ["old"]})
+    preview = os.path.splitext(path)[0] + ".png"
+    with open(preview, "wb") as f:
+        f.write(b"png")
+    catalog = gallery.lora_catalog
+    catalog.ensure_fresh(force=True)
+    watcher = gallery.LoraLibraryWatcher(catalog)
+    preview_url = catalog.get("style.safetensors")["preview_url"]
+
+    # Rewrite the preview in place: the folder mtime stays put.
+    dir_mtime = os.stat(lora_root).st_mtime_ns
+    with open(preview, "wb") as f:
+        f.write(b"new png")
+    touch(preview, os.stat(preview).st_mtime_ns + 10**9)
+    touch(lora_root, dir_mtime)
+
+    stats = []
+    get_mtime = gallery._get_mtime
+    monkeypatch.setattr(gallery, "_get_mtime", lambda p: (stats.append(p), get_mtime(p))[1])
+    monkeypatch.setattr(catalog, "_last_validated", 0.0)
+    assert not watcher._poll(sweep=False)
+    assert stats == [os.path.normpath(lora_root)]
+    assert catalog.get("style.safetensors")["preview_url"] == preview_url
+
+    assert watcher._poll(sweep=True)
+    assert catalog.get("style.safetensors")["preview_url"] != preview_url
+
+
+def test_dotted_folders_are_rescanned_as_directories(gallery, lora_root, monkeypatch):
+    catalog = gallery.lora_catalog
+    catalog.ensure_fresh(force=True)
+    comfy_stubs.write_lora(lora_root, os.path.join("sd1.5", "a.safetensors"))
+    rescans = []
+    ensure_fresh = catalog.ensure_fresh
+    monkeypatch.setattr(catalog, "ensure_fresh", lambda force=False: (rescans.append(force), ensure_fresh(force))[1])
+
+    gallery.LoraLibraryWatcher(catalog)._process({os.path.join(lora_root, "sd1.5")})
+
+    assert rescans == [True]
+    assert catalog.get(os.path.join("sd1.5", "a.safetensors")) is not None
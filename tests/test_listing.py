@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def library(gallery, lora_root, monkeypatch):
+    for i in range(5):
+        comfy_stubs.write_lora(lora_root, f"lora_{i}.safetensors", meta={"tags": ["keep"] if i % 2 == 0 else []})
+    monkeypatch.setattr(gallery, "CATALOG_REVALIDATE_INTERVAL", 0.0)
+    gallery.lora_catalog.ensure_fresh(force=True)
+    return gallery.lora_catalog
+
+
+def get_loras(request_routes, **params):
+    async def scenario(client):
+        response = await client.get("/LocalLoraGalleryRemix/get_loras", params=params)
+        return response.status, await response.json()
+    return request_routes(scenario)
+
+
+def test_cursor_pages_stay_on_their_snapshot(library, lora_root, request_routes):
+    _, first = get_loras(request_routes, per_page="2", fields="name")
+    assert [card["name"] for card in first["loras"]] == ["lora_0.safetensors", "lora_1.safetensors"]
+    assert first["loras"][0] == {"name": "lora_0.safetensors"}
+
+    # A LoRA sorting first is added between pages; the cursor continues the old ordering.
+    comfy_stubs.write_lora(lora_root, "a_new.safetensors")
+    _, second = get_loras(request_routes, per_page="2", cursor=first["next_cursor"])
+    assert [card["name"] for card in second["loras"]] == ["lora_2.safetensors", "lora_3.safetensors"]
+    assert second["snapshot"] == first["snapshot"] and second["total"] == 5
+
+    _, fresh = get_loras(request_routes, per_page="2")
+    assert fresh["total"] == 6 and fresh["loras"][0]["name"] == "a_new.safetensors"
+
+
+def test_since_returns_only_the_changes_for_the_filter(gallery, library, lora_root, request_routes):
+    _, listing = get_loras(request_routes, filter_tag="keep")
+    generation = listing["generation"]
+
+    comfy_stubs.write_lora(lora_root, "lora_5.safetensors", meta={"tags": ["keep"]})
+    gallery.lora_catalog.ensure_fresh()
+    gallery.save_lora_metadata("lora_0.safetensors", {"tags": []})
+    gallery.save_lora_metadata("lora_2.safetensors", {"notes": "edited"})
+    os.remove(os.path.join(lora_root, "lora_4.safetensors"))
+
+    _, delta = get_loras(request_routes, filter_tag="keep", since=str(generation), epoch=listing["epoch"])
+
+    assert not delta["reset"]
+    assert [card["name"] for card in delta["added"]] == ["lora_5.safetensors"]
+    assert [card["name"] for card in delta["updated"]] == ["lora_2.safetensors"]
+    assert sorted(delta["removed"]) == ["lora_0.safetensors", "lora_4.safetensors"]
+
+
+def test_since_from_another_server_run_asks_for_a_reload(library, request_routes):
+    _, listing = get_loras(request_routes)
+
+    _, delta = get_loras(request_routes, since=str(listing["generation"]), epoch="other-run")
+
+    assert delta["reset"] and delta["added"] == [] and delta["removed"] == []
+
+
+@pytest.mark.parametrize("params", [{"cursor": "!!!"}, {"since": "yesterday"}, {"fields": "name,secret"}])
+def test_bad_listing_parameters_are_rejected(library, request_routes, params):
+    status, _ = get_loras(request_routes, **params)
+    assert status == 400
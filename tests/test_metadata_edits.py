@@ -0,0 +1,105 @@
+import os
+import threading
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def lora(gallery, lora_root):
+    path = comfy_stubs.write_lora(lora_root, "edit.safetensors", meta={"tags": ["old"]})
+    return "edit.safetensors", os.path.splitext(path)[0] + ".json"
+
+
+def lock_is_free(lock):
+    """Tries the lock from another thread, since an RLock is always re-entrant for its owner."""
+    result = []
+
+    def attempt():
+        if lock.acquire(blocking=False):
+            lock.release()
+            result.append(True)
+        else:
+            result.append(False)
+
+    thread = threading.Thread(target=attempt)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_catalog_is_updated_under_the_sidecar_lock_with_the_written_mtime(gallery, lora, monkeypatch):
+    name, json_path = lora
+    gallery.lora_catalog.ensure_fresh(force=True)
+    lock = gallery.sidecar_lock(json_path)
+    update_metadata = gallery.lora_catalog.update_metadata
+    seen = []
+
+    def checked_update(lora_name, meta, json_mtime=None):
+        seen.append((lock_is_free(lock), json_mtime))
+        update_metadata(lora_name, meta, json_mtime)
+
+    monkeypatch.setattr(gallery.lora_catalog, "update_metadata", checked_update)
+    gallery.edit_lora_metadata(name, lambda current: {"tags": current["tags"] + ["new"]})
+
+    assert seen == [(False, gallery._get_mtime(json_path))]
+    entry = gallery.lora_catalog.get(name)
+    assert entry["meta"]["tags"] == ["old", "new"]
+    assert entry["json_mtime"] == gallery._get_mtime(json_path)
+
+
+def test_batch_update_is_one_catalog_change(gallery, lora_root, request_routes):
+    names = [f"batch_{i}.safetensors" for i in range(gallery.BATCH_UPDATE_SIZE + 5)]
+    for name in names:
+        comfy_stubs.write_lora(lora_root, name, meta={"tags": ["old"]})
+    gallery.lora_catalog.ensure_fresh(force=True)
+    generation = gallery.lora_catalog.generation
+    sent = gallery.server.PromptServer.instance.sent
+
+    async def scenario(client):
+        response = await client.post("/LocalLoraGalleryRemix/batch_update_metadata", json={
+            "lora_names": names + ["missing.safetensors"],
+            "operations": [{"op": "add_tag", "tags": ["new"]}, {"op": "remove_tag", "tags": ["old"]}],
+        })
+        return response.status, await response.json()
+
+    status, body = request_routes(scenario)
+
+    assert status == 200
+    assert (body["updated"], body["unchanged"], body["errors"]) == (len(names), 0, 1)
+    assert body["results"][names[0]]["changed"] == {"tags": ["new"]}
+    assert gallery.lora_catalog.generation == generation + 1
+    events = [data for event, data in sent if event == "lora_gallery.catalog_changed"]
+    assert len(events) == 1
+    assert {card["name"] for card in events[0]["updated"]} == set(names)
+    assert all(gallery.lora_catalog.get(name)["tags"] == ["new"] for name in names)
+    assert gallery.load_lora_metadata(names[0])["tags"] == ["new"]
+
+
+def test_batch_dry_run_changes_nothing(gallery, lora_root, request_routes):
+    path = comfy_stubs.write_lora(lora_root, "dry.safetensors", meta={"tags": ["old"]})
+    gallery.lora_catalog.ensure_fresh(force=True)
+    generation = gallery.lora_catalog.generation
+
+    async def scenario(client):
+        response = await client.post("/LocalLoraGalleryRemix/batch_update_metadata", json={
+            "lora_names": ["dry.safetensors"], "operations": [{"op": "add_tag", "tags": ["new"]}], "dry_run": True,
+        })
+        return await response.json()
+
+    body = request_routes(scenario)
+
+    assert body["updated"] == 1 and body["dry_run"]
+    assert gallery.lora_catalog.generation == generation
+    assert gallery.load_json_file(os.path.splitext(path)[0] + ".json", {}) == {"tags": ["old"]}
+
+
+def test_batch_rejects_bad_operations(gallery, request_routes):
+    async def scenario(client):
+        response = await client.post("/LocalLoraGalleryRemix/batch_update_metadata", json={
+            "lora_names": ["x.safetensors"], "operations": [{"op": "explode"}],
+        })
+        return response.status
+
+    assert request_routes(scenario) == 400
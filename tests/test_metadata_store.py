@@ -0,0 +1,61 @@
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+import comfy_stubs
+
+
+@pytest.fixture
+def store(gallery, tmp_path, monkeypatch):
+    store = gallery.LoraMetadataStore(str(tmp_path / "metadata.db"), flush_delay=3600)
+    monkeypatch.setattr(gallery, "metadata_store", store)
+    return store
+
+
+@pytest.fixture
+def lora(gallery, lora_root):
+    path = comfy_stubs.write_lora(lora_root, "store.safetensors", meta={"tags": ["old"]})
+    return "store.safetensors", os.path.splitext(path)[0] + ".json"
+
+
+def read_sidecar(json_path):
+    with open(json_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_deferred_edit_goes_to_the_store_and_is_exported(gallery, store, lora):
+    name, json_path = lora
+    gallery.edit_lora_metadata(name, lambda current: {"tags": current["tags"] + ["new"]}, deferred=True)
+
+    assert read_sidecar(json_path) == {"tags": ["old"]}
+    assert gallery.load_lora_metadata(name)["tags"] == ["old", "new"]
+    assert store.stats()["dirty"] == 1
+
+    assert store.export_dirty() == 1
+    assert read_sidecar(json_path) == {"tags": ["old", "new"]}
+    assert store.stats()["dirty"] == 0
+
+
+def test_external_edits_are_reloaded_exported_and_not_overwritten(gallery, store, lora):
+    name, json_path = lora
+    gallery.lora_metadata_cache.load_path(json_path)
+    store.flush()
+
+    conn = sqlite3.connect(store.db_path)
+    with conn:
+        conn.execute("UPDATE metadata SET meta = ?, dirty = 1, updated_at = ? WHERE json_path = ?",
+                     (json.dumps({"tags": ["external"]}), time.time() + 60, json_path))
+    conn.close()
+
+    # An older in-process row must not replace the newer external one.
+    store.put(json_path, {"tags": ["stale"]}, gallery._get_mtime(json_path))
+    store.flush()
+    store.refresh(force=True)
+
+    assert store.get(json_path, gallery._get_mtime(json_path)) == {"tags": ["external"]}
+    assert store.query(tags=["external"]) == [json_path]
+    assert store.export_dirty() == 1
+    assert read_sidecar(json_path) == {"tags": ["external"]}
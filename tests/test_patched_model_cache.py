@@ -0,0 +1,44 @@
+import gc
+import weakref
+
+import comfy_stubs
+
+
+def make_key(model, name, size=1024):
+    return ("none", id(model), None, ((name, 1.0, 1.0),), ((size, 1),))
+
+
+def test_a_least_recently_used_base_model_is_released(gallery):
+    cache = gallery.PatchedModelCache(max_bases=1)
+    old_base = comfy_stubs.FakeModel()
+    for name in ("a", "b"):
+        cache.put(make_key(old_base, name), old_base, None, (comfy_stubs.FakeModel(old_base),))
+    old_ref = weakref.ref(old_base)
+    del old_base
+
+    new_base = comfy_stubs.FakeModel()
+    cache.put(make_key(new_base, "a"), new_base, None, (comfy_stubs.FakeModel(new_base),))
+    gc.collect()
+
+    assert old_ref() is None
+    assert cache.stats()["entries"] == 1
+    assert cache.get(make_key(new_base, "a"), new_base, None) is not None
+
+
+def test_nodes_on_different_base_models_keep_their_entries(gallery):
+    cache = gallery.PatchedModelCache(max_bases=2)
+    first, second, third = comfy_stubs.FakeModel(), comfy_stubs.FakeModel(), comfy_stubs.FakeModel()
+    for _ in range(2):
+        for base in (first, second):
+            key = make_key(base, "a")
+            if cache.get(key, base, None) is None:
+                cache.put(key, base, None, (comfy_stubs.FakeModel(base),))
+    assert cache.stats()["hits"] == 2
+
+    # first was used more recently than second, so a third base displaces second.
+    cache.get(make_key(first, "a"), first, None)
+    cache.put(make_key(third, "a"), third, None, (comfy_stubs.FakeModel(third),))
+
+    assert cache.get(make_key(first, "a"), first, None) is not None
+    assert cache.get(make_key(second, "a"), second, None) is None
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def previews(gallery):
+    return gallery.PreviewDirectoryCache()
+
+
+def touch(directory, *names):
+    for name in names:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(b"x")
+
+
+def test_one_scandir_per_directory_finds_every_basename(gallery, previews, tmp_path, monkeypatch):
+    touch(tmp_path, "a.mp4", "a.png", "a.jpg", "b.webp", "b.json", "c.safetensors")
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(gallery.os, "scandir", lambda path: (scans.append(path), scandir(path))[1])
+
+    assert previews.list_previews(str(tmp_path), "a") == ["a.png", "a.jpg", "a.mp4"]
+    assert previews.find_preview(str(tmp_path), "b")[0] == "b.webp"
+    assert previews.find_preview(str(tmp_path), "c") == (None, None)
+    assert len(scans) == 1
+
+
+def test_directory_changes_trigger_a_rescan(previews, tmp_path):
+    touch(tmp_path, "a.jpg")
+    assert previews.find_preview(str(tmp_path), "a")[0] == "a.jpg"
+
+    touch(tmp_path, "a.png")
+    os.utime(tmp_path, ns=(1, 1))
+
+    assert previews.find_preview(str(tmp_path), "a")[0] == "a.png"
+
+
+def test_recorded_changes_skip_the_rescan(gallery, previews, tmp_path, monkeypatch):
+    touch(tmp_path, "a.jpg")
+    previews.find_preview(str(tmp_path), "a")
+    monkeypatch.setattr(gallery.os, "scandir", lambda path: pytest.fail("the directory was rescanned"))
+
+    touch(tmp_path, "a.png")
+    previews.record(str(tmp_path), "a", added=["a.png"])
+    assert previews.list_previews(str(tmp_path), "a") == ["a.png", "a.jpg"]
+
+    os.remove(tmp_path / "a.png")
+    os.remove(tmp_path / "a.jpg")
+    previews.record(str(tmp_path), "a", removed=["a.png", "a.jpg"])
+    assert previews.find_preview(str(tmp_path), "a") == (None, None)
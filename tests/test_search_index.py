@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+LORA_NAMES = [
+    "ponyxl_style.safetensors",
+    "sdxl_detail.safetensors",
+    "赛博朋克风格.safetensors",
+    "dragon_wings.safetensors",
+    "tiger.safetensors",
+    "styles/anime-v2.safetensors",
+]
+
+
+@pytest.fixture
+def index(gallery):
+    index = gallery.LoraSearchIndex()
+    for name in LORA_NAMES:
+        index.add({"name": name, "folder": os.path.dirname(name) or ".", "meta": {}, "tags": []})
+    return index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("xl", {"ponyxl_style.safetensors", "sdxl_detail.safetensors"}),
+    ("朋克", {"赛博朋克风格.safetensors"}),
+    ("_", {"ponyxl_style.safetensors", "sdxl_detail.safetensors", "dragon_wings.safetensors"}),
+    ("-v2", {"styles/anime-v2.safetensors"}),
+    ("xl style", {"ponyxl_style.safetensors"}),
+])
+def test_short_cjk_and_punctuation_queries_match_substrings(index, query, expected):
+    assert set(index.search(query)) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("dragn", "dragon_wings.safetensors"),
+    ("drgaon", "dragon_wings.safetensors"),
+    ("tigr", "tiger.safetensors"),
+    ("tigar", "tiger.safetensors"),
+])
+def test_single_typos_still_match(index, query, expected):
+    assert set(index.search(query)) == {expected}
+
+
+def test_exact_token_outranks_substring(index):
+    scores = index.search("style")
+    assert scores["ponyxl_style.safetensors"] > scores.get("styles/anime-v2.safetensors", 0.0)
+
+
+def test_unrelated_query_matches_nothing(index):
+    assert index.search("zzzz") == {}
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def synced(gallery, monkeypatch):
+    """Replaces the Civitai call; records (lora_name, options) and answers from a per-name script."""
+    calls = []
+    script = {}
+
+    async def fake_sync(lora_name, persist=False, **options):
+        calls.append((lora_name, options))
+        statuses = script.get(lora_name, [200])
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return ({"status": "ok"} if status == 200 else {"message": f"HTTP {status}"}), status
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(gallery, "sync_lora_with_civitai", fake_sync)
+    monkeypatch.setattr(gallery.asyncio, "sleep", no_sleep)
+    return calls, script
+
+
+def test_an_interrupted_job_resumes_with_the_unfinished_loras(gallery, synced, tmp_path):
+    calls, _ = synced
+    state_file = str(tmp_path / "sync_job.json")
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump({"id": "job1", "status": "running", "options": {"sync_image": False, "refresh": True},
+                   "lora_names": ["a", "b", "c"], "results": {"a": "ok"}}, f)
+
+    job = gallery.CivitaiSyncJob.load(state_file)
+    assert job.status == "interrupted"
+    assert job.summary()["done"] == 1
+
+    asyncio.run(job.run())
+
+    assert sorted(calls) == [("b", {"sync_image": False, "refresh": True}),
+                             ("c", {"sync_image": False, "refresh": True})]
+    assert job.status == "completed"
+    with open(state_file, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["status"] == "completed"
+    assert saved["results"] == {"a": "ok", "b": "ok", "c": "ok"}
+
+
+def test_throttled_loras_are_retried_and_failures_recorded(gallery, synced, tmp_path):
+    calls, script = synced
+    script["slow"] = [429, 429, 200]
+    script["missing"] = [404]
+    job = gallery.CivitaiSyncJob(["slow", "missing"], {}, str(tmp_path / "sync_job.json"))
+
+    asyncio.run(job.run())
+
+    assert [name for name, _ in calls].count("slow") == 3
+    assert job.results == {"slow": "ok", "missing": "HTTP 404"}
+    assert job.summary()["succeeded"] == 1 and job.summary()["failed"] == 1
+    events = [data for event, data in gallery.server.PromptServer.instance.sent if event == "lora_gallery.sync_job"]
+    assert events[-1]["status"] == "completed"
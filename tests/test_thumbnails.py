@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+import comfy_stubs
+
+
+@pytest.fixture
+def thumbnails(gallery, tmp_path):
+    return gallery.ThumbnailCache(str(tmp_path / "thumbs"), 1024 * 1024)
+
+
+def write_image(path, color="red"):
+    Image.new("RGB", (600, 400), color).save(path)
+    return str(path)
+
+
+def test_thumbnails_are_keyed_by_content(thumbnails, tmp_path):
+    first = write_image(tmp_path / "a.png")
+    thumb = thumbnails.get_thumbnail(first, 200)
+    with Image.open(thumb) as img:
+        assert max(img.size) == 256
+
+    # A copy, or the same file touched, reuses the thumbnail; new content gets a new one.
+    copy = str(tmp_path / "b.png")
+    shutil.copy(first, copy)
+    assert thumbnails.get_thumbnail(copy, 200) == thumb
+    os.utime(first, ns=(1, 1))
+    assert thumbnails.get_thumbnail(first, 200) == thumb
+    write_image(first, "blue")
+    assert thumbnails.get_thumbnail(first, 200) != thumb
+    assert thumbnails.get_thumbnail(first, 600) != thumbnails.get_thumbnail(first, 200)
+
+
+def test_failed_thumbnail_serves_the_full_image_with_its_own_etag(gallery, lora_root, request_routes, monkeypatch):
+    comfy_stubs.write_lora(lora_root, "card.safetensors")
+    write_image(os.path.join(lora_root, "card.png"))
+
+    def broken(*args):
+        raise OSError("no thumbnails today")
+    monkeypatch.setattr(gallery.thumbnail_cache, "read_thumbnail", broken)
+
+    async def scenario(client):
+        params = {"filename": "card.png", "lora_name": "card.safetensors"}
+        full = await client.get("/LocalLoraGalleryRemix/preview", params=params)
+        thumb = await client.get("/LocalLoraGalleryRemix/preview", params=dict(params, size="200"))
+        return full.headers["ETag"], thumb.headers["ETag"], await thumb.read(), await full.read()
+
+    full_etag, thumb_etag, thumb_body, full_body = request_routes(scenario)
+
+    assert thumb_etag == full_etag
+    assert thumb_body == full_body
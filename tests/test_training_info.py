@@ -0,0 +1,31 @@
+import pytest
+
+import comfy_stubs
+
+
+def post_batch(request_routes, lora_names):
+    async def scenario(client):
+        response = await client.post("/LocalLoraGalleryRemix/get_lora_training_info_batch",
+                                     json={"lora_names": lora_names})
+        return response.status, await response.json()
+    return request_routes(scenario)
+
+
+def test_batch_reads_training_info_from_the_header(gallery, lora_root, request_routes):
+    comfy_stubs.write_lora(lora_root, "trained.safetensors", training_metadata={
+        "ss_base_model_version": "sdxl_base_v1-0", "ss_network_dim": "32", "ss_resolution": "(1024, 1024)"})
+
+    status, body = post_batch(request_routes, ["trained.safetensors", "missing.safetensors"])
+
+    assert status == 200
+    summary = body["info"]["trained.safetensors"]
+    assert (summary["base_model"], summary["network_dim"], summary["resolution"]) == ("sdxl_base_v1-0", 32, "1024x1024")
+    assert body["info"]["missing.safetensors"] == {"error": "LoRA file not found"}
+
+
+@pytest.mark.parametrize("lora_names", ["a.safetensors", [["a.safetensors"]], [{"name": "a"}], [1]])
+def test_batch_rejects_names_that_are_not_strings(gallery, request_routes, lora_names):
+    status, body = post_batch(request_routes, lora_names)
+
+    assert status == 400
+    assert body["status"] == "error"